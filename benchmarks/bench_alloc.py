@@ -0,0 +1,134 @@
+######################載入套件######################
+"""
+主迴圈記憶體配置測試\n
+\n
+用固定的腳本（固定亂數、自動駕駛接球、無視窗模式）跑一段遊戲，\n
+以 tracemalloc 記錄每一格、每一段（update.*、draw.*）淨增加的記憶體和暫時配置的高峰，\n
+最後列出留下最多記憶體的程式行和垃圾回收次數。\n
+暖身之後平均每格增加的記憶體超過門檻時，以錯誤碼 1 結束。\n
+\n
+執行方式：python benchmarks/bench_alloc.py --frames 600 --output benchmarks/results/alloc.json\n
+"""
+import argparse
+import os
+import random
+import sys
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.common import make_config, setup_headless, write_results
+
+setup_headless()
+
+import numpy as np
+import config.settings as config
+from src.game import GameEngine
+from src.utils.alloc_tracker import AllocationTracker
+
+
+######################定義函式區######################
+def build_session(cols, rows):
+    """
+    建立固定腳本的遊戲\n
+    return: (engine, step)，step 每呼叫一次就跑一格\n
+    """
+    random.seed(1234)
+    np.random.seed(1234)
+
+    session_config = make_config(config, cols, rows, AUTOPILOT_ACTION_DELAY=0)
+    engine = GameEngine(session_config)
+    engine.is_autopilot_enabled = True
+
+    def step():
+        # 自動駕駛負責發球、接球和贏了之後開始下一輪
+        engine.update()
+        engine.draw()
+
+    return engine, step
+
+
+def main():
+    """
+    記憶體配置測試主函式\n
+    \n
+    流程：\n
+    1. 建立固定腳本的遊戲（建立完才開始追蹤，只看主迴圈的配置）\n
+    2. 把計時器換成配置追蹤器，跑指定格數\n
+    3. 印出每一段的統計、配置最多的程式行和垃圾回收次數\n
+    4. 穩定狀態超出門檻就以錯誤碼 1 結束\n
+    """
+    parser = argparse.ArgumentParser(description="主迴圈記憶體配置測試")
+    parser.add_argument("--output", default="benchmarks/results/alloc.json")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--size", default="10x5", help="磚牆大小，例如 10x5")
+    parser.add_argument("--top", type=int, default=15, help="列出幾行配置最多的程式")
+    parser.add_argument(
+        "--max-bytes-per-frame",
+        type=float,
+        default=512,
+        help="暖身之後平均每格最多可以增加幾個位元組",
+    )
+    args = parser.parse_args()
+
+    cols, rows = (int(value) for value in args.size.lower().split("x"))
+    engine, step = build_session(cols, rows)
+
+    tracker = AllocationTracker(warmup_frames=args.warmup)
+    engine.frame_timer = tracker
+    tracker.install()
+    try:
+        tracker.run_frames(step, args.frames)
+    finally:
+        tracker.uninstall()
+
+    # 每一段的統計
+    report = tracker.get_report()
+    print(f"{'段落':<22}{'每格淨增加(B)':>16}{'每格區塊數':>12}{'暫時高峰(B)':>14}")
+    for phase in sorted(report):
+        stats = report[phase]
+        print(
+            f"{phase:<22}{stats['bytes_per_frame']:>16.1f}"
+            f"{stats['blocks_per_frame']:>12.2f}{stats['peak_bytes']:>14}"
+        )
+
+    # 配置最多的程式行
+    print()
+    print(f"留下最多記憶體的前 {args.top} 行：")
+    top_lines = tracker.get_top_lines(args.top)
+    for phase, line, size, blocks in top_lines:
+        print(f"  {size:>10} B {blocks:>6} 塊  [{phase}] {line}")
+
+    growth = tracker.get_steady_state_bytes_per_frame()
+    print()
+    print(f"暖身後平均每格增加：{growth:.1f} bytes")
+    print(
+        f"垃圾回收次數（第 0/1/2 代）：{tracker.gc_collections}，"
+        f"共暫停 {tracker.gc_pause_ms:.2f} ms"
+    )
+
+    write_results(
+        args.output,
+        report,
+        {
+            "steady_state_bytes_per_frame": growth,
+            "gc_collections": tracker.gc_collections,
+            "gc_pause_ms": tracker.gc_pause_ms,
+            "top_lines": [list(entry) for entry in top_lines],
+        },
+    )
+    print(f"結果已寫入 {args.output}")
+
+    problems = tracker.check_steady_state(args.max_bytes_per_frame)
+    if problems:
+        print()
+        for problem in problems:
+            print(f"  - {problem}")
+        sys.exit(1)
+
+
+######################主程式######################
+main()
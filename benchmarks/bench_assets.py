@@ -0,0 +1,159 @@
+######################載入套件######################
+"""
+資源包載入測試\n
+\n
+在暫存資料夾產生一批圖片（小圖案和一張大背景）和一個字型，分別用兩種方式載入，比較花的時間和檔案大小：\n
+- loose：一個一個開檔，pygame.image.load 解碼 PNG 再 convert_alpha，字型直接開字型檔\n
+- pack：先用 tools/pack_assets.py 的方式打包，開啟資源包（記憶體映射）後再載入\n
+  （背景圖解開後超過 RAW_IMAGE_MAX_BYTES，跟打包工具一樣保留 PNG）\n
+兩種方式都只量第一次載入（之後都是快取），每一輪都重新開檔。\n
+\n
+執行方式：python benchmarks/bench_assets.py --sprites 200 --output benchmarks/results/assets.json\n
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.common import percentile, setup_headless, write_results
+
+setup_headless()
+
+import pygame
+from src.utils.asset_pack import convert_image, open_asset_pack, write_asset_pack
+
+# 測試用的字型（pygame 內建的字型檔）
+FONT_PATH = os.path.join(os.path.dirname(pygame.__file__), "freesansbold.ttf")
+
+
+######################定義函式區######################
+def make_assets(folder, sprite_count, background_size):
+    """
+    產生測試用的圖片和字型\n
+    return: [(名稱, 種類, 路徑), ...]\n
+    """
+    rng = random.Random(1234)
+    entries = []
+    for index in range(sprite_count):
+        sprite = pygame.Surface((48, 48), pygame.SRCALPHA)
+        for _ in range(8):
+            color = (rng.randrange(256), rng.randrange(256), rng.randrange(256), 255)
+            pygame.draw.circle(sprite, color, (rng.randrange(48), rng.randrange(48)), 10)
+        path = os.path.join(folder, f"sprite_{index}.png")
+        pygame.image.save(sprite, path)
+        entries.append((f"images/sprite_{index}", "image", path))
+
+    background = pygame.Surface(background_size)
+    for y in range(0, background_size[1], 8):
+        pygame.draw.line(background, (0, y % 256, 128), (0, y), (background_size[0], y), 8)
+    path = os.path.join(folder, "background.png")
+    pygame.image.save(background, path)
+    entries.append(("images/background", "image", path))
+
+    font_path = os.path.join(folder, "ui.ttf")
+    shutil.copy(FONT_PATH, font_path)
+    entries.append(("fonts/ui", "font", font_path))
+    return entries
+
+
+def load_loose(entries):
+    """一個一個開檔載入，回傳花的毫秒數"""
+    start = time.perf_counter()
+    for name, kind, path in entries:
+        if kind == "image":
+            pygame.image.load(path).convert_alpha()
+        else:
+            pygame.font.Font(path, 28)
+    return (time.perf_counter() - start) * 1000
+
+
+def load_pack(path, entries):
+    """開啟資源包再載入，回傳 (開啟花的毫秒數, 總共花的毫秒數)"""
+    start = time.perf_counter()
+    pack = open_asset_pack(path)
+    opened = time.perf_counter()
+    for name, kind, _ in entries:
+        if kind == "image":
+            pack.load_image(name)
+        else:
+            pack.load_font(name, 28)
+    end = time.perf_counter()
+    pack.close()
+    return (opened - start) * 1000, (end - start) * 1000
+
+
+def main():
+    """
+    資源包載入測試主函式\n
+    印出兩種方式的載入時間和檔案大小，並寫成 JSON\n
+    """
+    parser = argparse.ArgumentParser(description="資源包載入測試")
+    parser.add_argument("--output", default="benchmarks/results/assets.json")
+    parser.add_argument("--sprites", type=int, default=200)
+    parser.add_argument("--background", type=int, nargs=2, default=[1920, 1080])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((800, 600))
+
+    folder = tempfile.mkdtemp(prefix="bench_assets_")
+    try:
+        entries = make_assets(folder, args.sprites, tuple(args.background))
+        pack_path = os.path.join(folder, "assets.pak")
+        assets = []
+        for name, kind, path in entries:
+            if kind == "image":
+                data, info = convert_image(path)
+            else:
+                with open(path, "rb") as file:
+                    data, info = file.read(), {}
+            assets.append((name, kind, data, info))
+        pack_size = write_asset_pack(pack_path, assets)
+        loose_size = sum(os.path.getsize(path) for _, _, path in entries)
+
+        loose_ms, open_ms, pack_ms = [], [], []
+        for _ in range(args.rounds):
+            loose_ms.append(load_loose(entries))
+            opened, total = load_pack(pack_path, entries)
+            open_ms.append(opened)
+            pack_ms.append(total)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    results = {
+        "loose": {
+            "load_p50_ms": round(percentile(loose_ms, 0.5), 3),
+            "size_kb": round(loose_size / 1024, 1),
+        },
+        "pack": {
+            "open_p50_ms": round(percentile(open_ms, 0.5), 3),
+            "load_p50_ms": round(percentile(pack_ms, 0.5), 3),
+            "size_kb": round(pack_size / 1024, 1),
+        },
+    }
+    print(f"{'方式':<8}{'載入p50(ms)':>14}{'大小(KB)':>12}")
+    for name, result in results.items():
+        print(f"{name:<8}{result['load_p50_ms']:>14.3f}{result['size_kb']:>12.1f}")
+    print(f"開啟資源包（只讀標頭和索引）：{results['pack']['open_p50_ms']:.3f} ms")
+    print("小圖案在資源包裡是解開的像素，會比 PNG 大；大圖保留壓縮格式，第一次用到時才解碼")
+
+    write_results(
+        args.output,
+        results,
+        {"sprites": args.sprites, "background": args.background, "rounds": args.rounds},
+    )
+    print(f"結果已寫入 {args.output}")
+
+
+######################主程式######################
+main()
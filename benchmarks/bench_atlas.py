@@ -0,0 +1,123 @@
+######################載入套件######################
+"""
+貼圖集長時間測試\n
+\n
+用 texture 後端一輪一輪重新建立遊戲物件（像展示模式一直換關卡），\n
+每一輪輪流換一種畫質、自動駕駛打幾格並畫出來，記下貼圖集的頁數和圖案數。\n
+重新畫出來的同樣圖案應該共用原本的位置：暖身幾輪（每種畫質都用過）之後頁數不能再增加，\n
+增加了就以非 0 的結束碼結束。圖案數只印出來參考（特殊磚塊的位置是隨機的，\n
+比較少見的顏色和閃爍階段可能晚一點才第一次出現，但種類有上限）。\n
+\n
+執行方式：python benchmarks/bench_atlas.py --rounds 300 --output benchmarks/results/atlas.json\n
+"""
+import argparse
+import os
+import random
+import sys
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.common import make_config, setup_headless, write_results
+
+setup_headless()
+
+import numpy as np
+import config.settings as config
+from src.game import GameEngine
+from src.game.quality_governor import build_quality_levels
+
+
+######################定義函式區######################
+def run_soak(cols, rows, rounds, frames):
+    """
+    重複建立遊戲物件並畫幾格（每一輪換一種畫質，換畫質時特殊磚塊圖案會重新畫）\n
+    return: (實際使用的後端, 每一輪結束時的 [(頁數, 圖案數), ...])\n
+    """
+    random.seed(1234)
+    np.random.seed(1234)
+    soak_config = make_config(
+        config,
+        cols,
+        rows,
+        RENDER_BACKEND="texture",
+        AUTOPILOT_ACTION_DELAY=0,
+        QUALITY_GOVERNOR_ENABLED=False,
+        SPECIAL_BRICK_COUNT=cols * rows // 4,
+    )
+    engine = GameEngine(soak_config)
+    if engine.renderer.name != "texture":
+        return engine.renderer.name, []
+
+    levels = build_quality_levels(
+        particle_limit=soak_config.QUALITY_PARTICLE_LIMIT,
+        render_scale=soak_config.QUALITY_RENDER_SCALE,
+        hud_interval=soak_config.QUALITY_HUD_INTERVAL,
+    )
+    counts = []
+    for index in range(rounds):
+        engine.init_game_objects()
+        engine.is_autopilot_enabled = True
+        engine._apply_quality(levels[index % len(levels)])
+        for _ in range(frames):
+            engine.update()
+            engine.draw()
+        report = engine.renderer.get_atlas_report()
+        counts.append((report["pages"], report["sprites"]))
+    return engine.renderer.name, counts
+
+
+def main():
+    """
+    貼圖集長時間測試主函式\n
+    印出暖身後和最後的頁數、圖案數，頁數有增加時以結束碼 1 結束\n
+    """
+    parser = argparse.ArgumentParser(description="貼圖集長時間測試")
+    parser.add_argument("--output", default="benchmarks/results/atlas.json")
+    parser.add_argument("--rounds", type=int, default=300)
+    parser.add_argument("--frames", type=int, default=3, help="每一輪畫幾格")
+    parser.add_argument("--warmup", type=int, default=20, help="前幾輪不檢查（第一次畫出每種圖案）")
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=5)
+    args = parser.parse_args()
+
+    backend, counts = run_soak(args.cols, args.rows, args.rounds, args.frames)
+    if not counts:
+        print(f"無法建立 texture 繪圖器（改用了 {backend}），沒有貼圖集可以測")
+        sys.exit(1)
+
+    warm_pages, warm_sprites = counts[min(args.warmup, len(counts)) - 1]
+    final_pages, final_sprites = counts[-1]
+    results = {
+        "warmup_pages": warm_pages,
+        "warmup_sprites": warm_sprites,
+        "final_pages": final_pages,
+        "final_sprites": final_sprites,
+        "max_pages": max(pages for pages, _ in counts),
+    }
+    print(f"暖身 {args.warmup} 輪後：{warm_pages} 頁，{warm_sprites} 種圖案")
+    print(f"跑完 {args.rounds} 輪後：{final_pages} 頁，{final_sprites} 種圖案")
+
+    write_results(
+        args.output,
+        results,
+        {
+            "rounds": args.rounds,
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "cols": args.cols,
+            "rows": args.rows,
+        },
+    )
+    print(f"結果已寫入 {args.output}")
+
+    if results["max_pages"] > warm_pages:
+        print("貼圖集在暖身之後還在開新的頁，重新建立的圖案沒有共用原本的位置")
+        sys.exit(1)
+    print("貼圖集沒有開新的頁")
+
+
+######################主程式######################
+main()
@@ -0,0 +1,111 @@
+######################載入套件######################
+"""
+輸入延遲測試\n
+\n
+用 SDL 的 dummy 視訊驅動跑遊戲主迴圈（GameEngine.run_frame），\n
+同時由 InputLatencyProbe 在隨機時間送出帶時間戳記的滑鼠移動事件，\n
+統計事件從送出到顯示在畫面上的時間，比較一般模式和低延遲模式（繪製前再讀一次滑鼠位置）。\n
+\n
+無視窗模式下每格的更新很快，兩種模式只差在更新期間到的事件；\n
+用 --update-load-ms 在每格更新後多花一段時間，模擬比較慢的機器或比較重的關卡。\n
+\n
+執行方式：python benchmarks/bench_input_latency.py --frames 600 --output benchmarks/results/input_latency.json\n
+"""
+import argparse
+import os
+import sys
+import time
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.common import make_config, setup_headless, write_results
+
+setup_headless()
+
+import config.settings as config
+from src.game import GameEngine
+from src.utils.input_latency import InputLatencyProbe
+
+# 每個測試：(名稱, 是否低延遲模式)
+MODES = [("standard", False), ("low_latency", True)]
+
+
+######################定義函式區######################
+def run_mode(is_low_latency, cols, rows, frames, probe_interval, update_load_ms):
+    """
+    用指定的輸入模式跑一段遊戲（手動控制，球在底板上等待發球）\n
+    update_load_ms: 每格更新後額外花費的毫秒數\n
+    return: 延遲統計 dict（p50_ms、p99_ms、samples）\n
+    """
+    bench_config = make_config(
+        config,
+        cols,
+        rows,
+        AUTOPILOT_ENABLED=False,
+        IDLE_MODE_ENABLED=False,
+        LOW_LATENCY_INPUT=is_low_latency,
+    )
+    engine = GameEngine(bench_config)
+
+    # 模擬比較重的更新：更新完再停一段時間才繼續
+    # （用 sleep 而不是空轉，空轉會佔住 GIL，探針執行緒送不出事件，量到的就不是主迴圈的延遲）
+    if update_load_ms > 0:
+        original_update = engine.update
+
+        def loaded_update():
+            original_update()
+            time.sleep(update_load_ms / 1000)
+
+        engine.update = loaded_update
+
+    probe = InputLatencyProbe(engine.pointer, interval_ms=probe_interval)
+    probe.start()
+    try:
+        for _ in range(frames):
+            engine.run_frame()
+    finally:
+        probe.stop()
+    return engine.pointer.get_latency_report()
+
+
+def main():
+    """
+    輸入延遲測試主函式\n
+    依序用一般模式和低延遲模式跑同樣的場景，印出延遲並寫成 JSON\n
+    """
+    parser = argparse.ArgumentParser(description="輸入延遲測試")
+    parser.add_argument("--output", default="benchmarks/results/input_latency.json")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=5)
+    parser.add_argument("--probe-interval", type=int, default=20)
+    parser.add_argument("--update-load-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    results = {}
+    for name, is_low_latency in MODES:
+        results[name] = run_mode(
+            is_low_latency,
+            args.cols,
+            args.rows,
+            args.frames,
+            args.probe_interval,
+            args.update_load_ms,
+        )
+
+    print(f"{'模式':<16}{'p50(ms)':>10}{'p99(ms)':>10}{'樣本數':>8}")
+    for name, result in results.items():
+        if result is None:
+            print(f"{name:<16}{'沒有資料':>10}")
+            continue
+        print(f"{name:<16}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['samples']:>8}")
+
+    write_results(args.output, results, {"update_load_ms": args.update_load_ms})
+    print(f"結果已寫入 {args.output}")
+
+
+######################主程式######################
+main()
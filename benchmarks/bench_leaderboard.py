@@ -0,0 +1,181 @@
+######################載入套件######################
+"""
+排行榜測試\n
+\n
+在暫存資料夾建立一個有很多筆紀錄的排行榜（預設一百萬筆），量測：\n
+- submit() 在主執行緒花的時間 p50 和 p99（只放進佇列）\n
+- 背景執行緒把這些紀錄寫完花的時間、交易次數\n
+- 前幾名和個別玩家前幾名的查詢時間 p50 和 p99，以及 SQLite 實際用的查詢計畫（應該走索引）\n
+\n
+執行方式：python benchmarks/bench_leaderboard.py --rows 1000000 --output benchmarks/results/leaderboard.json\n
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.common import percentile, setup_headless, write_results
+
+setup_headless()
+
+from src.utils.leaderboard import (
+    INSERT_SQL,
+    OUTCOME_QUIT,
+    OUTCOME_WIN,
+    PLAYER_SCORES_SQL,
+    TOP_SCORES_SQL,
+    Leaderboard,
+    connect_leaderboard,
+)
+
+
+######################定義函式區######################
+def populate(path, row_count, player_count, rng):
+    """
+    直接用 SQL 塞入大量紀錄（不經過 Leaderboard）\n
+    return: 花的秒數\n
+    """
+    start = time.perf_counter()
+    connection = connect_leaderboard(path)
+    now = time.time()
+    chunk = 100000
+    for begin in range(0, row_count, chunk):
+        rows = [
+            (
+                f"player{rng.randrange(player_count)}",
+                rng.randrange(0, 50000, 10),
+                rng.randrange(10000, 600000),
+                rng.randrange(1, 500),
+                rng.randrange(1, 20),
+                OUTCOME_WIN if rng.random() < 0.2 else OUTCOME_QUIT,
+                None,
+                now,
+            )
+            for _ in range(min(chunk, row_count - begin))
+        ]
+        with connection:
+            connection.executemany(INSERT_SQL, rows)
+    connection.close()
+    return time.perf_counter() - start
+
+
+def explain(path, sql, parameters):
+    """取得 SQLite 的查詢計畫（每一步的說明用 ' / ' 接起來）"""
+    connection = connect_leaderboard(path)
+    plan = connection.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+    connection.close()
+    return " / ".join(row[-1] for row in plan)
+
+
+def main():
+    """
+    排行榜測試主函式\n
+    印出送出、寫入和查詢的時間，並寫成 JSON\n
+    """
+    parser = argparse.ArgumentParser(description="排行榜測試")
+    parser.add_argument("--output", default="benchmarks/results/leaderboard.json")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--players", type=int, default=10000)
+    parser.add_argument("--submits", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(1234)
+    folder = tempfile.mkdtemp(prefix="bench_leaderboard_")
+    try:
+        path = os.path.join(folder, "leaderboard.db")
+        populate_s = populate(path, args.rows, args.players, rng)
+
+        # 送出：每次只量 submit() 本身，佇列大到放得下全部，才不會因為丟掉而變快
+        leaderboard = Leaderboard(path, queue_size=args.submits + 1)
+        leaderboard.start()
+        submit_ms = []
+        for index in range(args.submits):
+            begin = time.perf_counter()
+            leaderboard.submit(
+                f"player{index % args.players}", index * 10, 30000, 100, 1, OUTCOME_QUIT
+            )
+            submit_ms.append((time.perf_counter() - begin) * 1000)
+        begin = time.perf_counter()
+        leaderboard.close(timeout=60)
+        drain_ms = (time.perf_counter() - begin) * 1000
+        report = leaderboard.get_report()
+
+        # 查詢：第一次查詢要開連線，不算在內
+        top_ms, player_ms = [], []
+        leaderboard.top_scores(args.limit)
+        for _ in range(args.queries):
+            begin = time.perf_counter()
+            leaderboard.top_scores(args.limit)
+            top_ms.append((time.perf_counter() - begin) * 1000)
+            player = f"player{rng.randrange(args.players)}"
+            begin = time.perf_counter()
+            leaderboard.player_scores(player, args.limit)
+            player_ms.append((time.perf_counter() - begin) * 1000)
+        leaderboard.close()
+
+        top_plan = explain(path, TOP_SCORES_SQL, (args.limit,))
+        player_plan = explain(path, PLAYER_SCORES_SQL, ("player0", args.limit))
+        size_mb = sum(
+            os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder)
+        ) / (1024 * 1024)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    results = {
+        "populate_s": round(populate_s, 2),
+        "size_mb": round(size_mb, 1),
+        "submit_p50_ms": round(percentile(submit_ms, 0.5), 4),
+        "submit_p99_ms": round(percentile(submit_ms, 0.99), 4),
+        "drain_ms": round(drain_ms, 1),
+        "written": report["written"],
+        "batches": report["batches"],
+        "dropped": report["dropped"],
+        "top_p50_ms": round(percentile(top_ms, 0.5), 4),
+        "top_p99_ms": round(percentile(top_ms, 0.99), 4),
+        "player_p50_ms": round(percentile(player_ms, 0.5), 4),
+        "player_p99_ms": round(percentile(player_ms, 0.99), 4),
+        "top_plan": top_plan,
+        "player_plan": player_plan,
+    }
+
+    print(f"塞入 {args.rows} 筆：{results['populate_s']:.2f} 秒，檔案 {results['size_mb']:.1f} MB")
+    print(
+        f"submit()：p50 {results['submit_p50_ms']:.4f} ms，p99 {results['submit_p99_ms']:.4f} ms；"
+        f"背景寫完 {results['written']} 筆花了 {results['drain_ms']:.1f} ms，"
+        f"{results['batches']} 次交易，丟掉 {results['dropped']} 筆"
+    )
+    print(
+        f"前 {args.limit} 名：p50 {results['top_p50_ms']:.4f} ms，p99 {results['top_p99_ms']:.4f} ms"
+        f"（{top_plan}）"
+    )
+    print(
+        f"玩家前 {args.limit} 名：p50 {results['player_p50_ms']:.4f} ms，"
+        f"p99 {results['player_p99_ms']:.4f} ms（{player_plan}）"
+    )
+
+    write_results(
+        args.output,
+        results,
+        {
+            "rows": args.rows,
+            "players": args.players,
+            "submits": args.submits,
+            "queries": args.queries,
+            "limit": args.limit,
+        },
+    )
+    print(f"結果已寫入 {args.output}")
+
+
+######################主程式######################
+main()
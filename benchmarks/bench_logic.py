@@ -0,0 +1,335 @@
+######################載入套件######################
+"""
+遊戲邏輯微效能測試\n
+\n
+量測模擬熱點在不同磚牆大小（10x5 到 200x200）下的耗時：\n
+- Brick.check_collision（擊中與未擊中）、_explode_around、get_remaining_bricks_count\n
+- Ball.move、check_wall_collision、check_paddle_collision\n
+- Paddle.shrink\n
+- 完整的 GameEngine.update 一格（無視窗模式）\n
+- 過關換下一關（當場建立和背景預先載入）\n
+\n
+執行方式：\n
+python benchmarks/bench_logic.py run --output benchmarks/results/logic.json\n
+python benchmarks/bench_logic.py compare benchmarks/baseline.json benchmarks/results/logic.json\n
+"""
+import argparse
+import os
+import sys
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.common import (
+    WALL_SIZES,
+    compare_results,
+    load_results,
+    make_config,
+    print_comparison,
+    setup_headless,
+    summarize,
+    time_samples,
+    write_results,
+)
+
+setup_headless()
+
+import pygame
+import config.settings as config
+from src.game import GameEngine, GameState
+from src.game_objects import Ball, Brick, Paddle
+
+
+######################定義函式區######################
+def build_wall(bench_config, special_count=0):
+    """依照測試設定建立一面磚牆"""
+    return Brick(
+        cols=bench_config.BRICK_COLS,
+        rows=bench_config.BRICK_ROWS,
+        brick_width=bench_config.BRICK_WIDTH,
+        brick_height=bench_config.BRICK_HEIGHT,
+        padding=bench_config.BRICK_PADDING,
+        top_margin=bench_config.BRICK_TOP_MARGIN,
+        screen_width=bench_config.WINDOW_WIDTH,
+        special_count=special_count,
+    )
+
+
+def reset_wall(wall):
+    """把磚牆恢復成全部磚塊都還在的樣子（不計時的準備動作）"""
+    wall.is_hit[:] = False
+    wall.refresh_counts()
+    wall.pop_destroyed_cells()
+    wall.pop_explosion_centers()
+    wall.pop_hit_events()
+
+
+def bench_brick(bench_config, samples):
+    """量測磚牆相關的熱點"""
+    results = {}
+    wall = build_wall(bench_config)
+    center_row, center_col = wall.rows // 2, wall.cols // 2
+    target_rect = wall.get_brick_rect(center_row, center_col)
+
+    # 擊中：每次量之前先把那塊磚放回去
+    def setup_hit():
+        wall.is_hit[center_row, center_col] = False
+        wall.refresh_counts()
+        wall.pop_destroyed_cells()
+        wall.pop_hit_events()
+        return target_rect
+
+    results["brick.check_collision.hit"] = time_samples(
+        wall.check_collision, setup_hit, samples
+    )
+
+    # 未擊中：球在磚牆下方的空地
+    miss_rect = pygame.Rect(0, 0, 16, 16)
+    miss_rect.center = (bench_config.WINDOW_WIDTH // 2, bench_config.WINDOW_HEIGHT - 80)
+    results["brick.check_collision.miss"] = time_samples(
+        lambda _: wall.check_collision(miss_rect), None, samples, number=50
+    )
+
+    # 爆炸：每次量之前整面牆恢復原狀
+    def setup_explode():
+        reset_wall(wall)
+
+    results["brick._explode_around"] = time_samples(
+        lambda _: wall._explode_around(center_row, center_col), setup_explode, samples
+    )
+
+    results["brick.get_remaining_bricks_count"] = time_samples(
+        lambda _: wall.get_remaining_bricks_count(), None, samples, number=1000
+    )
+    return results
+
+
+def bench_ball_and_paddle(bench_config, samples):
+    """量測球和底板相關的熱點"""
+    results = {}
+    paddle = Paddle(
+        brick_width=bench_config.BRICK_WIDTH,
+        width_multiplier=bench_config.PADDLE_WIDTH_MULTIPLIER,
+        height=bench_config.PADDLE_HEIGHT,
+        y_offset=bench_config.PADDLE_Y_OFFSET,
+        screen_width=bench_config.WINDOW_WIDTH,
+        screen_height=bench_config.WINDOW_HEIGHT,
+        shrink_amount=bench_config.PADDLE_SHRINK_AMOUNT,
+        min_width=bench_config.PADDLE_MIN_WIDTH,
+    )
+    ball = Ball(
+        x=bench_config.WINDOW_WIDTH // 2,
+        y=bench_config.WINDOW_HEIGHT // 2,
+        radius=bench_config.BALL_RADIUS,
+        x_speed=bench_config.BALL_SPEED_X,
+        y_speed=bench_config.BALL_SPEED_Y,
+        screen_width=bench_config.WINDOW_WIDTH,
+        screen_height=bench_config.WINDOW_HEIGHT,
+    )
+    ball.start()
+
+    # 移動：每次量之前把球放回畫面中央
+    def setup_move():
+        ball.reset(x=bench_config.WINDOW_WIDTH // 2, y=bench_config.WINDOW_HEIGHT // 2)
+        ball.start()
+
+    results["ball.move"] = time_samples(lambda _: ball.move(), setup_move, samples)
+
+    # 撞牆：每次量之前把球放到左邊牆上
+    def setup_wall():
+        ball.x = 0
+        ball.x_speed = -abs(ball.x_speed)
+
+    results["ball.check_wall_collision"] = time_samples(
+        lambda _: ball.check_wall_collision(), setup_wall, samples
+    )
+
+    # 撞底板：每次量之前把球放到底板上，並讓它往下掉
+    def setup_paddle():
+        ball.reset(x=paddle.rect.centerx, y=paddle.rect.top)
+        ball.y_speed = abs(ball.y_speed)
+
+    results["ball.check_paddle_collision"] = time_samples(
+        lambda _: ball.check_paddle_collision(paddle), setup_paddle, samples
+    )
+
+    # 縮小底板：每次量之前恢復原本寬度
+    original_width = paddle.width
+
+    def setup_shrink():
+        paddle.width = original_width
+        paddle.rect.width = original_width
+
+    results["paddle.shrink"] = time_samples(lambda _: paddle.shrink(), setup_shrink, samples)
+    return results
+
+
+def bench_engine_update(bench_config, samples):
+    """
+    量測完整的 GameEngine.update 一格\n
+    用自動駕駛接球，讓遊戲一直處在進行中的狀態\n
+    """
+    engine = GameEngine(bench_config)
+    engine.is_autopilot_enabled = True
+
+    def setup_tick():
+        # 贏了或球掉了就重新開始，確保量到的是遊戲進行中的一格
+        if engine.game_state.is_win():
+            engine.init_game_objects()
+        if not engine.game_state.is_playing():
+            engine.ball.start()
+            engine.game_state.set_state(GameState.PLAYING)
+
+    return {
+        "engine.update": time_samples(lambda _: engine.update(), setup_tick, samples)
+    }
+
+
+def bench_level_transition(bench_config, samples):
+    """
+    量測過關後換下一關花的時間：當場建立磚牆，和背景預先建好後直接換上\n
+    當場建立大磚牆一次要幾十毫秒，最多只量 50 次\n
+    """
+    samples = min(samples, 50)
+    results = {}
+    for name, is_preload_enabled in (("sync", False), ("preloaded", True)):
+        engine = GameEngine(bench_config)
+        if not is_preload_enabled:
+            engine.level_preloader = None
+
+        def setup_win():
+            # 打光磚牆進入勝利畫面，有開預先載入就等背景把下一關建好，
+            # 再像勝利畫面的每一格一樣把區塊畫面畫完（不計時）
+            engine.brick_wall.is_hit[:] = True
+            engine.brick_wall.refresh_counts()
+            engine.game_state.set_state(GameState.WIN)
+            if engine.level_preloader is not None:
+                engine.level_preloader.request(engine.game_state.level + 1)
+                engine.level_preloader.wait()
+                while engine._prerender_next_level():
+                    pass
+
+        results[f"engine.level_transition.{name}"] = time_samples(
+            lambda _: engine._start_next_level(), setup_win, samples
+        )
+    return results
+
+
+def run_benchmarks(samples, sizes):
+    """
+    跑完所有測試\n
+    samples: 每個項目量幾次\n
+    sizes: 要測試的磚牆大小清單\n
+    return: {測試名稱[欄x列]: 統計數字}\n
+    """
+    results = {}
+    for cols, rows in sizes:
+        bench_config = make_config(
+            config,
+            cols,
+            rows,
+            SPECIAL_BRICK_COUNT=0,
+            AUTOPILOT_ACTION_DELAY=0,
+        )
+        size_label = f"{cols}x{rows}"
+        print(f"測試磚牆大小 {size_label} ...")
+
+        timings = {}
+        timings.update(bench_brick(bench_config, samples))
+        timings.update(bench_ball_and_paddle(bench_config, samples))
+        timings.update(bench_engine_update(bench_config, samples))
+        timings.update(bench_level_transition(bench_config, samples))
+
+        for name, values in timings.items():
+            key = f"{name}[{size_label}]"
+            results[key] = summarize(values)
+            print(f"  {key:<52}{results[key]['median_us']:>10.2f} us")
+    return results
+
+
+def check_level_transition(results, max_ratio):
+    """
+    檢查每種磚牆大小的預先載入換關都比當場建立快很多\n
+    results: run_benchmarks() 的結果\n
+    max_ratio: 預先載入的中位數最多是當場建立的幾倍\n
+    return: 沒有通過的磚牆大小清單\n
+    """
+    failures = []
+    prefix = "engine.level_transition.sync"
+    for key, sync in results.items():
+        if not key.startswith(prefix):
+            continue
+        size_label = key[len(prefix):]
+        preloaded = results[f"engine.level_transition.preloaded{size_label}"]
+        ratio = preloaded["median_us"] / sync["median_us"]
+        if ratio > max_ratio:
+            print(
+                f"換關{size_label}：預先載入 {preloaded['median_us']:.2f} us 是當場建立 "
+                f"{sync['median_us']:.2f} us 的 {ratio:.2f} 倍，超過 {max_ratio} 倍"
+            )
+            failures.append(size_label)
+    return failures
+
+
+def parse_size(text):
+    """把 '200x200' 這樣的文字轉成 (200, 200)"""
+    cols, rows = text.lower().split("x")
+    return int(cols), int(rows)
+
+
+def main():
+    """
+    效能測試主函式\n
+    \n
+    子命令：\n
+    run: 執行測試並把結果寫成 JSON\n
+    compare: 拿這次的結果和基準比較，有退步時以錯誤碼 1 結束\n
+    """
+    parser = argparse.ArgumentParser(description="遊戲邏輯微效能測試")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="執行測試")
+    run_parser.add_argument("--output", default="benchmarks/results/logic.json")
+    run_parser.add_argument("--samples", type=int, default=200)
+    run_parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=parse_size,
+        default=WALL_SIZES,
+        help="磚牆大小，例如 10x5 200x200",
+    )
+    run_parser.add_argument(
+        "--max-transition-ratio",
+        type=float,
+        default=0.25,
+        help="預先載入的換關時間最多是當場建立的幾倍，超過時以錯誤碼 1 結束",
+    )
+
+    compare_parser = commands.add_parser("compare", help="與基準比較")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_benchmarks(args.samples, args.sizes)
+        write_results(args.output, results)
+        print(f"結果已寫入 {args.output}")
+        if check_level_transition(results, args.max_transition_ratio):
+            sys.exit(1)
+        return
+
+    # 比較模式：變慢超過門檻就回傳錯誤碼，方便自動化流程判斷
+    rows, regressions = compare_results(
+        load_results(args.baseline), load_results(args.current), args.threshold
+    )
+    print_comparison(rows, regressions, args.threshold)
+    if regressions:
+        sys.exit(1)
+
+
+######################主程式######################
+main()
@@ -0,0 +1,86 @@
+######################載入套件######################
+"""
+畫面節奏測試\n
+\n
+用 SDL 的 dummy 視訊驅動跑遊戲主迴圈（GameEngine.run_frame，自動駕駛接球），\n
+每一種等待方式（sleep、hybrid、busy，以及 auto）各跑一段，\n
+比較每格間隔的抖動 p50／p99、沒趕上的格數和每格等待時用掉的 CPU 時間。\n
+dummy 驅動沒有垂直同步，所以預設不測 vsync（加上 --strategies vsync 可以在有顯示器的機器上測）。\n
+\n
+執行方式：python benchmarks/bench_pacing.py --frames 600 --output benchmarks/results/pacing.json\n
+"""
+import argparse
+import os
+import sys
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.common import make_config, setup_headless, write_results
+
+setup_headless()
+
+import config.settings as config
+from src.game import GameEngine
+
+
+######################定義函式區######################
+def run_strategy(strategy, frames, jitter_target):
+    """
+    用指定的等待方式跑一段遊戲\n
+    return: FramePacer 的統計結果 dict\n
+    """
+    bench_config = make_config(
+        config,
+        config.BRICK_COLS,
+        config.BRICK_ROWS,
+        FRAME_PACING=strategy,
+        FRAME_PACING_JITTER_TARGET=jitter_target,
+        AUTOPILOT_ENABLED=True,
+        AUTOPILOT_ACTION_DELAY=0,
+        IDLE_MODE_ENABLED=False,
+    )
+    engine = GameEngine(bench_config)
+    engine.frame_pacer.reset_stats()
+    for _ in range(frames):
+        engine.run_frame()
+    return engine.frame_pacer.get_report()
+
+
+def main():
+    """
+    畫面節奏測試主函式\n
+    依序測試每一種等待方式，印出比較表並寫成 JSON\n
+    """
+    parser = argparse.ArgumentParser(description="畫面節奏測試")
+    parser.add_argument("--output", default="benchmarks/results/pacing.json")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--jitter-target", type=float, default=config.FRAME_PACING_JITTER_TARGET)
+    parser.add_argument(
+        "--strategies", nargs="+", default=["sleep", "hybrid", "busy", "auto"]
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for strategy in args.strategies:
+        results[strategy] = run_strategy(strategy, args.frames, args.jitter_target)
+
+    print(
+        f"{'設定':<10}{'實際方式':<10}{'抖動p50(ms)':>12}{'抖動p99(ms)':>12}"
+        f"{'沒趕上':>8}{'等待CPU(ms/格)':>16}"
+    )
+    for strategy, result in results.items():
+        print(
+            f"{strategy:<10}{result['strategy']:<10}{result['jitter_p50_ms']:>12.3f}"
+            f"{result['jitter_p99_ms']:>12.3f}{result['missed_frames']:>8}"
+            f"{result['wait_cpu_ms_per_frame']:>16.3f}"
+        )
+
+    write_results(args.output, results, {"jitter_target_ms": args.jitter_target})
+    print(f"結果已寫入 {args.output}")
+
+
+######################主程式######################
+main()
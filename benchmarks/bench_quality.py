@@ -0,0 +1,155 @@
+######################載入套件######################
+"""
+畫質自動調整測試\n
+\n
+用 SDL 的 dummy 視訊驅動跑遊戲主迴圈（GameEngine.run_frame，自動駕駛接球），分兩部分：\n
+1. 每一級畫質各跑一段重的場景（大磚牆、多球、滿滿的粒子），比較每格繪製時間，\n
+   確認每降一級都真的省下時間\n
+2. 依序跑「輕 → 重 → 輕」三段負載（用 --load-ms 在每格更新後多花一段時間），\n
+   記下 QualityGovernor 每次調整的時間點，確認負載變重時會降級、\n
+   負載恢復後會升回來，而且不會在兩級之間來回切換\n
+\n
+執行方式：python benchmarks/bench_quality.py --frames 600 --output benchmarks/results/quality.json\n
+"""
+import argparse
+import os
+import sys
+import time
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.common import make_config, percentile, setup_headless, write_results
+
+setup_headless()
+
+import config.settings as config
+from src.game import GameEngine
+from src.game.quality_governor import build_quality_levels
+
+
+######################定義函式區######################
+def make_engine(cols, rows, **overrides):
+    """建立一個自動駕駛、不閒置的遊戲引擎"""
+    bench_config = make_config(
+        config,
+        cols,
+        rows,
+        AUTOPILOT_ENABLED=True,
+        AUTOPILOT_ACTION_DELAY=0,
+        IDLE_MODE_ENABLED=False,
+        FRAME_PACING="sleep",
+        **overrides,
+    )
+    return GameEngine(bench_config)
+
+
+def add_load(engine, load):
+    """
+    讓每格更新後多花一段時間\n
+    load: 清單，只有一個元素（目前每格要多花的毫秒數），測試過程中可以修改\n
+    """
+    original_update = engine.update
+
+    def loaded_update():
+        original_update()
+        if load[0] > 0:
+            time.sleep(load[0] / 1000)
+
+    engine.update = loaded_update
+
+
+def bench_levels(cols, rows, frames):
+    """
+    每一級畫質各跑一段重的場景，量每格繪製的時間\n
+    return: {等級名稱: {"draw_p50_ms", "draw_p99_ms"}}\n
+    """
+    levels = build_quality_levels(
+        config.QUALITY_PARTICLE_LIMIT, config.QUALITY_RENDER_SCALE, config.QUALITY_HUD_INTERVAL
+    )
+    results = {}
+    for quality in levels:
+        engine = make_engine(
+            cols,
+            rows,
+            QUALITY_GOVERNOR_ENABLED=False,
+            MULTI_BALL_STRESS_MODE=True,
+            PARTICLES_PER_BRICK=40,
+        )
+        engine._apply_quality(quality)
+
+        # 先跑一段讓球散開、粒子噴出來，再開始量
+        for _ in range(60):
+            engine.run_frame()
+        samples = []
+        for _ in range(frames):
+            engine.update()
+            start = time.perf_counter()
+            engine.draw()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[quality["name"]] = {
+            "draw_p50_ms": round(percentile(samples, 0.5), 3),
+            "draw_p99_ms": round(percentile(samples, 0.99), 3),
+        }
+    return results
+
+
+def bench_governor(frames, load_ms):
+    """
+    依序跑輕、重、輕三段負載，記下畫質調整的紀錄\n
+    return: dict，包含每次調整的 (格數, 原本等級, 新等級, p90) 和每段結束時的等級\n
+    """
+    engine = make_engine(config.BRICK_COLS, config.BRICK_ROWS)
+    load = [0.0]
+    add_load(engine, load)
+
+    phase_levels = {}
+    for name, phase_load in [("light", 0.0), ("heavy", load_ms), ("recovered", 0.0)]:
+        load[0] = phase_load
+        for _ in range(frames):
+            engine.run_frame()
+        phase_levels[name] = engine.quality_governor.level
+
+    return {
+        "changes": [
+            {"frame": frame, "from": old, "to": new, "p90_ms": round(p90, 3)}
+            for frame, old, new, p90 in engine.quality_governor.changes
+        ],
+        "phase_levels": phase_levels,
+    }
+
+
+def main():
+    """
+    畫質自動調整測試主函式\n
+    先比較每一級的繪製時間，再測試負載變化時的調整紀錄，印出結果並寫成 JSON\n
+    """
+    parser = argparse.ArgumentParser(description="畫質自動調整測試")
+    parser.add_argument("--output", default="benchmarks/results/quality.json")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--cols", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--load-ms", type=float, default=16.0)
+    args = parser.parse_args()
+
+    level_results = bench_levels(args.cols, args.rows, min(args.frames, 200))
+    print(f"{'畫質等級':<22}{'繪製p50(ms)':>12}{'繪製p99(ms)':>12}")
+    for name, result in level_results.items():
+        print(f"{name:<22}{result['draw_p50_ms']:>12.3f}{result['draw_p99_ms']:>12.3f}")
+
+    governor_results = bench_governor(args.frames, args.load_ms)
+    print(f"每段結束時的等級：{governor_results['phase_levels']}")
+    print(f"調整次數：{len(governor_results['changes'])}")
+
+    write_results(
+        args.output,
+        {"levels": level_results, "governor": governor_results},
+        {"cols": args.cols, "rows": args.rows, "load_ms": args.load_ms},
+    )
+    print(f"結果已寫入 {args.output}")
+
+
+######################主程式######################
+main()
@@ -0,0 +1,384 @@
+######################載入套件######################
+"""
+畫面繪製效能測試\n
+\n
+用 SDL 的 dummy 視訊驅動（不開視窗）透過 GameEngine.draw 畫出固定的測試場景，\n
+記錄每個場景的每格耗時中位數、p99，以及每格的繪圖呼叫次數和文字繪製次數。\n
+每個場景都有自己的預算（benchmarks/render_budgets.json），超出預算就以錯誤碼 1 結束。\n
+\n
+預算是量到的數值乘上檔案裡寫明的倍數再加上餘裕（margins 的 ratio 和 slack）：\n
+- 繪圖呼叫次數和文字繪製次數跟機器快慢無關，倍數 1、餘裕 0（一次都不能多），\n
+  所以像是「每格多呼叫一次 font.render」這種改動，不管在哪台機器上跑都會被抓出來\n
+- 耗時會受機器和偶爾的排程延遲影響，放寬倍數並加上固定的餘裕\n
+預算比現在量到的數值需要的還寬 stale_after 倍以上時，表示預算過期（例如改快之後沒有更新），\n
+一樣以錯誤碼 1 結束；用 --update-budgets 重新產生預算（每個場景跑 --update-runs 次取中位數）。\n
+\n
+執行方式：python benchmarks/bench_render.py --output benchmarks/results/render.json\n
+更新預算：python benchmarks/bench_render.py --update-budgets\n
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.common import make_config, percentile, setup_headless, write_results
+
+setup_headless()
+
+import numpy as np
+import pygame
+import pygame.sysfont
+import config.settings as config
+from src.game import GameEngine, GameState
+
+DEFAULT_BUDGETS_PATH = os.path.join(project_root, "benchmarks", "render_budgets.json")
+
+# 預算檢查的項目（耗時的項目以 _ms 結尾）
+BUDGET_METRICS = ("median_ms", "p99_ms", "draw_calls", "text_renders")
+
+# 會被計算的 pygame.draw 函式
+COUNTED_DRAW_FUNCTIONS = ("rect", "circle", "line", "lines", "polygon", "ellipse", "arc")
+
+
+######################物件類別######################
+class DrawCallCounter:
+    """
+    繪圖呼叫計數器 - 把 pygame.draw 的函式和字型的 render 包起來計數\n
+    \n
+    遊戲程式都是用 pygame.draw.rect(...) 這種寫法，每次呼叫時才去找函式，\n
+    所以只要把模組上的函式換掉，就能數到所有呼叫\n
+    """
+
+    def __init__(self):
+        self.draw_calls = 0
+        self.text_renders = 0
+        self._originals = {}
+
+    def reset(self):
+        """把計數歸零"""
+        self.draw_calls = 0
+        self.text_renders = 0
+
+    def install(self):
+        """開始計數：換掉 pygame.draw 的函式和字型類別"""
+        counter = self
+
+        for name in COUNTED_DRAW_FUNCTIONS:
+            original = getattr(pygame.draw, name)
+            self._originals[("draw", name)] = original
+            setattr(pygame.draw, name, self._wrap(original))
+
+        class CountingFont(pygame.font.Font):
+            """會計算 render 次數的字型類別"""
+
+            def render(self, *args, **kwargs):
+                counter.text_renders += 1
+                return super().render(*args, **kwargs)
+
+        # SysFont 在自己的模組裡也留了一份 Font，要一起換掉
+        self._originals[("font", "Font")] = pygame.font.Font
+        self._originals[("sysfont", "Font")] = pygame.sysfont.Font
+        pygame.font.Font = CountingFont
+        pygame.sysfont.Font = CountingFont
+
+    def uninstall(self):
+        """停止計數：把原本的函式放回去"""
+        for (module_name, name), original in self._originals.items():
+            if module_name == "draw":
+                setattr(pygame.draw, name, original)
+            elif module_name == "font":
+                pygame.font.Font = original
+            else:
+                pygame.sysfont.Font = original
+        self._originals.clear()
+
+    def _wrap(self, original):
+        """包一層會計數的函式"""
+
+        def counted(*args, **kwargs):
+            self.draw_calls += 1
+            return original(*args, **kwargs)
+
+        return counted
+
+
+def make_counting_surface_class(counter):
+    """
+    建立會計算貼圖和填色次數的畫布類別\n
+    pygame.Surface 內建的方法不能直接換掉，所以用繼承的方式加上計數\n
+    """
+
+    class CountingSurface(pygame.Surface):
+        """會計算 blit、blits、fill 次數的畫布"""
+
+        def blit(self, *args, **kwargs):
+            counter.draw_calls += 1
+            return super().blit(*args, **kwargs)
+
+        def blits(self, *args, **kwargs):
+            counter.draw_calls += 1
+            return super().blits(*args, **kwargs)
+
+        def fill(self, *args, **kwargs):
+            counter.draw_calls += 1
+            return super().fill(*args, **kwargs)
+
+    return CountingSurface
+
+
+######################定義函式區######################
+def setup_full_wall(engine):
+    """完整的磚牆，球在底板上等待發球"""
+    engine.update()
+
+
+def setup_specials_flashing(engine):
+    """把 7 塊特殊磚塊都放在牆上，一起閃爍"""
+    engine.brick_wall.is_special[:] = False
+    engine.brick_wall.is_special.flat[: engine.config.SPECIAL_BRICK_COUNT] = True
+    engine.brick_wall.refresh_counts()
+    engine.update()
+
+
+def setup_win_screen(engine):
+    """勝利畫面：磚塊全部打完，顯示勝利文字"""
+    engine.brick_wall.is_hit[:] = True
+    engine.brick_wall.refresh_counts()
+    engine.game_state.set_state(GameState.WIN)
+
+
+def setup_playing(engine):
+    """遊戲進行中：球在場上飛"""
+    engine.update()
+    engine.ball.start()
+    engine.game_state.set_state(GameState.PLAYING)
+    for _ in range(10):
+        engine.update()
+
+
+def setup_scrolled_middle(engine):
+    """捲動關卡：鏡頭停在磚牆正中間，整個畫面都是磚塊"""
+    engine.update()
+    engine.camera.snap_to(engine.brick_wall.bottom / 2)
+
+
+# 每個場景：(名稱, 磚牆欄數, 磚牆列數, 準備函式)
+SCENES = [
+    ("full_wall", 10, 5, setup_full_wall),
+    ("specials_flashing", 10, 5, setup_specials_flashing),
+    ("win_screen", 10, 5, setup_win_screen),
+    ("playing", 10, 5, setup_playing),
+    ("large_wall_100x100", 100, 100, setup_full_wall),
+    ("large_wall_200x200", 200, 200, setup_full_wall),
+    ("scrolling_10x2000", 10, 2000, setup_full_wall),
+    ("scrolling_10x2000_middle", 10, 2000, setup_scrolled_middle),
+]
+
+
+def run_scene(name, cols, rows, setup, frames, counter):
+    """
+    畫出一個場景很多次，記錄耗時和繪圖次數\n
+    return: 這個場景的統計結果 dict\n
+    """
+    # 固定亂數，讓特殊磚塊每次都出現在一樣的位置
+    random.seed(1234)
+    np.random.seed(1234)
+
+    scene_config = make_config(config, cols, rows)
+    engine = GameEngine(scene_config)
+    setup(engine)
+
+    # 改畫在會計數的畫布上（跟螢幕同樣的像素格式）
+    display = pygame.display.get_surface()
+    surface_class = make_counting_surface_class(counter)
+    engine.renderer.screen = surface_class(display.get_size(), 0, display)
+
+    # 先畫幾格暖身，讓字型和快取都準備好
+    for _ in range(5):
+        engine.draw()
+
+    frame_times = []
+    draw_calls = []
+    text_renders = []
+    for _ in range(frames):
+        counter.reset()
+        start = time.perf_counter_ns()
+        engine.draw()
+        frame_times.append((time.perf_counter_ns() - start) / 1_000_000)
+        draw_calls.append(counter.draw_calls)
+        text_renders.append(counter.text_renders)
+
+    return {
+        "median_ms": round(percentile(frame_times, 0.5), 4),
+        "p99_ms": round(percentile(frame_times, 0.99), 4),
+        "draw_calls": max(draw_calls),
+        "text_renders": max(text_renders),
+        "frames": frames,
+    }
+
+
+def make_budget(result, margins):
+    """
+    照量到的數值和邊際算出一個場景的預算（數值 x ratio + slack）\n
+    耗時無條件進位到 0.01 ms，次數取整數\n
+    """
+    budget = {}
+    for metric in BUDGET_METRICS:
+        margin = margins[metric]
+        value = result[metric] * margin["ratio"] + margin["slack"]
+        if metric.endswith("_ms"):
+            budget[metric] = math.ceil(value * 100) / 100
+        else:
+            budget[metric] = math.ceil(value)
+    return budget
+
+
+def check_budget(name, result, budget, margins, stale_after):
+    """
+    檢查一個場景有沒有超出預算，或是預算已經過期（比需要的寬太多）\n
+    return: 問題的說明清單（沒有問題就是空清單）\n
+    """
+    if not budget:
+        return [f"{name}: 沒有預算，請用 --update-budgets 產生"]
+
+    problems = []
+    expected = make_budget(result, margins)
+    for metric in BUDGET_METRICS:
+        limit = budget.get(metric)
+        if limit is None:
+            problems.append(f"{name}: {metric} 沒有預算")
+        elif result[metric] > limit:
+            problems.append(f"{name}: {metric} = {result[metric]} 超過預算 {limit}")
+        elif limit > expected[metric] * stale_after[metric]:
+            problems.append(
+                f"{name}: {metric} 的預算 {limit} 已經過期"
+                f"（量到 {result[metric]}，照邊際只需要 {expected[metric]}）"
+            )
+    return problems
+
+
+def write_budgets(path, budgets, results):
+    """照這次量到的數值更新預算檔（沒跑到的場景保留原本的預算）"""
+    scenes = dict(budgets["scenes"])
+    for name, result in results.items():
+        scenes[name] = make_budget(result, budgets["margins"])
+    data = dict(budgets, scenes=scenes)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("{\n")
+        for key in ("margins", "stale_after"):
+            file.write(f'  "{key}": {json.dumps(data[key])},\n')
+        file.write('  "scenes": {\n')
+        lines = [f'    "{name}": {json.dumps(budget)}' for name, budget in scenes.items()]
+        file.write(",\n".join(lines))
+        file.write("\n  }\n}\n")
+
+
+def merge_runs(runs):
+    """
+    把同一個場景跑很多次的結果合併成一個（每個項目取中位數），產生預算時才不會被偶爾的延遲影響\n
+    runs: [{場景名稱: 結果 dict}, ...]\n
+    """
+    merged = {}
+    for name in runs[0]:
+        merged[name] = {
+            metric: percentile([run[name][metric] for run in runs], 0.5)
+            for metric in BUDGET_METRICS
+        }
+    return merged
+
+
+def main():
+    """
+    繪製效能測試主函式\n
+    \n
+    流程：\n
+    1. 換掉繪圖函式開始計數\n
+    2. 依序畫出每個場景並記錄結果\n
+    3. 跟預算比較，印出報告並寫成 JSON\n
+    4. 有任何場景超出預算或預算過期就以錯誤碼 1 結束（--update-budgets 時改成更新預算檔）\n
+    """
+    parser = argparse.ArgumentParser(description="畫面繪製效能測試")
+    parser.add_argument("--output", default="benchmarks/results/render.json")
+    parser.add_argument("--budgets", default=DEFAULT_BUDGETS_PATH)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--scenes", nargs="+", help="只跑指定名稱的場景")
+    parser.add_argument(
+        "--update-budgets", action="store_true", help="照量到的數值重新產生預算檔"
+    )
+    parser.add_argument("--update-runs", type=int, default=5, help="產生預算時每個場景跑幾次")
+    args = parser.parse_args()
+
+    with open(args.budgets, "r", encoding="utf-8") as file:
+        budgets = json.load(file)
+
+    counter = DrawCallCounter()
+    counter.install()
+    results = {}
+    problems = []
+    update_runs = []
+    try:
+        for name, cols, rows, setup in SCENES:
+            if args.scenes and name not in args.scenes:
+                continue
+            result = run_scene(name, cols, rows, setup, args.frames, counter)
+            results[name] = result
+            if args.update_budgets:
+                continue
+            problems.extend(
+                check_budget(
+                    name,
+                    result,
+                    budgets["scenes"].get(name, {}),
+                    budgets["margins"],
+                    budgets["stale_after"],
+                )
+            )
+        if args.update_budgets:
+            update_runs.append(results)
+            for _ in range(args.update_runs - 1):
+                update_runs.append(
+                    {
+                        name: run_scene(name, cols, rows, setup, args.frames, counter)
+                        for name, cols, rows, setup in SCENES
+                        if name in results
+                    }
+                )
+    finally:
+        counter.uninstall()
+
+    # 印出每個場景的結果
+    print(f"{'場景':<24}{'中位數(ms)':>12}{'p99(ms)':>12}{'繪圖呼叫':>10}{'文字繪製':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<24}{result['median_ms']:>12.3f}{result['p99_ms']:>12.3f}"
+            f"{result['draw_calls']:>10}{result['text_renders']:>10}"
+        )
+
+    write_results(args.output, results, {"budgets": budgets})
+    print(f"結果已寫入 {args.output}")
+
+    if args.update_budgets:
+        write_budgets(args.budgets, budgets, merge_runs(update_runs))
+        print(f"預算已更新：{args.budgets}")
+        return
+
+    # 超出預算或預算過期時列出原因並回傳錯誤碼
+    if problems:
+        print()
+        print("以下場景超出預算或預算過期：")
+        for problem in problems:
+            print(f"  - {problem}")
+        sys.exit(1)
+    print("所有場景都在預算內")
+
+
+######################主程式######################
+main()
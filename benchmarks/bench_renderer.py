@@ -0,0 +1,144 @@
+######################載入套件######################
+"""
+繪圖後端比較測試\n
+\n
+用 SDL 的 dummy 視訊驅動跑同樣的場景，分別用 surface 和 texture 兩種繪圖後端畫，\n
+比較每格 GameEngine.draw（包含顯示畫面）的耗時中位數和 p99。\n
+場景在量測期間會繼續更新（球在動、分數在變、粒子在飛），不是一直畫同一個畫面。\n
+\n
+dummy 驅動沒有顯示卡，texture 後端用的是 SDL 的軟體繪圖器，\n
+所以這裡的數字只能比較 Python 端的成本；在有顯示卡的機器上跑才看得到 GPU 貼圖的效果。\n
+\n
+--render-scale 可以指定內部解析度（例如 0.5 畫一半解析度再放大到視窗）\n
+\n
+執行方式：python benchmarks/bench_renderer.py --frames 300 --output benchmarks/results/renderer.json\n
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.common import make_config, percentile, setup_headless, write_results
+
+setup_headless()
+
+import numpy as np
+import config.settings as config
+from src.game import GameEngine
+from src.utils.renderer import RENDER_BACKENDS
+
+
+######################定義函式區######################
+def setup_waiting(engine):
+    """完整的磚牆，球在底板上等待發球"""
+
+
+def setup_playing(engine):
+    """自動駕駛打一陣子，球在場上、分數一直變"""
+    engine.is_autopilot_enabled = True
+    for _ in range(120):
+        engine.update()
+
+
+def setup_stress(engine):
+    """壓力測試模式：幾百顆球加上滿滿的粒子"""
+    engine.is_autopilot_enabled = True
+    engine.is_stress_mode = True
+    for _ in range(120):
+        engine.update()
+
+
+# 每個場景：(名稱, 欄數, 列數, 準備函式, 額外設定)
+SCENES = [
+    ("waiting_10x5", 10, 5, setup_waiting, {}),
+    ("playing_10x5", 10, 5, setup_playing, {}),
+    ("stress_50x20", 50, 20, setup_stress, {"PARTICLES_PER_BRICK": 40}),
+    ("large_wall_200x200", 200, 200, setup_playing, {}),
+]
+
+
+def run_scene(backend, cols, rows, setup, frames, overrides, render_scale=1.0):
+    """
+    用指定的繪圖後端畫一個場景\n
+    return: dict，包含實際使用的後端、每格耗時中位數和 p99（毫秒）\n
+    """
+    # 固定亂數，兩種後端畫的是同樣的場景
+    random.seed(1234)
+    np.random.seed(1234)
+
+    scene_config = make_config(
+        config,
+        cols,
+        rows,
+        RENDER_BACKEND=backend,
+        RENDER_SCALE=render_scale,
+        AUTOPILOT_ACTION_DELAY=0,
+        QUALITY_GOVERNOR_ENABLED=False,
+        **overrides,
+    )
+    engine = GameEngine(scene_config)
+    setup(engine)
+
+    # 先畫幾格暖身，讓字型、貼圖集和區塊畫面都準備好
+    for _ in range(5):
+        engine.update()
+        engine.draw()
+
+    frame_times = []
+    for _ in range(frames):
+        engine.update()
+        start = time.perf_counter_ns()
+        engine.draw()
+        frame_times.append((time.perf_counter_ns() - start) / 1_000_000)
+
+    return {
+        "renderer": engine.renderer.name,
+        "median_ms": round(percentile(frame_times, 0.5), 4),
+        "p99_ms": round(percentile(frame_times, 0.99), 4),
+        "frames": frames,
+    }
+
+
+def main():
+    """
+    繪圖後端比較測試主函式\n
+    每個場景依序用每一種後端畫，印出比較表並寫成 JSON\n
+    """
+    parser = argparse.ArgumentParser(description="繪圖後端比較測試")
+    parser.add_argument("--output", default="benchmarks/results/renderer.json")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--backends", nargs="+", default=list(RENDER_BACKENDS))
+    parser.add_argument("--scenes", nargs="+", help="只跑指定名稱的場景")
+    parser.add_argument("--render-scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    results = {}
+    for name, cols, rows, setup, overrides in SCENES:
+        if args.scenes and name not in args.scenes:
+            continue
+        results[name] = {
+            backend: run_scene(
+                backend, cols, rows, setup, args.frames, overrides, args.render_scale
+            )
+            for backend in args.backends
+        }
+
+    print(f"{'場景':<22}{'後端':<10}{'中位數(ms)':>12}{'p99(ms)':>12}")
+    for name, scene_results in results.items():
+        for backend, result in scene_results.items():
+            # 建立失敗改用 surface 時標出來，才不會誤以為兩個後端一樣快
+            label = backend if result["renderer"] == backend else f"{backend}→{result['renderer']}"
+            print(f"{name:<22}{label:<10}{result['median_ms']:>12.3f}{result['p99_ms']:>12.3f}")
+
+    write_results(args.output, results, {"render_scale": args.render_scale})
+    print(f"結果已寫入 {args.output}")
+
+
+######################主程式######################
+main()
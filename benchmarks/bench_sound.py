@@ -0,0 +1,119 @@
+######################載入套件######################
+"""
+音效測試\n
+\n
+用 SDL 的 dummy 音效驅動跑壓力測試模式（幾百顆球、連環爆炸），量測：\n
+- start_ms：呼叫 SoundMixer.start() 時主迴圈被卡住的時間（背景執行緒載入時應該接近 0）\n
+- ready_ms：從 start() 到音效全部解碼好的時間\n
+- 每格 flush() 的耗時 p50 和 p99\n
+- 打掉的磚塊數、要求播放的次數和實際播放的次數（一次碰撞不管打掉幾塊磚都只要求一次，\n
+  同一格同一種音效只播一次），以及搶聲道、沒播的次數\n
+\n
+執行方式：python benchmarks/bench_sound.py --frames 600 --output benchmarks/results/sound.json\n
+"""
+import argparse
+import os
+import sys
+import time
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.common import make_config, percentile, setup_headless, write_results
+
+setup_headless()
+
+import config.settings as config
+from src.game import GameEngine
+
+
+######################定義函式區######################
+def main():
+    """
+    音效測試主函式\n
+    印出載入時間、flush 耗時和播放統計，並寫成 JSON\n
+    """
+    parser = argparse.ArgumentParser(description="音效測試")
+    parser.add_argument("--output", default="benchmarks/results/sound.json")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--cols", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--channels", type=int, default=config.SOUND_CHANNELS)
+    args = parser.parse_args()
+
+    bench_config = make_config(
+        config,
+        args.cols,
+        args.rows,
+        AUTOPILOT_ENABLED=True,
+        AUTOPILOT_ACTION_DELAY=0,
+        MULTI_BALL_STRESS_MODE=True,
+        SOUND_ENABLED=True,
+        SOUND_CHANNELS=args.channels,
+    )
+    engine = GameEngine(bench_config)
+    mixer = engine.sound_mixer
+
+    start = time.perf_counter()
+    mixer.start()
+    start_ms = (time.perf_counter() - start) * 1000
+    if not mixer.wait_ready(timeout=10):
+        print("音效裝置沒有準備好，無法測試")
+        return
+    ready_ms = (time.perf_counter() - start) * 1000
+
+    # 量 flush 時先把 update 裡的 flush 拿掉，只量這一段
+    flush = mixer.flush
+    mixer.flush = lambda: None
+    flush_ms = []
+
+    # 換關時分數會歸零，所以直接累計每次打掉的磚塊數
+    bricks = [0]
+    apply_brick_hits = engine._apply_brick_hits
+
+    def counting_apply_brick_hits(hit_count):
+        bricks[0] += hit_count
+        apply_brick_hits(hit_count)
+
+    engine._apply_brick_hits = counting_apply_brick_hits
+    for _ in range(args.frames):
+        engine.update()
+        begin = time.perf_counter()
+        flush()
+        flush_ms.append((time.perf_counter() - begin) * 1000)
+    mixer.flush = flush
+
+    report = mixer.get_report()
+    results = {
+        "start_ms": round(start_ms, 3),
+        "ready_ms": round(ready_ms, 3),
+        "flush_p50_ms": round(percentile(flush_ms, 0.5), 4),
+        "flush_p99_ms": round(percentile(flush_ms, 0.99), 4),
+        "bricks_destroyed": bricks[0],
+        "requests": report["requests"],
+        "played": report["played"],
+        "stolen": report["stolen"],
+        "dropped": report["dropped"],
+    }
+    mixer.close()
+
+    print(f"start() 卡住主迴圈：{results['start_ms']:.3f} ms，音效準備好：{results['ready_ms']:.1f} ms")
+    print(f"每格 flush：p50 {results['flush_p50_ms']:.4f} ms，p99 {results['flush_p99_ms']:.4f} ms")
+    print(
+        f"打掉 {results['bricks_destroyed']} 塊磚，"
+        f"要求 {results['requests']} 次，實際播放 {results['played']} 次，"
+        f"搶聲道 {results['stolen']} 次，沒播 {results['dropped']} 次"
+    )
+
+    write_results(
+        args.output,
+        results,
+        {"frames": args.frames, "cols": args.cols, "rows": args.rows, "channels": args.channels},
+    )
+    print(f"結果已寫入 {args.output}")
+
+
+######################主程式######################
+main()
@@ -0,0 +1,185 @@
+######################載入套件######################
+"""
+啟動時間測試\n
+\n
+每次都開一個全新的 Python 行程（跟機台開機後第一次啟動一樣，沒有任何快取），量測：\n
+- import：載入 config 和 GameEngine 花的時間\n
+- engine_init：建立 GameEngine 花的時間\n
+- first_frame：第一格 update 加 draw 花的時間\n
+- time_to_first_frame：從行程啟動到第一格畫完的總時間（由外部量測）\n
+另外用 python -X importtime 列出載入最久的模組。\n
+\n
+執行方式：\n
+python benchmarks/bench_startup.py run --output benchmarks/results/startup.json\n
+python benchmarks/bench_startup.py compare benchmarks/results/startup_before.json benchmarks/results/startup.json\n
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.common import (
+    compare_results,
+    load_results,
+    print_comparison,
+    setup_headless,
+    summarize,
+    write_results,
+)
+
+# 子行程執行的程式：照 main_new.py 的順序載入（包含藏起 pkg_resources 的棄用警告）、建立引擎、畫第一格，最後印出各段時間
+CHILD_SCRIPT = """
+import json, sys, time, warnings
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+with warnings.catch_warnings():
+    warnings.filterwarnings("ignore", message="pkg_resources is deprecated")
+    import pygame
+import config.settings as config
+from src.game import GameEngine
+imported = time.perf_counter()
+engine = GameEngine(config)
+created = time.perf_counter()
+engine.update()
+engine.draw()
+drawn = time.perf_counter()
+print(json.dumps({{
+    "import": (imported - start) * 1e6,
+    "engine_init": (created - imported) * 1e6,
+    "first_frame": (drawn - created) * 1e6,
+}}))
+sys.stdout.flush()
+"""
+
+
+######################定義函式區######################
+def run_child(extra_args=()):
+    """
+    開一個新的 Python 行程跑啟動流程\n
+    return: (子行程印出的各段時間 dict, 從啟動到結束的總時間（微秒）, stderr 文字)\n
+    """
+    script = CHILD_SCRIPT.format(root=project_root)
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, *extra_args, "-c", script],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+        check=True,
+    )
+    total = (time.perf_counter() - start) * 1e6
+    last_line = completed.stdout.strip().splitlines()[-1]
+    return json.loads(last_line), total, completed.stderr
+
+
+def parse_importtime(stderr, limit):
+    """
+    整理 -X importtime 的輸出\n
+    return: (所有最上層 import 的累計時間（微秒）, 累計時間最久的模組清單 [(模組, 微秒)])\n
+    """
+    entries = []
+    top_level_total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:") :].split("|")
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            # 第一行是欄位標題
+            continue
+        name = parts[2].rstrip()
+        # 前面沒有空白的是最上層的 import（縮排代表被誰載入）
+        if not name.startswith("  "):
+            top_level_total += cumulative
+        entries.append((name.strip(), cumulative))
+    entries.sort(key=lambda entry: entry[1], reverse=True)
+    return top_level_total, entries[:limit]
+
+
+def run_benchmarks(samples, top):
+    """
+    跑完所有啟動測試\n
+    samples: 啟動幾次\n
+    top: 列出幾個載入最久的模組\n
+    return: (results, slowest_imports)\n
+    """
+    timings = {
+        "startup.import": [],
+        "startup.engine_init": [],
+        "startup.first_frame": [],
+        "startup.time_to_first_frame": [],
+    }
+    for index in range(samples):
+        phases, total, _ = run_child()
+        for name, value in phases.items():
+            timings[f"startup.{name}"].append(value)
+        timings["startup.time_to_first_frame"].append(total)
+        print(f"  第 {index + 1} 次：{total / 1000:.1f} ms")
+
+    # -X importtime 只跑一次，它本身會讓載入變慢，所以不算進上面的時間
+    _, _, stderr = run_child(("-X", "importtime"))
+    import_total, slowest = parse_importtime(stderr, top)
+    timings["startup.importtime_total"] = [import_total]
+
+    return {name: summarize(values) for name, values in timings.items()}, slowest
+
+
+def main():
+    """
+    啟動時間測試主函式\n
+    \n
+    子命令：\n
+    run: 執行測試並把結果寫成 JSON\n
+    compare: 拿兩次的結果比較（例如改動前後），變慢超過門檻時以錯誤碼 1 結束\n
+    """
+    parser = argparse.ArgumentParser(description="啟動時間測試")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="執行測試")
+    run_parser.add_argument("--output", default="benchmarks/results/startup.json")
+    run_parser.add_argument("--samples", type=int, default=10)
+    run_parser.add_argument("--top", type=int, default=15, help="列出幾個載入最久的模組")
+
+    compare_parser = commands.add_parser("compare", help="比較兩次的結果")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        rows, regressions = compare_results(
+            load_results(args.baseline), load_results(args.current), args.threshold
+        )
+        print_comparison(rows, regressions, args.threshold)
+        if regressions:
+            sys.exit(1)
+        return
+
+    # 子行程也要用無視窗模式
+    setup_headless()
+    print("測試啟動時間 ...")
+    results, slowest = run_benchmarks(args.samples, args.top)
+
+    print()
+    for name, stats in results.items():
+        print(f"  {name:<36}{stats['median_us'] / 1000:>10.1f} ms")
+    print()
+    print(f"載入最久的 {args.top} 個模組（-X importtime 累計時間）：")
+    for name, cumulative in slowest:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+    write_results(args.output, results, {"slowest_imports": slowest})
+    print(f"結果已寫入 {args.output}")
+
+
+######################主程式######################
+main()
@@ -0,0 +1,180 @@
+"""
+效能測試共用工具模組
+提供無視窗環境設定、計時統計、結果存檔和與基準比較的功能
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+
+# 要測試的磚牆大小（欄 x 列），從一般關卡一路到超大關卡
+WALL_SIZES = [(10, 5), (50, 20), (100, 100), (200, 200)]
+
+
+def setup_headless():
+    """
+    讓 pygame 在沒有螢幕、沒有音效卡的環境下也能跑\n
+    必須在 import pygame 之前呼叫才有效\n
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+def make_config(base_config, cols, rows, **overrides):
+    """
+    複製一份設定，換成指定大小的磚牆\n
+    base_config: 原本的設定模組\n
+    cols, rows: 磚牆的欄數和列數\n
+    overrides: 其他要覆蓋的設定值\n
+    return: 可以直接交給 GameEngine 的設定物件\n
+    \n
+    磚牆太大時會把磚塊縮小，讓整面牆還是放得進視窗上半部\n
+    """
+    values = {
+        name: getattr(base_config, name)
+        for name in dir(base_config)
+        if name.isupper()
+    }
+    values["BRICK_COLS"] = cols
+    values["BRICK_ROWS"] = rows
+
+    # 預設大小的牆放不下時，改用剛好塞得進視窗的小磚塊
+    default_width = cols * (values["BRICK_WIDTH"] + values["BRICK_PADDING"])
+    if default_width > values["WINDOW_WIDTH"]:
+        values["BRICK_PADDING"] = 1
+        values["BRICK_WIDTH"] = max(1, values["WINDOW_WIDTH"] // cols - 1)
+        values["BRICK_HEIGHT"] = max(1, (values["WINDOW_HEIGHT"] // 2) // rows - 1)
+    values.update(overrides)
+    return type("BenchmarkConfig", (), values)
+
+
+def time_samples(func, setup=None, samples=200, number=1):
+    """
+    重複執行一個函式並記錄每次花的時間\n
+    func: 要量的函式，會收到 setup 的回傳值\n
+    setup: 每次量之前先執行的準備函式（不計時），若為 None 則傳入 None\n
+    samples: 要量幾次\n
+    number: 每次連續執行幾遍（太快的函式要多跑幾遍才量得準）\n
+    return: 每次執行一遍平均花的時間清單（微秒）\n
+    """
+    timer = time.perf_counter_ns
+    results = []
+    for _ in range(samples):
+        state = setup() if setup else None
+        start = timer()
+        for _ in range(number):
+            func(state)
+        results.append((timer() - start) / number / 1000)
+    return results
+
+
+def percentile(values, fraction):
+    """
+    取得排序後位在指定比例的數值\n
+    values: 數值清單\n
+    fraction: 0 到 1 之間，例如 0.99 代表 p99\n
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(values):
+    """
+    把一串計時結果整理成統計數字\n
+    values: 計時清單（微秒）\n
+    return: dict，包含 median_us、p90_us、p99_us、min_us、samples\n
+    """
+    return {
+        "median_us": round(percentile(values, 0.5), 3),
+        "p90_us": round(percentile(values, 0.9), 3),
+        "p99_us": round(percentile(values, 0.99), 3),
+        "min_us": round(min(values), 3) if values else 0.0,
+        "samples": len(values),
+    }
+
+
+def get_environment_info():
+    """記錄這次測試的執行環境，方便比較時知道是不是同一台機器"""
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    for module_name in ("pygame", "numpy"):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            info[module_name] = getattr(module, "__version__", "unknown")
+    return info
+
+
+def write_results(path, results, extra=None):
+    """
+    把測試結果寫成 JSON 檔\n
+    path: 輸出檔案路徑，資料夾不存在會自動建立\n
+    results: {測試名稱: 統計數字}\n
+    extra: 其他要一起存的資料\n
+    """
+    document = {"environment": get_environment_info(), "results": results}
+    if extra:
+        document.update(extra)
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(document, file, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    """讀取之前存下來的測試結果，回傳 {測試名稱: 統計數字}"""
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def compare_results(baseline, current, threshold=0.2, metric="median_us"):
+    """
+    比較這次的結果和基準，找出變慢的項目\n
+    baseline, current: {測試名稱: 統計數字}\n
+    threshold: 變慢超過多少比例就算退步，0.2 代表慢了 20%\n
+    metric: 要比較哪一個統計數字\n
+    return: (rows, regressions)\n
+        rows: 每個項目的 (名稱, 基準, 這次, 變化比例) 清單\n
+        regressions: 退步的項目名稱清單\n
+    """
+    rows = []
+    regressions = []
+    for name in sorted(set(baseline) | set(current)):
+        # 只有一邊有的項目照樣列出，但不算退步
+        if name not in baseline or name not in current:
+            old_value = baseline.get(name, {}).get(metric)
+            new_value = current.get(name, {}).get(metric)
+            rows.append((name, old_value, new_value, None))
+            continue
+        old_value = baseline[name][metric]
+        new_value = current[name][metric]
+        change = (new_value - old_value) / old_value if old_value > 0 else 0.0
+        rows.append((name, old_value, new_value, change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def print_comparison(rows, regressions, threshold):
+    """把比較結果印成表格，退步的項目會標記出來"""
+    print(f"{'測試項目':<56}{'基準(us)':>12}{'這次(us)':>12}{'變化':>10}")
+    for name, old_value, new_value, change in rows:
+        old_text = f"{old_value:.2f}" if old_value is not None else "-"
+        new_text = f"{new_value:.2f}" if new_value is not None else "-"
+        change_text = f"{change * 100:+.1f}%" if change is not None else "新/已移除"
+        mark = "  <-- 退步" if name in regressions else ""
+        print(f"{name:<56}{old_text:>12}{new_text:>12}{change_text:>10}{mark}")
+    print()
+    if regressions:
+        print(f"有 {len(regressions)} 個項目比基準慢了超過 {threshold * 100:.0f}%")
+    else:
+        print("沒有發現效能退步")
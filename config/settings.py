@@ -22,6 +22,54 @@ BRICK_HEIGHT = 20
 BRICK_PADDING = 6
 BRICK_TOP_MARGIN = 50
 SPECIAL_BRICK_COUNT = 7  # 特殊爆炸磚塊數量
+SPECIAL_BLAST_SHAPE = "square"  # 爆炸形狀：square、circle、cross、row、column
+SPECIAL_BLAST_RADIUS = 1  # 爆炸半徑（格數），square 半徑 1 就是 3x3
+SPECIAL_CHAIN_REACTION = True  # 被炸到的特殊磚塊是否跟著連鎖爆炸
+LEVEL_FILE = None  # 關卡檔路徑（用 tools/convert_level.py 產生），None 時依上面的欄數、列數產生磚牆
+
+# 捲動關卡設定（磚牆比視窗高時，鏡頭上下捲動跟著球走）
+SCROLL_BOTTOM_SPACE = 400  # 磚牆下緣到關卡底部的距離（底板和發球的空間）
+CAMERA_DEAD_ZONE = 0.25  # 球離畫面中央多遠以內鏡頭不動（視窗高度的比例）
+CAMERA_SMOOTHING = 0.2  # 鏡頭每格往目標移動的比例
+WALL_CHUNK_ROWS = 16  # 磚牆繪製區塊的列數
+WALL_CHUNK_COLS = 16  # 磚牆繪製區塊的欄數
+WALL_CHUNK_CACHE_MB = 32  # 畫好的區塊畫面最多佔用的記憶體，超過就丟掉最久沒看到的區塊
+
+# 繪圖設定
+RENDER_BACKEND = "surface"  # 繪圖後端：surface（CPU 畫在視窗上）或 texture（pygame._sdl2 的 GPU 貼圖，建立失敗時改用 surface）
+RENDER_SCALE = 1.0  # 內部解析度是視窗大小的幾倍（例如 0.5 畫一半解析度再放大到視窗），遊戲邏輯一律用視窗大小的座標
+DISPLAY_FULLSCREEN = False  # 是否全螢幕（內部解析度的畫面保持比例放大到整個螢幕）
+
+# 畫面節奏設定
+FRAME_PACING = "auto"  # 每格等待方式：auto、sleep、hybrid（先睡再空轉）、busy（全部空轉）、vsync（垂直同步）
+FRAME_PACING_JITTER_TARGET = 1.0  # auto 時可以接受的每格間隔抖動 p99（毫秒），超過就換更精準的方式
+FRAME_PACING_SPIN_MS = 2.0  # hybrid 最後空轉的毫秒數（作業系統睡眠精度差時調大）
+
+# 輸入延遲設定
+LOW_LATENCY_INPUT = True  # 繪製前再讀一次最新的滑鼠位置（按 L 鍵切換）
+INPUT_LATENCY_PROBE_ENABLED = False  # 是否送出量測事件，統計輸入到顯示的延遲（結果寫進遙測）
+INPUT_LATENCY_PROBE_INTERVAL = 50  # 平均每隔幾毫秒送一次量測事件
+
+# 閒置省電設定（暫停、等待發球、勝利畫面沒有變化時，停下來等事件，只在畫面改變時重畫）
+IDLE_MODE_ENABLED = True  # 是否啟用閒置省電模式
+IDLE_FPS = 10  # 閒置時每秒最多醒來幾次（檢查自動駕駛等不靠事件觸發的變化）
+PAUSE_ON_FOCUS_LOST = True  # 視窗失去焦點時是否自動暫停（自動駕駛時不暫停）
+
+# 畫質自動調整設定（每格工作時間接近預算時一級一級降低畫質，有餘裕時再恢復）
+# 等級依序：關掉特殊磚塊閃爍和『爆』字 → 限制粒子數 → 降低遊戲畫面解析度 → 降低介面文字更新頻率
+QUALITY_GOVERNOR_ENABLED = True  # 是否自動調整畫質
+QUALITY_WINDOW = 60  # 判斷時看最近幾格的工作時間
+QUALITY_DEGRADE_RATIO = 0.85  # 工作時間 p90 超過每格預算的這個比例就降一級
+QUALITY_RESTORE_RATIO = 0.5  # 工作時間 p90 低於每格預算的這個比例才升一級（中間的空間避免來回切換）
+QUALITY_COOLDOWN_FRAMES = 180  # 每次調整後至少等幾格才能再調整
+QUALITY_PARTICLE_LIMIT = 500  # 限制粒子數時同時存在的粒子上限
+QUALITY_RENDER_SCALE = 0.5  # 降低解析度時遊戲畫面的繪製比例
+QUALITY_HUD_INTERVAL = 10  # 降低介面更新頻率時，文字每隔幾格才重新產生
+
+# 下一關預先載入設定（磚塊快打完時在背景建好下一關，過關後直接換上）
+LEVEL_PRELOAD_ENABLED = True  # 是否在背景預先建立下一關
+LEVEL_PRELOAD_REMAINING_RATIO = 0.2  # 剩下的磚塊少於這個比例時開始準備下一關
+LEVEL_PRERENDER_CHUNKS_PER_FRAME = 2  # 勝利畫面時每格最多替下一關畫幾個區塊畫面
 
 # 磚塊顏色調色盤
 BRICK_COLORS = [
@@ -52,6 +100,12 @@ BALL_SPEED_X = 7
 BALL_SPEED_Y = -7
 BALL_FOLLOW_DISTANCE = 5  # 球跟隨底板時的距離
 
+# 多球模式設定
+MULTI_BALL_MAX_COUNT = 1000  # 同時存在的額外球上限
+MULTI_BALL_POWERUP_COUNT = 2  # 特殊磚塊爆炸時分裂出來的球數
+MULTI_BALL_STRESS_MODE = False  # 壓力測試模式（按 M 鍵切換）
+MULTI_BALL_STRESS_COUNT = 300  # 壓力測試模式發球時加入的球數
+
 # 遊戲設定
 SCORE_PER_BRICK = 10
 TEXT_PADDING = 10
@@ -61,10 +115,72 @@ SCORE_FONT_SIZE = 28
 INFO_FONT_SIZE = 16
 WIN_FONT_SIZE = 48
 
+# 音效設定
+SOUND_ENABLED = False  # 是否播放音效（預設關閉；開不了音效裝置時自動停用）
+SOUND_CHANNELS = 8  # 同時最多播幾個音效，都在播時搶走最不重要、最早開始的聲道
+SOUND_FREQUENCY = 44100  # 取樣頻率
+SOUND_BUFFER = 256  # mixer 緩衝區的取樣數（256 約 6 ms），越小延遲越低，太小在慢的機器上會有爆音
+SOUND_VOLUME = 0.5  # 音量，0 到 1
+
+# 資源包設定
+ASSET_PACK_PATH = None  # 資源包路徑（用 tools/pack_assets.py 產生），None 時照舊搜尋系統字型
+ASSET_PACK_FONT = "fonts/ui"  # 資源包裡的介面字型名稱，資源包沒有這個字型時使用系統字型
+
 # 特殊效果設定
 SPECIAL_BRICK_FLASH_INTERVAL = 300  # 特殊磚塊閃爍間隔 (毫秒)
 SPECIAL_BRICK_OUTLINE_COLORS = [(255, 69, 0), (255, 215, 0)]  # 閃爍顏色
 
+# 自動駕駛設定（展示模式／浸泡測試用，按 A 鍵切換）
+AUTOPILOT_ENABLED = False
+AUTOPILOT_MAX_SPEED = 14  # 底板每格最多移動的像素數
+AUTOPILOT_ACTION_DELAY = 800  # 自動發球／下一輪前等待的時間 (毫秒)
+TRAJECTORY_MAX_BOUNCES = 32  # 球路預測最多追蹤的反彈次數
+
+# 瞄準輔助線設定（按 T 鍵切換）
+AIM_ASSIST_ENABLED = False
+AIM_ASSIST_COLOR = (90, 90, 90)
+
+# 粒子特效設定
+PARTICLE_MAX_COUNT = 2000  # 同時存在的粒子上限，超過就覆蓋最早的粒子
+PARTICLES_PER_BRICK = 8  # 每打掉一塊磚噴出的粒子數
+PARTICLES_PER_EXPLOSION = 40  # 每次特殊磚塊爆炸額外噴出的粒子數
+PARTICLE_LIFETIME = 30  # 粒子存活的格數
+PARTICLE_SPEED = 4  # 粒子噴出的最大速率
+PARTICLE_GRAVITY = 0.25  # 粒子每格往下增加的速度
+
+# 每格分段計時設定（按 F3 切換畫面上的統計顯示）
+FRAME_TIMING_ENABLED = False  # 不顯示統計時是否也持續計時（給測試或遙測使用）
+FRAME_TIMING_WINDOW = 300  # 百分位數統計最近幾格的資料
+FRAME_OVERLAY_FONT_SIZE = 14
+FRAME_OVERLAY_COLOR = (0, 255, 0)
+
+# 效能剖析擷取設定（按 F9 或送 SIGUSR1 訊號，錄下接下來幾格）
+PROFILER_CAPTURE_FRAMES = 300  # 每次擷取錄幾格（60 FPS 約 5 秒）
+PROFILER_OUTPUT_DIR = "profiles"  # 擷取檔案存放的資料夾
+PROFILER_MODE = "sample"  # "sample"（取樣呼叫堆疊，畫火焰圖）或 "cprofile"（每個函式的呼叫次數和時間），一次只用一種
+PROFILER_SAMPLE_INTERVAL = 0.001  # 取樣執行緒多久看一次呼叫堆疊（秒，只有 sample 使用）
+PROFILER_SIGNAL_ENABLED = False  # 是否接受 SIGUSR1 訊號（Windows 沒有這個訊號，會自動略過）
+
+# 效能遙測設定（定期把 FPS、每格時間、掉格數、碰撞次數、記憶體用量寫到本機檔案）
+TELEMETRY_ENABLED = False
+TELEMETRY_FORMAT = "jsonl"  # "jsonl"（一直往後加）或 "prometheus"（每次換成最新數值）
+TELEMETRY_PATH = "telemetry/telemetry.jsonl"
+TELEMETRY_INTERVAL = 5000  # 每隔幾毫秒輸出一筆紀錄
+TELEMETRY_MAX_BYTES = 5 * 1024 * 1024  # jsonl 檔案超過這個大小就輪替
+TELEMETRY_BACKUP_COUNT = 3  # 保留幾個輪替後的舊檔
+
+# 遊戲事件紀錄設定（擊中磚塊、接球、底板縮小、掉球、過關，給平衡分析使用）
+EVENT_LOG_ENABLED = False
+EVENT_LOG_PATH = "analytics/events.bin"  # 每場遊戲的事件都接在這個檔案後面
+EVENT_LOG_CHUNK_ROWS = 4096  # 每累積幾筆事件就壓縮寫出一個區塊
+
+# 排行榜設定（每一關過關或沒打完就關掉遊戲時記一筆，按 H 鍵查看）
+LEADERBOARD_ENABLED = False  # 預設關閉，打開後才會在 LEADERBOARD_PATH 建立資料庫
+LEADERBOARD_PATH = "data/leaderboard.db"  # SQLite 檔案（相對於執行時的目前目錄），資料夾不存在會自動建立
+LEADERBOARD_SIZE = 10  # 排行榜顯示前幾名
+LEADERBOARD_BATCH_SIZE = 64  # 背景執行緒一次交易最多寫幾筆
+PLAYER_NAME = "玩家"  # 記在排行榜上的玩家名稱
+
 # 繁體中文字體候選清單
 CHINESE_FONT_CANDIDATES = [
     "Microsoft JhengHei",
@@ -12,12 +12,18 @@
 """
 import sys
 import os
+import warnings
 
 ######################初始化設定######################
 # 將專案根目錄加入 Python 路徑，確保能正確 import 模組
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
+# pygame 載入時會連帶載入 pkg_resources，新版 setuptools 會印出棄用警告，只把這個警告藏起來
+with warnings.catch_warnings():
+    warnings.filterwarnings("ignore", message="pkg_resources is deprecated")
+    import pygame
+
 # 匯入必要模組
 import config.settings as config
 from src.game import GameEngine
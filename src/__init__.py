@@ -4,5 +4,5 @@ src 套件初始化檔案
 
 # 匯出主要模組
 from .game import GameEngine, GameState, GameStateManager
-from .game_objects import Ball, Brick, Paddle
+from .game_objects import Ball, BallGroup, Brick, Paddle, ParticleSystem
 from .utils import load_chinese_font
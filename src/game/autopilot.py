@@ -0,0 +1,307 @@
+"""
+自動駕駛模組
+用反射公式預測球的落點，讓底板可以自己玩（展示模式、浸泡測試）
+"""
+
+import math
+import numpy as np
+
+
+class TrajectoryPredictor:
+    """
+    球路預測器 - 不用逐格模擬，直接用反射公式算出球會掉在哪裡\n
+    \n
+    做法：\n
+    1. 把球看成一條直線在跑，算出下一個會撞到的東西（左右牆、上牆、磚塊、底板高度）\n
+    2. 撞到牆或磚塊就把速度反過來，接著算下一段\n
+    3. 到達底板高度時的 x 就是落點\n
+    \n
+    算好的結果會暫存起來，直到下一次碰撞事件才重新計算\n
+    """
+
+    def __init__(self, max_bounces=32):
+        """
+        初始化預測器\n
+        max_bounces: 最多追蹤幾次反彈，避免球在磚塊間來回時算太久\n
+        """
+        self.max_bounces = max_bounces
+        self.landing_x = None
+        self.path = []
+        self._cache_key = None
+
+    def invalidate(self):
+        """丟掉暫存的預測結果（發生碰撞或重新開局時呼叫）"""
+        self._cache_key = None
+
+    def predict(self, ball, brick_wall, paddle):
+        """
+        預測球落到底板高度時的 x 座標\n
+        ball: 球物件\n
+        brick_wall: 磚牆物件\n
+        paddle: 底板物件\n
+        return: 落點 x 座標（float）\n
+        """
+        # 速度、磚塊數量或磚牆換了，代表之前算的路線不能用了
+        cache_key = (
+            id(brick_wall),
+            ball.x_speed,
+            ball.y_speed,
+            brick_wall.get_remaining_bricks_count(),
+            paddle.rect.top,
+        )
+        if cache_key != self._cache_key:
+            self.landing_x, self.path = self._trace(ball, brick_wall, paddle)
+            self._cache_key = cache_key
+        return self.landing_x
+
+    def _trace(self, ball, brick_wall, paddle):
+        """
+        沿著球路一段一段往前算，直到球到達底板高度\n
+        return: (landing_x, path)，path 是每個轉折點組成的清單\n
+        """
+        radius = ball.radius
+        left = radius
+        right = ball.screen_width - radius
+        top = radius
+        land_y = paddle.rect.top - radius
+
+        x, y = float(ball.x), float(ball.y)
+        vx, vy = float(ball.x_speed), float(ball.y_speed)
+        path = [(x, y)]
+        broken = set()  # 預測中已經被撞掉的磚塊
+
+        # 一段一段往前算，撞到東西就轉彎，到達底板高度或次數用完就停
+        for _ in range(self.max_bounces):
+            # 球完全不動就沒辦法預測，直接回傳目前位置
+            if vx == 0 and vy == 0:
+                break
+
+            # 如果球已經在底板下面，落點就是現在的 x
+            if vy > 0 and y >= land_y:
+                path.append((x, y))
+                return x, path
+
+            # 算出撞到左右牆和上牆（或到達底板高度）各要多久
+            t_wall_x = math.inf
+            if vx > 0:
+                t_wall_x = max(0.0, (right - x) / vx)
+            elif vx < 0:
+                t_wall_x = max(0.0, (left - x) / vx)
+
+            t_wall_y = math.inf
+            if vy < 0:
+                t_wall_y = max(0.0, (top - y) / vy)
+            elif vy > 0:
+                t_wall_y = (land_y - y) / vy
+
+            t_limit = min(t_wall_x, t_wall_y)
+            brick_hit = self._first_brick_hit(
+                x, y, vx, vy, t_limit, brick_wall, radius, broken
+            )
+
+            # 先撞到磚塊：記下這塊磚會被打掉，依撞擊方向反彈
+            if brick_hit is not None:
+                t_hit, row, col, direction = brick_hit
+                x += vx * t_hit
+                y += vy * t_hit
+                broken.add((row, col))
+                if direction == "horizontal":
+                    vx = -vx
+                else:
+                    vy = -vy
+                path.append((x, y))
+                continue
+
+            x += vx * t_limit
+            y += vy * t_limit
+            path.append((x, y))
+
+            # 往下走到底板高度，這就是落點
+            if vy > 0 and t_wall_y <= t_wall_x:
+                return x, path
+
+            # 撞到左右牆就把左右速度反過來，撞到上牆就把上下速度反過來
+            if t_wall_x <= t_wall_y:
+                vx = -vx
+            if vy < 0 and t_wall_y <= t_wall_x:
+                vy = -vy
+
+        # 反彈次數用完還沒落地，就用最後的位置當作最好的猜測
+        return max(left, min(right, x)), path
+
+    def _first_brick_hit(self, x, y, vx, vy, t_max, brick_wall, radius, broken):
+        """
+        找出這段直線上第一個會撞到的磚塊\n
+        只檢查直線經過的那幾列、那幾欄，不用掃整面牆\n
+        return: (t, row, col, direction)，沒撞到就回傳 None\n
+        """
+        pitch_x = brick_wall.pitch_x
+        pitch_y = brick_wall.pitch_y
+        y_end = y + vy * t_max
+
+        # 把球當成一個點，磚塊往外加大一個半徑，這樣只要算點跟方塊
+        y_min = min(y, y_end) - radius - brick_wall.top_margin
+        y_max = max(y, y_end) + radius - brick_wall.top_margin
+        row_lo = max(0, int(y_min // pitch_y))
+        row_hi = min(brick_wall.rows - 1, int(y_max // pitch_y))
+
+        best = None
+        # 整排區塊都打光的列不用算（超大關卡裡球常常穿過一大片空地）
+        chunks = brick_wall.chunks
+        chunk_rows = chunks.chunk_rows
+        chunk_row_lo = row_lo // chunk_rows
+        chunk_row_hi = row_hi // chunk_rows
+        has_bricks = chunks.get_alive_counts()[chunk_row_lo : chunk_row_hi + 1].any(axis=1)
+        for row in range(row_lo, row_hi + 1):
+            if not has_bricks[row // chunk_rows - chunk_row_lo]:
+                continue
+            band_top = brick_wall.top_margin + row * pitch_y - radius
+            band_bottom = band_top + brick_wall.brick_height + 2 * radius
+
+            # 算出球在這一列的高度範圍內的時間區間
+            if vy == 0:
+                if not band_top <= y <= band_bottom:
+                    continue
+                t0, t1 = 0.0, t_max
+            else:
+                ta = (band_top - y) / vy
+                tb = (band_bottom - y) / vy
+                t0, t1 = max(0.0, min(ta, tb)), min(t_max, max(ta, tb))
+                if t0 > t1:
+                    continue
+
+            # 這段時間內球的左右範圍，換算成要檢查的欄
+            xa = x + vx * t0 - radius - brick_wall.start_x
+            xb = x + vx * t1 + radius - brick_wall.start_x
+            col_lo = max(0, int(min(xa, xb) // pitch_x))
+            col_hi = min(brick_wall.cols - 1, int(max(xa, xb) // pitch_x))
+
+            for col in range(col_lo, col_hi + 1):
+                if (row, col) in broken or not brick_wall.is_brick_alive(row, col):
+                    continue
+                box_left = brick_wall.start_x + col * pitch_x - radius
+                hit = _ray_box_hit(
+                    x,
+                    y,
+                    vx,
+                    vy,
+                    box_left,
+                    band_top,
+                    box_left + brick_wall.brick_width + 2 * radius,
+                    band_bottom,
+                    t_max,
+                )
+                if hit is not None and (best is None or hit[0] < best[0]):
+                    best = (hit[0], row, col, hit[1])
+        return best
+
+
+def _ray_box_hit(x, y, vx, vy, left, top, right, bottom, t_max):
+    """
+    計算直線什麼時候碰到方塊（分別算左右和上下進入方塊的時間）\n
+    return: (t, direction)，沒碰到就回傳 None\n
+    """
+    if vx == 0:
+        if not left <= x <= right:
+            return None
+        tx_enter, tx_exit = -math.inf, math.inf
+    else:
+        ta, tb = (left - x) / vx, (right - x) / vx
+        tx_enter, tx_exit = min(ta, tb), max(ta, tb)
+
+    if vy == 0:
+        if not top <= y <= bottom:
+            return None
+        ty_enter, ty_exit = -math.inf, math.inf
+    else:
+        ta, tb = (top - y) / vy, (bottom - y) / vy
+        ty_enter, ty_exit = min(ta, tb), max(ta, tb)
+
+    t_enter = max(tx_enter, ty_enter)
+    t_exit = min(tx_exit, ty_exit)
+    if t_enter > t_exit or t_exit < 0 or t_enter > t_max:
+        return None
+
+    # 最後才進入的那個方向，就是撞到的那一面
+    direction = "horizontal" if tx_enter > ty_enter else "vertical"
+    return max(0.0, t_enter), direction
+
+
+class Autopilot:
+    """
+    自動駕駛輸入來源 - 取代滑鼠來控制底板\n
+    \n
+    利用球路預測器找出落點，把底板移過去接球，\n
+    並稍微偏一點，讓球往還有磚塊的地方彈\n
+    """
+
+    def __init__(self, predictor=None, max_speed=14, action_delay=800):
+        """
+        初始化自動駕駛\n
+        predictor: 球路預測器，若為 None 則自動建立\n
+        max_speed: 底板每格最多移動的像素數，讓動作看起來自然\n
+        action_delay: 等待發球或下一輪時，要等多久（毫秒）才自動按下\n
+        """
+        self.predictor = predictor if predictor else TrajectoryPredictor()
+        self.max_speed = max_speed
+        self.action_delay = action_delay
+        self._waiting_state = None
+        self._waiting_since = 0
+        self._aim_cache_key = None
+        self._aim_x = 0
+
+    def get_paddle_target(self, ball, brick_wall, paddle):
+        """
+        計算底板中心這一格要移到哪裡\n
+        ball: 球物件\n
+        brick_wall: 磚牆物件\n
+        paddle: 底板物件\n
+        return: 底板中心的目標 x 座標\n
+        """
+        # 球還沒發射時就待在原地
+        if not ball.started:
+            return paddle.rect.centerx
+
+        landing_x = self.predictor.predict(ball, brick_wall, paddle)
+
+        # 讓球打在底板偏一點的位置，把球送往剩下磚塊比較多的方向
+        aim_x = self._get_bricks_center_x(brick_wall, ball.screen_width)
+        hit_factor = max(-0.5, min(0.5, (aim_x - landing_x) / ball.screen_width))
+        desired_x = landing_x - hit_factor * paddle.width / 2
+
+        # 每格最多移動 max_speed 像素，不要瞬間移動
+        current_x = paddle.rect.centerx
+        step = max(-self.max_speed, min(self.max_speed, desired_x - current_x))
+        return current_x + step
+
+    def _get_bricks_center_x(self, brick_wall, screen_width):
+        """算出剩下磚塊的平均 x 位置（沒有磚塊時回傳螢幕中央）"""
+        # 磚塊數量沒變就直接用上次算好的結果，不用每格都掃整面牆
+        cache_key = (id(brick_wall), brick_wall.get_remaining_bricks_count())
+        if cache_key != self._aim_cache_key:
+            self._aim_x = self._scan_bricks_center_x(brick_wall, screen_width)
+            self._aim_cache_key = cache_key
+        return self._aim_x
+
+    def _scan_bricks_center_x(self, brick_wall, screen_width):
+        """用每一欄剩下的磚塊數，算出剩下磚塊的平均 x 位置（只看欄數，不用掃整面牆）"""
+        col_counts = brick_wall.col_alive_counts
+        total = col_counts.sum()
+        if total == 0:
+            return screen_width / 2
+        mean_col = np.dot(np.arange(len(col_counts)), col_counts) / total
+        return brick_wall.start_x + mean_col * brick_wall.pitch_x + brick_wall.brick_width / 2
+
+    def should_act(self, state, now):
+        """
+        判斷是否該自動按下發球或下一輪\n
+        state: 目前的遊戲狀態\n
+        now: 目前時間（毫秒）\n
+        return: 同一個狀態持續超過 action_delay 就回傳 True\n
+        """
+        # 狀態一換就重新開始計時
+        if state != self._waiting_state:
+            self._waiting_state = state
+            self._waiting_since = now
+            return False
+        return now - self._waiting_since >= self.action_delay
@@ -0,0 +1,68 @@
+"""
+鏡頭模組
+關卡比視窗高時，讓畫面上下捲動跟著球走
+"""
+
+
+class Camera:
+    """
+    垂直捲動的鏡頭\n
+    \n
+    遊戲物件都用世界座標（整個關卡的座標），畫到螢幕上時 y 要減掉鏡頭的 top。\n
+    球在畫面中間一段範圍（dead zone）內移動時鏡頭不動，超出範圍才慢慢跟上，\n
+    畫面才不會跟著球的每一下反彈抖動。關卡沒有比視窗高時鏡頭永遠停在 0\n
+    """
+
+    def __init__(self, view_width, view_height, world_height, dead_zone=0.25, smoothing=0.2):
+        """
+        初始化鏡頭\n
+        view_width, view_height: 視窗大小\n
+        world_height: 整個關卡的高度\n
+        dead_zone: 球離畫面中央多遠以內鏡頭不動（視窗高度的比例）\n
+        smoothing: 每格往目標位置移動的比例（1 代表直接跳過去）\n
+        """
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_height = world_height
+        self.dead_zone = dead_zone
+        self.smoothing = smoothing
+        self.max_top = max(0, world_height - view_height)
+
+        # 一開始停在最下面（底板所在的地方）
+        self.top = float(self.max_top)
+
+    @property
+    def is_scrolling(self):
+        """關卡比視窗高，鏡頭需要捲動"""
+        return self.max_top > 0
+
+    @property
+    def offset_y(self):
+        """繪製時每個物件的 y 要減掉的量（整數像素）"""
+        return int(self.top)
+
+    def follow(self, target_y):
+        """
+        讓鏡頭跟著目標移動（每格呼叫一次）\n
+        target_y: 目標的世界座標 y（通常是球）\n
+        """
+        if not self.is_scrolling:
+            return
+        half_view = self.view_height / 2
+        limit = self.view_height * self.dead_zone
+        center = self.top + half_view
+        if target_y < center - limit:
+            desired = target_y + limit - half_view
+        elif target_y > center + limit:
+            desired = target_y - limit - half_view
+        else:
+            return
+        self.top = self._clamp(self.top + (desired - self.top) * self.smoothing)
+
+    def snap_to(self, target_y):
+        """直接把鏡頭移到讓目標在畫面中央的位置（開新的一輪、測試場景用）"""
+        self.top = self._clamp(target_y - self.view_height / 2)
+
+    def _clamp(self, top):
+        """不讓鏡頭超出關卡上下邊界"""
+        return max(0.0, min(float(self.max_top), top))
@@ -3,13 +3,29 @@
 整合所有遊戲元素並管理遊戲主迴圈
 """
 
+import math
 import pygame
 import sys
+import time
 
-from ..game_objects import Ball, Brick, Paddle
-from ..utils.font_loader import load_chinese_font
-from ..utils.colors import BACKGROUND_COLOR, TEXT_COLOR, INFO_TEXT_COLOR
+# 資源包、texture 繪圖器、音效、事件紀錄、排行榜、效能剖析和遙測都是選用的功能，
+# 在設定打開（或第一次用到）時才載入，不拖慢一般開機
+from ..game_objects import Ball, BallGroup, Brick, Paddle, ParticleSystem
+from ..utils.font_loader import load_chinese_font, use_packed_font
+from ..utils.frame_pacer import FramePacer
+from ..utils.frame_timer import FrameTimer, FrameTimingOverlay
+from ..utils.input_latency import PointerInput
+from ..utils.colors import (
+    BACKGROUND_COLOR,
+    BRICK_COLORS,
+    SPECIAL_BRICK_FLASH_COLORS,
+)
 from .game_state import GameState, GameStateManager
+from .autopilot import Autopilot, TrajectoryPredictor
+from .camera import Camera
+from .hud import HudLayer
+from .level_preloader import LevelPreloader, PreparedLevel
+from .quality_governor import QualityGovernor, build_quality_levels
 
 
 class GameEngine:
@@ -23,39 +39,290 @@ class GameEngine:
         self.config = config
         self.clock = pygame.time.Clock()
 
-        # 初始化 pygame
-        pygame.init()
+        # 只初始化用得到的 pygame 模組（畫面和字型），
+        # pygame.init() 會連音效、搖桿等用不到的模組一起啟動，拖慢開機
+        pygame.display.init()
+        pygame.font.init()
 
-        # 設定視窗
-        self.screen = pygame.display.set_mode(
-            (config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
+        # 資源包（記憶體映射，資源用到時才解開；有介面字型時就不用搜尋系統字型）
+        self.assets = None
+        if config.ASSET_PACK_PATH:
+            from ..utils.asset_pack import open_asset_pack
+
+            try:
+                self.assets = open_asset_pack(config.ASSET_PACK_PATH)
+            except (OSError, ValueError) as e:
+                print(f"無法開啟資源包，改用系統字型：{e}")
+        has_packed_font = self.assets is not None and config.ASSET_PACK_FONT in self.assets
+        use_packed_font(self.assets if has_packed_font else None, config.ASSET_PACK_FONT)
+
+        # 設定視窗和繪圖器（用垂直同步控制節奏時，視窗要用 vsync 開啟）
+        # 遊戲邏輯一律用 WINDOW_WIDTH x WINDOW_HEIGHT 的邏輯座標，視窗也開這個大小，
+        # 畫面畫在 RENDER_SCALE 倍的內部解析度上，顯示時一次放大到視窗
+        pacing = config.FRAME_PACING
+        window_size = (config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
+        self.render_scale = config.RENDER_SCALE
+        self.render_size = (
+            max(1, round(config.WINDOW_WIDTH * self.render_scale)),
+            max(1, round(config.WINDOW_HEIGHT * self.render_scale)),
+        )
+        self.renderer = None
+        if config.RENDER_BACKEND == "texture":
+            from ..utils.renderer import TextureRenderer
+
+            try:
+                self.renderer = TextureRenderer(
+                    config.WINDOW_TITLE,
+                    window_size,
+                    render_size=self.render_size,
+                    fullscreen=config.DISPLAY_FULLSCREEN,
+                    vsync=pacing == "vsync",
+                )
+            except Exception as e:
+                # 沒有 pygame._sdl2 或顯示驅動不支援時改用 surface
+                print(f"無法建立 texture 繪圖器，改用 surface：{e}")
+        if self.renderer is None:
+            from ..utils.renderer import SurfaceRenderer
+
+            window, pacing = self._open_display(pacing, config.DISPLAY_FULLSCREEN)
+            pygame.display.set_caption(config.WINDOW_TITLE)
+            self.renderer = SurfaceRenderer(window, render_size=self.render_size)
+
+        # 畫面節奏控制（auto 會從最省 CPU 的方式開始，抖動超過目標才換更精準的方式）
+        self.frame_pacer = FramePacer(
+            self.clock,
+            config.FPS,
+            strategy="sleep" if pacing == "auto" else pacing,
+            window=config.FRAME_TIMING_WINDOW,
+            spin_ms=config.FRAME_PACING_SPIN_MS,
+            auto=pacing == "auto",
+            jitter_target_ms=config.FRAME_PACING_JITTER_TARGET,
         )
-        pygame.display.set_caption(config.WINDOW_TITLE)
 
         # 遊戲狀態管理器
         self.game_state = GameStateManager()
 
-        # 字型設定
-        self.score_font = load_chinese_font(config.SCORE_FONT_SIZE)
-        self.info_font = load_chinese_font(config.INFO_FONT_SIZE)
-        self.win_font = load_chinese_font(config.WIN_FONT_SIZE)
+        # 自動駕駛（用球路預測取代滑鼠控制底板）
+        self.autopilot = Autopilot(
+            predictor=TrajectoryPredictor(max_bounces=config.TRAJECTORY_MAX_BOUNCES),
+            max_speed=config.AUTOPILOT_MAX_SPEED,
+            action_delay=config.AUTOPILOT_ACTION_DELAY,
+        )
+        self.is_autopilot_enabled = config.AUTOPILOT_ENABLED
+        self.is_aim_assist_enabled = config.AIM_ASSIST_ENABLED
+
+        # 多球壓力測試模式
+        self.is_stress_mode = config.MULTI_BALL_STRESS_MODE
+
+        # 滑鼠輸入：低延遲模式在繪製前再讀一次最新的指標位置
+        self.pointer = PointerInput(
+            window=config.FRAME_TIMING_WINDOW, scale=self.renderer.pointer_scale
+        )
+        self.is_low_latency_input = config.LOW_LATENCY_INPUT
+        self.input_probe = None
+        if config.INPUT_LATENCY_PROBE_ENABLED:
+            from ..utils.input_latency import InputLatencyProbe
+
+            self.input_probe = InputLatencyProbe(
+                self.pointer, interval_ms=config.INPUT_LATENCY_PROBE_INTERVAL
+            )
+
+        # 粒子特效（磚塊顏色之後接著爆炸用的兩種顏色）
+        self.particles = ParticleSystem(
+            capacity=config.PARTICLE_MAX_COUNT,
+            colors=BRICK_COLORS + SPECIAL_BRICK_FLASH_COLORS,
+            lifetime=config.PARTICLE_LIFETIME,
+            speed=config.PARTICLE_SPEED,
+            gravity=config.PARTICLE_GRAVITY,
+        )
+        self.explosion_color_start = len(BRICK_COLORS)
+
+        # 畫質調整（每格工作時間接近預算時一級一級降低畫質，關閉時為 None，一直用最高畫質）
+        quality_levels = build_quality_levels(
+            particle_limit=config.QUALITY_PARTICLE_LIMIT,
+            render_scale=config.QUALITY_RENDER_SCALE,
+            hud_interval=config.QUALITY_HUD_INTERVAL,
+        )
+        self.quality = quality_levels[0]
+        self.quality_governor = None
+        if config.QUALITY_GOVERNOR_ENABLED:
+            self.quality_governor = QualityGovernor(
+                budget_ms=1000 / config.FPS,
+                levels=quality_levels,
+                window=config.QUALITY_WINDOW,
+                degrade_ratio=config.QUALITY_DEGRADE_RATIO,
+                restore_ratio=config.QUALITY_RESTORE_RATIO,
+                cooldown_frames=config.QUALITY_COOLDOWN_FRAMES,
+            )
+        self._hud = None  # 介面圖層，第一次繪製介面時才建立
+
+        # 每格分段計時（按 F3 切換畫面上的統計顯示）
+        self.frame_timer = FrameTimer(
+            window=config.FRAME_TIMING_WINDOW, enabled=config.FRAME_TIMING_ENABLED
+        )
+        self.frame_timing_overlay = FrameTimingOverlay(
+            self.frame_timer,
+            font_size=max(1, round(config.FRAME_OVERLAY_FONT_SIZE * self.render_scale)),
+            color=config.FRAME_OVERLAY_COLOR,
+        )
+        self.is_frame_overlay_visible = False
+
+        # 效能剖析擷取（按 F9 或送 SIGUSR1 訊號，錄下接下來幾格）
+        # 第一次按 F9 時才建立；開了訊號時一開始就要建立，才能註冊訊號處理
+        self.profiler_capture = None
+        if config.PROFILER_SIGNAL_ENABLED:
+            self._get_profiler_capture().install_signal_handler()
+
+        # 效能遙測（關閉時為 None，主迴圈不做任何事）
+        self.telemetry = None
+        if config.TELEMETRY_ENABLED:
+            # 預設關閉，開啟時才載入，不拖慢一般開機
+            from ..utils.telemetry import TelemetryExporter
+
+            self.telemetry = TelemetryExporter(
+                path=config.TELEMETRY_PATH,
+                target_fps=config.FPS,
+                interval_ms=config.TELEMETRY_INTERVAL,
+                output_format=config.TELEMETRY_FORMAT,
+                max_bytes=config.TELEMETRY_MAX_BYTES,
+                backup_count=config.TELEMETRY_BACKUP_COUNT,
+            )
+
+        # 音效（關閉時為 None；run() 開始時才在背景執行緒開啟音效裝置、解碼音效）
+        self.sound_mixer = None
+        if config.SOUND_ENABLED:
+            from ..utils.sound_mixer import SoundMixer
+
+            self.sound_mixer = SoundMixer(
+                channels=config.SOUND_CHANNELS,
+                frequency=config.SOUND_FREQUENCY,
+                buffer=config.SOUND_BUFFER,
+                volume=config.SOUND_VOLUME,
+                pack=self.assets,
+            )
+
+        # 遊戲事件紀錄（關閉時為 None）
+        self.frame_index = 0
+        self.event_recorder = None
+        self._event_codes = None  # 事件名稱 -> 事件種類，開了事件紀錄才有
+        if config.EVENT_LOG_ENABLED:
+            from ..utils.event_log import EVENT_CODES, EventRecorder
+
+            self.event_recorder = EventRecorder(
+                path=config.EVENT_LOG_PATH, chunk_rows=config.EVENT_LOG_CHUNK_ROWS
+            )
+            self._event_codes = EVENT_CODES
+
+        # 排行榜（關閉時為 None；run() 開始時才啟動背景寫入執行緒）
+        self.leaderboard = None
+        if config.LEADERBOARD_ENABLED:
+            from ..utils.leaderboard import Leaderboard
+
+            self.leaderboard = Leaderboard(
+                path=config.LEADERBOARD_PATH, batch_size=config.LEADERBOARD_BATCH_SIZE
+            )
+        self.is_high_score_visible = False
+
+        # 下一關預先載入（關閉時為 None，過關時當場建立）
+        self.level_preloader = None
+        if config.LEVEL_PRELOAD_ENABLED:
+            self.level_preloader = LevelPreloader(self._build_level)
+        self.last_level_transition_ms = None  # 上一次換關花了多少毫秒
+
+        # 閒置省電：上一格畫面看得到的狀態，以及畫面是不是還在變
+        self._last_view_signature = None
+        self._is_view_changing = True
 
         # 初始化遊戲物件
         self.init_game_objects()
 
-    def init_game_objects(self):
-        """初始化遊戲物件"""
-        # 建立磚牆
-        self.brick_wall = Brick(
-            cols=self.config.BRICK_COLS,
-            rows=self.config.BRICK_ROWS,
-            brick_width=self.config.BRICK_WIDTH,
-            brick_height=self.config.BRICK_HEIGHT,
-            padding=self.config.BRICK_PADDING,
-            top_margin=self.config.BRICK_TOP_MARGIN,
-            screen_width=self.config.WINDOW_WIDTH,
-            special_count=self.config.SPECIAL_BRICK_COUNT,
-        )
+    def _open_display(self, pacing, fullscreen):
+        """
+        用 pygame.display.set_mode 開啟 WINDOW_WIDTH x WINDOW_HEIGHT 的視窗\n
+        內部解析度的畫布由 SurfaceRenderer 在 present 時一次放大到視窗大小\n
+        全螢幕或垂直同步時要加 pygame.SCALED（pygame 只有 SCALED 或 OPENGL 才能開垂直同步），\n
+        邏輯大小一樣是視窗大小，SDL 再保持比例放大到螢幕；\n
+        這時桌面夠大的話，SDL 會把視窗開成視窗大小的整數倍，遊戲和滑鼠座標不受影響\n
+        pacing: 畫面節奏設定\n
+        fullscreen: 是否全螢幕\n
+        return: (視窗 Surface, 實際使用的畫面節奏)\n
+        """
+        window_size = (self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT)
+        while True:
+            flags = 0
+            if fullscreen or pacing == "vsync":
+                flags |= pygame.SCALED
+            if fullscreen:
+                flags |= pygame.FULLSCREEN
+            try:
+                return (
+                    pygame.display.set_mode(
+                        window_size, flags, vsync=1 if pacing == "vsync" else 0
+                    ),
+                    pacing,
+                )
+            except pygame.error as e:
+                if fullscreen:
+                    # 顯示驅動不支援全螢幕就改用視窗
+                    print(f"無法開啟全螢幕，改用視窗：{e}")
+                    fullscreen = False
+                elif pacing == "vsync":
+                    # 顯示驅動不支援垂直同步就改用 hybrid
+                    print(f"無法開啟垂直同步，改用 hybrid：{e}")
+                    pacing = "hybrid"
+                else:
+                    raise
+
+    # 字型等到第一次繪製文字時才載入（load_chinese_font 會記住建立過的字型）
+    # 文字直接用內部解析度的大小產生，放大時不會變模糊，縮小時也不會多畫
+    def _load_font(self, size):
+        """載入依內部解析度調整大小的字型"""
+        return load_chinese_font(max(1, round(size * self.render_scale)))
+
+    @property
+    def score_font(self):
+        """分數字型"""
+        return self._load_font(self.config.SCORE_FONT_SIZE)
+
+    @property
+    def info_font(self):
+        """提示文字字型"""
+        return self._load_font(self.config.INFO_FONT_SIZE)
+
+    @property
+    def win_font(self):
+        """勝利文字字型"""
+        return self._load_font(self.config.WIN_FONT_SIZE)
+
+    @property
+    def hud(self):
+        """介面圖層（第一次用到時才建立，字型也是那時才載入）"""
+        if self._hud is None:
+            self._hud = HudLayer(
+                self.renderer,
+                {"score": self.score_font, "info": self.info_font, "win": self.win_font},
+                padding=round(self.config.TEXT_PADDING * self.render_scale),
+                scale=self.render_scale,
+            )
+        return self._hud
+
+    def init_game_objects(self, prepared_level=None):
+        """
+        初始化遊戲物件\n
+        prepared_level: 事先建好的關卡（PreparedLevel），若為 None 則現在建立目前這一關\n
+        """
+        if prepared_level is None:
+            prepared_level = self._build_level(self.game_state.level)
+
+        # 換上這一關的磚牆、關卡高度和鏡頭
+        self.brick_wall = prepared_level.brick_wall
+        self.world_height = prepared_level.world_height
+        self.camera = prepared_level.camera
+        self.level_brick_total = self.brick_wall.get_remaining_bricks_count()
+
+        # 背景準備的關卡在勝利畫面時已經畫好大部分的區塊畫面，這裡只補畫沒畫到的
+        # （沒有預先載入、還沒畫完或畫質比例改變了）
+        self._prerender_wall()
 
         # 建立底板
         self.paddle = Paddle(
@@ -65,7 +332,7 @@ class GameEngine:
             y_offset=self.config.PADDLE_Y_OFFSET,
             color=self.config.PADDLE_COLOR,
             screen_width=self.config.WINDOW_WIDTH,
-            screen_height=self.config.WINDOW_HEIGHT,
+            screen_height=self.world_height,
             shrink_amount=self.config.PADDLE_SHRINK_AMOUNT,
             min_width=self.config.PADDLE_MIN_WIDTH,
         )
@@ -73,33 +340,185 @@ class GameEngine:
         # 建立球
         self.ball = Ball(
             x=self.config.WINDOW_WIDTH // 2,
-            y=self.config.WINDOW_HEIGHT - 60,
+            y=self.world_height - 60,
             radius=self.config.BALL_RADIUS,
             color=self.config.BALL_COLOR,
             x_speed=self.config.BALL_SPEED_X,
             y_speed=self.config.BALL_SPEED_Y,
             screen_width=self.config.WINDOW_WIDTH,
-            screen_height=self.config.WINDOW_HEIGHT,
+            screen_height=self.world_height,
             follow_distance=self.config.BALL_FOLLOW_DISTANCE,
         )
 
+        # 建立額外的球（多球道具和壓力測試用，一開始是空的）
+        self.extra_balls = BallGroup(
+            capacity=self.config.MULTI_BALL_MAX_COUNT,
+            radius=self.config.BALL_RADIUS,
+            color=self.config.BALL_COLOR,
+            screen_width=self.config.WINDOW_WIDTH,
+            screen_height=self.world_height,
+        )
+
+        # 上一輪留下的碎片不要帶到新的一輪
+        self.particles.clear()
+
+        # 新的磚牆和球，之前預測的球路不能再用
+        self.autopilot.predictor.invalidate()
+
+        # 這一關的成績從第一次發球開始算
+        self.level_start_time = None
+        self.level_bricks_destroyed = 0
+
         # 重置遊戲狀態
         self.game_state.reset_score()
         self.game_state.set_state(GameState.WAITING_TO_START)
 
-    def handle_events(self):
-        """處理遊戲事件"""
-        for event in pygame.event.get():
+    def _build_level(self, level_number, rng=None):
+        """
+        建立一關的磚牆、關卡高度和鏡頭\n
+        背景預先載入也會在背景執行緒呼叫這個方法，所以只能用設定建立新的物件（陣列和關卡配置），\n
+        不能讀取或修改目前正在玩的物件、畫質，也不能建立繪圖器的圖層\n
+        level_number: 第幾關\n
+        rng: 選特殊磚塊用的 random.Random 物件，若為 None 則使用 random 模組\n
+        return: PreparedLevel\n
+        """
+        start = time.perf_counter()
+
+        # 建立磚牆（有設定關卡檔就照關卡檔，否則照設定的欄數、列數產生）
+        wall_settings = dict(
+            brick_width=self.config.BRICK_WIDTH,
+            brick_height=self.config.BRICK_HEIGHT,
+            padding=self.config.BRICK_PADDING,
+            top_margin=self.config.BRICK_TOP_MARGIN,
+            screen_width=self.config.WINDOW_WIDTH,
+            blast_shape=self.config.SPECIAL_BLAST_SHAPE,
+            blast_radius=self.config.SPECIAL_BLAST_RADIUS,
+            chain_reaction=self.config.SPECIAL_CHAIN_REACTION,
+            chunk_rows=self.config.WALL_CHUNK_ROWS,
+            chunk_cols=self.config.WALL_CHUNK_COLS,
+            chunk_cache_bytes=self.config.WALL_CHUNK_CACHE_MB * 1024 * 1024,
+        )
+        if self.config.LEVEL_FILE:
+            brick_wall = Brick.from_level_file(self.config.LEVEL_FILE, **wall_settings)
+        else:
+            brick_wall = Brick(
+                cols=self.config.BRICK_COLS,
+                rows=self.config.BRICK_ROWS,
+                special_count=self.config.SPECIAL_BRICK_COUNT,
+                rng=rng,
+                **wall_settings,
+            )
+
+        # 磚牆比視窗高時，整個關卡延伸到磚牆下方再留一段空間給底板，鏡頭跟著球捲動
+        world_height = max(
+            self.config.WINDOW_HEIGHT,
+            brick_wall.bottom + self.config.SCROLL_BOTTOM_SPACE,
+        )
+        camera = Camera(
+            self.config.WINDOW_WIDTH,
+            self.config.WINDOW_HEIGHT,
+            world_height,
+            dead_zone=self.config.CAMERA_DEAD_ZONE,
+            smoothing=self.config.CAMERA_SMOOTHING,
+        )
+
+        build_ms = (time.perf_counter() - start) * 1000
+        return PreparedLevel(level_number, brick_wall, world_height, camera, build_ms)
+
+    def _prerender_wall(self, prepared_level=None, limit=None):
+        """
+        用目前畫質的比例先把鏡頭一開始看得到的區塊畫好，換上後第一格不用再畫\n
+        會建立繪圖器的圖層，只能在主執行緒呼叫\n
+        prepared_level: 要畫的關卡（PreparedLevel），若為 None 則畫目前這一關\n
+        limit: 這次最多畫幾塊，若為 None 則全部畫完\n
+        return: 這次新畫的區塊數量\n
+        """
+        brick_wall, camera = self.brick_wall, self.camera
+        if prepared_level is not None:
+            brick_wall, camera = prepared_level.brick_wall, prepared_level.camera
+        chunks = brick_wall.chunks
+        chunks.set_scale(self.render_scale * self.quality["render_scale"])
+        return chunks.prerender(
+            camera.offset_y,
+            self.config.WINDOW_WIDTH,
+            self.config.WINDOW_HEIGHT,
+            self.renderer,
+            limit=limit,
+        )
+
+    def _get_level_to_prerender(self):
+        """勝利畫面時，取得背景已經建好、區塊畫面還沒畫完的下一關，沒有時為 None"""
+        if self.level_preloader is None or not self.game_state.is_win():
+            return None
+        prepared_level = self.level_preloader.peek(self.game_state.level + 1)
+        if prepared_level is None or prepared_level.is_prerendered:
+            return None
+        return prepared_level
+
+    def _prerender_next_level(self):
+        """
+        勝利畫面閒著，每格替背景建好的下一關畫幾塊一開始看得到的區塊（主執行緒），\n
+        換關時只要換上參照，不用在那一格畫整個畫面\n
+        return: 是否還有區塊沒畫完\n
+        """
+        prepared_level = self._get_level_to_prerender()
+        if prepared_level is None:
+            return False
+        limit = self.config.LEVEL_PRERENDER_CHUNKS_PER_FRAME
+        if self._prerender_wall(prepared_level, limit) < limit:
+            prepared_level.is_prerendered = True
+        return not prepared_level.is_prerendered
+
+    def _preload_next_level(self):
+        """剩下的磚塊夠少時，開始在背景準備下一關"""
+        if self.level_preloader is None:
+            return
+        remaining = self.brick_wall.get_remaining_bricks_count()
+        if remaining <= self.level_brick_total * self.config.LEVEL_PRELOAD_REMAINING_RATIO:
+            self.level_preloader.request(self.game_state.level + 1)
+
+    def _start_next_level(self):
+        """
+        過關後進入下一關\n
+        背景已經建好就直接換上，還沒建好（或沒開預先載入）就當場建立；\n
+        換關花的時間記在 last_level_transition_ms\n
+        """
+        start = time.perf_counter()
+        self.game_state.next_level()
+        prepared_level = None
+        if self.level_preloader is not None:
+            prepared_level = self.level_preloader.take(self.game_state.level)
+        self.init_game_objects(prepared_level)
+        self.last_level_transition_ms = (time.perf_counter() - start) * 1000
+
+    def handle_events(self, events=None):
+        """
+        處理遊戲事件\n
+        events: 已經取出來的事件清單（閒置時等到的事件），若為 None 則從事件佇列取\n
+        """
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 return False
 
+            if event.type == pygame.MOUSEMOTION:
+                self.pointer.handle_motion(event)
+
+            # 視窗失去焦點時自動暫停（自動駕駛展示時繼續玩）
+            if (
+                event.type == pygame.WINDOWFOCUSLOST
+                and self.config.PAUSE_ON_FOCUS_LOST
+                and self.game_state.is_playing()
+                and not self.is_autopilot_enabled
+            ):
+                self.game_state.pause()
+
             # 滑鼠點擊或空白鍵發球
             if event.type == pygame.MOUSEBUTTONDOWN or (
                 event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE
             ):
-                if self.game_state.is_waiting():
-                    self.ball.start()
-                    self.game_state.set_state(GameState.PLAYING)
+                self._serve_ball()
 
             # 按 E 鍵在勝利後開始下一輪
             if event.type == pygame.KEYDOWN:
@@ -109,43 +528,179 @@ class GameEngine:
                     and event.unicode.lower() == "e"
                 )
                 if is_e_key_pressed and self.game_state.is_win():
-                    self.init_game_objects()
+                    self._start_next_level()
+
+                # 按 P 鍵暫停或繼續（只有遊戲進行中才能暫停）
+                if event.key == pygame.K_p:
+                    if self.game_state.is_paused():
+                        self.game_state.resume()
+                    elif self.game_state.is_playing():
+                        self.game_state.pause()
+
+                # 按 L 鍵切換低延遲輸入
+                if event.key == pygame.K_l:
+                    self.is_low_latency_input = not self.is_low_latency_input
+
+                # 按 A 鍵切換自動駕駛，按 T 鍵切換瞄準輔助線
+                if event.key == pygame.K_a:
+                    self.is_autopilot_enabled = not self.is_autopilot_enabled
+                if event.key == pygame.K_t:
+                    self.is_aim_assist_enabled = not self.is_aim_assist_enabled
+
+                # 按 F3 切換分段計時顯示，顯示時會一起打開計時
+                if event.key == pygame.K_F3:
+                    self.is_frame_overlay_visible = not self.is_frame_overlay_visible
+                    self.frame_timer.set_enabled(
+                        self.is_frame_overlay_visible
+                        or self.config.FRAME_TIMING_ENABLED
+                    )
+
+                # 按 F9 錄下接下來幾格的效能剖析資料
+                if event.key == pygame.K_F9:
+                    self._get_profiler_capture().request()
+
+                # 按 H 鍵打開或關閉排行榜
+                if event.key == pygame.K_h and self.leaderboard is not None:
+                    self._toggle_high_scores()
+
+                # 按 M 鍵切換多球壓力測試模式，遊戲中打開會立刻加入大量的球
+                if event.key == pygame.K_m:
+                    self.is_stress_mode = not self.is_stress_mode
+                    if self.is_stress_mode and self.game_state.is_playing():
+                        self._spawn_stress_balls()
 
         return True
 
+    def _serve_ball(self):
+        """發球（只有在等待開始時才有作用）"""
+        if self.game_state.is_waiting():
+            self.ball.start()
+            self.game_state.set_state(GameState.PLAYING)
+            if self.level_start_time is None:
+                self.level_start_time = time.perf_counter()
+            if self.is_stress_mode:
+                self._spawn_stress_balls()
+
+    def _spawn_stress_balls(self):
+        """從主球的位置一次射出大量的球（壓力測試模式）"""
+        speed = math.hypot(self.config.BALL_SPEED_X, self.config.BALL_SPEED_Y)
+        self.extra_balls.spawn_random(
+            self.ball.x, self.ball.y, self.config.MULTI_BALL_STRESS_COUNT, speed
+        )
+
     def update(self):
-        """更新遊戲邏輯"""
-        # 更新底板
-        self.paddle.update()
+        """
+        更新遊戲邏輯\n
+        分段計時：移動（update.movement）、碰撞（update.collisions）、\n
+        輸贏判斷（update.win_check）、勝利畫面替下一關畫區塊（update.prerender）、\n
+        粒子（update.particles）\n
+        """
+        self.frame_index += 1
+
+        # 暫停時所有東西都停在原地
+        if self.game_state.is_paused():
+            return
+
+        timer = self.frame_timer
+        lap_start = timer.start()
+
+        # 更新底板（自動駕駛開啟時由預測落點控制，否則跟隨滑鼠）
+        if self.is_autopilot_enabled:
+            self.paddle.update(
+                self.autopilot.get_paddle_target(
+                    self.ball, self.brick_wall, self.paddle
+                )
+            )
+            self._update_autopilot_actions()
+        else:
+            self.paddle.update(self.pointer.x)
 
         # 根據遊戲狀態更新球
         if self.game_state.is_waiting():
             self.ball.follow_paddle(self.paddle)
         elif self.game_state.is_playing():
             self.ball.move()
+            self.extra_balls.move()
+        self.camera.follow(self.ball.y)
+        lap_start = timer.lap("update.movement", lap_start)
+
+        # 遊戲進行中才需要檢查碰撞和輸贏
+        if self.game_state.is_playing():
             self._check_collisions()
+            lap_start = timer.lap("update.collisions", lap_start)
             self._check_win_condition()
             self._check_ball_out_of_bounds()
+            self._preload_next_level()
+            lap_start = timer.lap("update.win_check", lap_start)
+        elif self.game_state.is_win():
+            # 勝利畫面閒著，把背景建好的下一關區塊每格畫幾塊，換關時就不用畫
+            self._prerender_next_level()
+            lap_start = timer.lap("update.prerender", lap_start)
+
+        # 下一格從底板現在的位置開始算移動範圍
+        self.paddle.end_motion()
+
+        # 粒子在任何狀態都繼續飛，勝利畫面也看得到最後的碎片
+        self._emit_brick_particles()
+        self.particles.update()
+        timer.lap("update.particles", lap_start)
+
+        # 這一格要求的音效一次送出，同一種音效只播一次
+        if self.sound_mixer is not None:
+            self.sound_mixer.flush()
+
+    def _latch_pointer(self):
+        """
+        繪製前再讀一次最新的滑鼠位置（低延遲輸入模式）\n
+        更新邏輯之後才到的移動事件也能在這一格就顯示出來，不用等到下一格\n
+        """
+        if not self.is_low_latency_input or self.is_autopilot_enabled:
+            return
+        if self.game_state.is_paused() or not self.pointer.latch():
+            return
+        self.paddle.update(self.pointer.x)
+        if self.game_state.is_waiting():
+            self.ball.follow_paddle(self.paddle)
+
+    def _update_autopilot_actions(self):
+        """自動駕駛時，等待一段時間後自動發球或開始下一輪"""
+        now = pygame.time.get_ticks()
+        state = self.game_state.current_state
+        if self.game_state.is_playing() or not self.autopilot.should_act(state, now):
+            return
+        if self.game_state.is_waiting():
+            self._serve_ball()
+        elif self.game_state.is_win():
+            self._start_next_level()
 
     def _check_collisions(self):
         """檢查各種碰撞"""
         # 牆壁碰撞
-        self.ball.check_wall_collision()
+        is_wall_hit = self.ball.check_wall_collision()
 
         # 底板碰撞
-        self.ball.check_paddle_collision(self.paddle)
+        is_paddle_hit = self.ball.check_paddle_collision(self.paddle)
+
+        # 撞到牆或底板後球路改變，預測的落點要重新計算
+        if is_wall_hit or is_paddle_hit:
+            self.autopilot.predictor.invalidate()
+            self._count_event("collisions", int(is_wall_hit) + int(is_paddle_hit))
+        if is_paddle_hit:
+            self._record_event("paddle_hit", value=self.ball.last_paddle_hit_factor)
+            self._play_sound("paddle_hit")
+
+        # 記下爆炸次數，之後用來判斷要不要分裂出新球
+        explosions_before = self.brick_wall.explosion_count
 
         # 磚塊碰撞
-        is_collision_hit, hit_count, collision_direction = (
+        is_collision_hit, hit_count, collision_direction, _ = (
             self.brick_wall.check_collision(self.ball.rect)
         )
         if is_collision_hit:
-            # 增加分數
-            self.game_state.add_score(self.config.SCORE_PER_BRICK * hit_count)
-
-            # 縮小底板
-            for _ in range(hit_count):
-                self.paddle.shrink()
+            self.autopilot.predictor.invalidate()
+            self._apply_brick_hits(hit_count)
+            self._count_event("collisions")
+            self._play_sound("brick_hit")
 
             # 反彈球
             if collision_direction == "horizontal":
@@ -153,96 +708,452 @@ class GameEngine:
             else:
                 self.ball.bounce_vertical()
 
+        # 額外的球一起整批處理牆壁、底板和磚塊碰撞
+        if self.extra_balls.count > 0:
+            self.extra_balls.check_wall_collision()
+            extra_paddle_hits = self.extra_balls.check_paddle_collision(self.paddle)
+            if extra_paddle_hits > 0:
+                self._play_sound("paddle_hit")
+                if self.event_recorder is not None:
+                    self.event_recorder.record_many(
+                        self._event_codes["paddle_hit"],
+                        self.frame_index,
+                        value=self.extra_balls.last_paddle_hit_factors,
+                    )
+            extra_hit_count = self.extra_balls.check_brick_collision(self.brick_wall)
+            if extra_hit_count > 0:
+                self.autopilot.predictor.invalidate()
+                self._apply_brick_hits(extra_hit_count)
+                self._count_event("collisions", extra_hit_count)
+                self._play_sound("brick_hit")
+
+        # 多球道具：每次特殊磚塊爆炸，就從主球分裂出新的球
+        new_explosions = self.brick_wall.explosion_count - explosions_before
+        if new_explosions > 0:
+            self._count_event("explosions", new_explosions)
+            self._play_sound("explosion")
+            self.extra_balls.spawn_from(
+                self.ball, self.config.MULTI_BALL_POWERUP_COUNT * new_explosions
+            )
+
+        # 這一格球直接撞到的磚塊（每一格都要取走，紀錄才不會越積越多）
+        rows, cols, hit_counts = self.brick_wall.pop_hit_events()
+        if len(rows) > 0 and self.event_recorder is not None:
+            self.event_recorder.record_many(
+                self._event_codes["brick_hit"],
+                self.frame_index,
+                rows,
+                cols,
+                self.brick_wall.is_special[rows, cols],
+                hit_counts,
+            )
+
+    def _record_event(self, name, **fields):
+        """
+        事件紀錄開啟時記下一筆遊戲事件\n
+        name: 事件名稱（event_log.EVENT_NAMES 裡的名稱，例如 'win'）\n
+        """
+        if self.event_recorder is not None:
+            self.event_recorder.record(self._event_codes[name], self.frame_index, **fields)
+
+    def _get_profiler_capture(self):
+        """取得效能剖析擷取器，第一次用到時才載入模組並建立"""
+        if self.profiler_capture is None:
+            from ..utils.profiler_capture import ProfilerCapture
+
+            self.profiler_capture = ProfilerCapture(
+                output_dir=self.config.PROFILER_OUTPUT_DIR,
+                frame_count=self.config.PROFILER_CAPTURE_FRAMES,
+                sample_interval=self.config.PROFILER_SAMPLE_INTERVAL,
+                mode=self.config.PROFILER_MODE,
+            )
+        return self.profiler_capture
+
+    def _play_sound(self, name):
+        """音效開啟時要求這一格結束時播放音效"""
+        if self.sound_mixer is not None:
+            self.sound_mixer.request(name)
+
+    def _submit_score(self, outcome):
+        """
+        這一輪結束時把成績送進排行榜（只放進佇列，背景執行緒寫入），每一輪只記一筆\n
+        送出後清掉這一輪的開始時間和打掉的磚塊數，同一輪不會再記第二次；還沒發球的一輪不記\n
+        outcome: leaderboard 模組的 OUTCOME_WIN 或 OUTCOME_QUIT\n
+        """
+        if self.leaderboard is None or self.level_start_time is None:
+            return
+        duration_ms = round((time.perf_counter() - self.level_start_time) * 1000)
+        # 有開事件紀錄時記下檔案、場次和第幾格，之後可以從事件紀錄找回這一輪
+        replay = None
+        if self.event_recorder is not None:
+            replay = (
+                f"{self.event_recorder.path}#{self.event_recorder.session_id:016x}"
+                f"@{self.frame_index}"
+            )
+        self.leaderboard.submit(
+            player=self.config.PLAYER_NAME,
+            score=self.game_state.score,
+            duration_ms=duration_ms,
+            bricks=self.level_bricks_destroyed,
+            level=self.game_state.level,
+            outcome=outcome,
+            replay=replay,
+        )
+        self.level_start_time = None
+        self.level_bricks_destroyed = 0
+
+    def _toggle_high_scores(self):
+        """打開排行榜時查詢前幾名和玩家自己的最高分（都走索引），關閉時只是不畫"""
+        self.is_high_score_visible = not self.is_high_score_visible
+        if not self.is_high_score_visible:
+            self.hud.hide_high_scores()
+            return
+        rows = self.leaderboard.top_scores(self.config.LEADERBOARD_SIZE)
+        best = self.leaderboard.player_scores(self.config.PLAYER_NAME, 1)
+        self.hud.show_high_scores(rows, best[0] if best else None)
+
+    def _count_event(self, name, amount=1):
+        """遙測開啟時累加事件次數"""
+        if self.telemetry is not None:
+            self.telemetry.count(name, amount)
+
+    def _is_idle(self):
+        """
+        這一格是否可以進入閒置省電模式：\n
+        暫停中，或是等待發球、勝利畫面上一格畫面沒有任何改變\n
+        （粒子還在飛、下一關的區塊畫面還沒畫完時不算）\n
+        """
+        if not self.config.IDLE_MODE_ENABLED:
+            return False
+        if self.particles.get_alive_count() > 0:
+            return False
+        if self.game_state.is_paused():
+            return True
+        if self.game_state.is_playing():
+            return False
+        # 下一關的區塊畫面還沒畫完時照常每格更新，換關前才來得及畫完
+        if self._get_level_to_prerender() is not None:
+            return False
+        return not self._is_view_changing
+
+    def _wait_for_idle_events(self):
+        """
+        閒置時停下來等事件，最多等到下一次閃爍切換或 1 / IDLE_FPS 秒\n
+        return: 等到的事件清單（時間到都沒有事件時是空清單）\n
+        """
+        timeout = 1000 // self.config.IDLE_FPS
+        if self.quality["special_effects"] and self.brick_wall.has_visible_specials:
+            timeout = min(timeout, self.brick_wall.get_time_until_flash(pygame.time.get_ticks()))
+        event = pygame.event.wait(max(1, timeout))
+
+        # 等待的時間不算進每格間隔，下一格才不會被當成沒趕上
+        self.frame_pacer.skip()
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def _get_view_signature(self):
+        """畫面上看得到的狀態，跟上一格一樣就不用重畫"""
+        phase = 0
+        if self.quality["special_effects"] and self.brick_wall.has_visible_specials:
+            phase = self.brick_wall.get_flash_phase(pygame.time.get_ticks())
+        return (
+            self.game_state.current_state,
+            self.game_state.score,
+            self.paddle.rect.x,
+            self.paddle.rect.width,
+            int(self.ball.x),
+            int(self.ball.y),
+            self.extra_balls.count,
+            self.camera.offset_y,
+            phase,
+            self.is_aim_assist_enabled,
+            self.is_frame_overlay_visible,
+            self.is_high_score_visible,
+            self.quality["name"],
+        )
+
+    def _update_view_signature(self):
+        """
+        記下這一格畫面的狀態\n
+        return: 畫面跟上一格比起來有沒有改變\n
+        """
+        signature = self._get_view_signature()
+        self._is_view_changing = signature != self._last_view_signature
+        self._last_view_signature = signature
+        return self._is_view_changing
+
+    def _get_telemetry_extra(self):
+        """遙測紀錄裡附帶的遊戲狀態和分段計時（每次輸出才呼叫一次）"""
+        extra = {
+            "state": self.game_state.current_state.value,
+            "bricks": self.brick_wall.get_remaining_bricks_count(),
+            "balls": 1 + self.extra_balls.count,
+            "particles": self.particles.get_alive_count(),
+            "level": self.game_state.level,
+            "renderer": self.renderer.name,
+            "render_size": list(self.render_size),
+        }
+        extra["frame_pacing"] = self.frame_pacer.get_report()
+        input_latency = self.pointer.get_latency_report()
+        if input_latency is not None:
+            extra["input_latency"] = input_latency
+        if self.last_level_transition_ms is not None:
+            extra["level_transition_ms"] = round(self.last_level_transition_ms, 3)
+        if self.quality_governor is not None:
+            extra["quality"] = self.quality_governor.get_report()
+        if self.sound_mixer is not None:
+            extra["sound"] = self.sound_mixer.get_report()
+        if self.leaderboard is not None:
+            extra["leaderboard"] = self.leaderboard.get_report()
+        if self.frame_timer.is_enabled:
+            extra["phases"] = self.frame_timer.get_report()
+        return extra
+
+    def _apply_quality(self, quality):
+        """
+        換成指定的畫質設定\n
+        quality: build_quality_levels() 裡的一個等級 dict\n
+        """
+        self.quality = quality
+        self.particles.set_limit(quality["particle_limit"])
+        # 特效開關和縮放比例可能改變，用舊設定畫的特殊磚塊圖案不再需要
+        self.brick_wall.clear_sprite_cache()
+        self._count_event("quality_changes")
+
+    def _emit_brick_particles(self):
+        """替這一格被打掉的磚塊和爆炸噴出粒子"""
+        rows, cols = self.brick_wall.pop_destroyed_cells()
+        if len(rows) > 0:
+            xs, ys = self.brick_wall.get_cell_centers(rows, cols)
+            self.particles.emit(
+                xs,
+                ys,
+                self.brick_wall.color_index[rows, cols],
+                self.config.PARTICLES_PER_BRICK,
+            )
+
+        # 爆炸中心用兩種爆炸顏色各噴一半
+        rows, cols = self.brick_wall.pop_explosion_centers()
+        if len(rows) > 0:
+            xs, ys = self.brick_wall.get_cell_centers(rows, cols)
+            half = self.config.PARTICLES_PER_EXPLOSION // 2
+            for offset in range(len(SPECIAL_BRICK_FLASH_COLORS)):
+                color_indices = [self.explosion_color_start + offset] * len(rows)
+                self.particles.emit(xs, ys, color_indices, half)
+
+    def _apply_brick_hits(self, hit_count):
+        """
+        打掉磚塊後加分並縮小底板\n
+        hit_count: 打掉的磚塊數量（包含爆炸連帶）\n
+        """
+        # 增加分數
+        self.game_state.add_score(self.config.SCORE_PER_BRICK * hit_count)
+        self.level_bricks_destroyed += hit_count
+
+        # 縮小底板
+        for _ in range(hit_count):
+            self.paddle.shrink()
+        self._record_event("paddle_shrink", count=hit_count, value=self.paddle.width)
+
     def _check_win_condition(self):
         """檢查勝利條件"""
         if self.brick_wall.get_remaining_bricks_count() == 0:
             self.game_state.set_state(GameState.WIN)
             self.ball.started = False  # 停止球的移動
+            self.extra_balls.clear()
+            self._record_event("win", value=self.game_state.score)
+            self._play_sound("win")
+            if self.leaderboard is not None:
+                from ..utils.leaderboard import OUTCOME_WIN
+
+                self._submit_score(OUTCOME_WIN)
 
     def _check_ball_out_of_bounds(self):
         """檢查球是否掉出邊界"""
+        lost_count = self.extra_balls.remove_out_of_bounds()
+        if self.ball.is_out_of_bounds():
+            lost_count += 1
+        if lost_count > 0:
+            self._record_event("ball_lost", count=lost_count)
+
         if self.ball.is_out_of_bounds():
+            replacement = self.extra_balls.pop()
+
+            # 還有其他球在場上，就拿一顆來當新的主球，遊戲繼續
+            if replacement is not None:
+                x, y, x_speed, y_speed = replacement
+                self.ball.reset(x=x, y=y)
+                self.ball.x_speed = x_speed
+                self.ball.y_speed = y_speed
+                self.ball.start()
+                self.autopilot.predictor.invalidate()
+                return
+
+            # 掉球不算這一輪結束（分數和時間繼續累積），等過關或關掉遊戲時才記進排行榜
             self.ball.reset(paddle=self.paddle)
             self.game_state.set_state(GameState.WAITING_TO_START)
 
     def draw(self):
-        """繪製所有遊戲元素"""
-        # 清除螢幕
-        self.screen.fill(BACKGROUND_COLOR)
+        """
+        繪製所有遊戲元素\n
+        分段計時：磚牆（draw.wall）、遊戲物件（draw.objects）、介面（draw.ui）、更新顯示（draw.flip）\n
+        """
+        timer = self.frame_timer
+        lap_start = timer.start()
+
+        # 畫質降低解析度時，繪圖器先把遊戲畫面畫在縮小的畫布上，畫完一次放大到內部解析度的畫布；
+        # 遊戲物件用邏輯座標，畫的時候乘上內部解析度和畫質的比例
+        renderer = self.renderer
+        renderer.begin_world(self.quality["render_scale"])
+        scale = self.render_scale * self.quality["render_scale"]
+
+        # 清除畫布
+        renderer.clear(BACKGROUND_COLOR)
 
-        # 繪製遊戲物件
-        self.brick_wall.draw(self.screen)
-        self.paddle.draw(self.screen)
-        self.ball.draw(self.screen)
+        # 繪製遊戲物件（遊戲物件用世界座標，畫的時候減掉鏡頭位置）
+        offset_y = self.camera.offset_y
+        self.brick_wall.draw(renderer, offset_y, scale, self.quality["special_effects"])
+        lap_start = timer.lap("draw.wall", lap_start)
+        self.particles.draw(renderer, offset_y, scale)
+        self.paddle.draw(renderer, offset_y, scale)
+        self.ball.draw(renderer, offset_y, scale)
+        self.extra_balls.draw(renderer, offset_y, scale)
+
+        # 繪製瞄準輔助線
+        if self.is_aim_assist_enabled:
+            self._draw_aim_assist(scale)
+
+        renderer.end_world()
+        lap_start = timer.lap("draw.objects", lap_start)
 
         # 繪製 UI
         self._draw_ui()
+        if self.is_frame_overlay_visible:
+            self.frame_timing_overlay.draw(renderer)
+        lap_start = timer.lap("draw.ui", lap_start)
 
         # 更新顯示
-        pygame.display.update()
+        renderer.present()
+        self.pointer.mark_displayed()
+        timer.lap("draw.flip", lap_start)
+
+    def _draw_aim_assist(self, scale=1.0):
+        """
+        沿著預測的球路畫一條輔助線（球發射後才畫）\n
+        scale: 畫布相對於世界座標的縮放比例\n
+        """
+        if not self.ball.started:
+            return
+        predictor = self.autopilot.predictor
+        predictor.predict(self.ball, self.brick_wall, self.paddle)
+
+        # 路線從球目前的位置開始畫，後面接上預測的轉折點
+        offset_y = self.camera.offset_y
+        points = [(self.ball.x * scale, (self.ball.y - offset_y) * scale)] + [
+            (x * scale, (y - offset_y) * scale) for x, y in predictor.path[1:]
+        ]
+        if len(points) >= 2:
+            self.renderer.draw_lines(self.config.AIM_ASSIST_COLOR, points)
 
     def _draw_ui(self):
-        """繪製使用者介面"""
-        # 繪製分數
-        score_text = f"分數: {self.game_state.score}"
-        score_surf = self.score_font.render(score_text, True, TEXT_COLOR)
-        score_rect = score_surf.get_rect(
-            topright=(
-                self.config.WINDOW_WIDTH - self.config.TEXT_PADDING,
-                self.config.TEXT_PADDING,
-            )
+        """繪製使用者介面（分數或遊戲狀態改變時才重新排版）"""
+        self.hud.draw(
+            self.game_state.score,
+            self.game_state.current_state,
+            self.quality["hud_interval"],
         )
-        self.screen.blit(score_surf, score_rect)
 
-        # 繪製提示訊息
-        if self.game_state.is_waiting():
-            info_text = "滑鼠點擊或按空白鍵發球"
-            info_surf = self.info_font.render(info_text, True, INFO_TEXT_COLOR)
-            info_rect = info_surf.get_rect(
-                topright=(
-                    self.config.WINDOW_WIDTH - self.config.TEXT_PADDING,
-                    score_rect.bottom + 6,
-                )
-            )
-            self.screen.blit(info_surf, info_rect)
+    def run_frame(self):
+        """
+        跑主迴圈的一格：等待、處理事件、更新、繪製\n
+        return: 遊戲是否繼續（收到關閉視窗事件時為 False）\n
+        """
+        timer = self.frame_timer
+        capture = self.profiler_capture
+        telemetry = self.telemetry
 
-        # 繪製勝利訊息
-        if self.game_state.is_win():
-            win_surf = self.win_font.render("你贏了！", True, TEXT_COLOR)
-            win_rect = win_surf.get_rect(
-                center=(
-                    self.config.WINDOW_WIDTH // 2,
-                    self.config.WINDOW_HEIGHT // 2 - 20,
-                )
+        # 有擷取要求時從這一格開始錄，檔名標上目前狀態和剩餘磚塊數
+        if capture is not None and capture.is_requested:
+            capture.begin_frame(
+                {
+                    "state": self.game_state.current_state.value,
+                    "bricks": self.brick_wall.get_remaining_bricks_count(),
+                }
             )
-            self.screen.blit(win_surf, win_rect)
+        timer.begin_frame()
 
-            next_surf = self.info_font.render("按 E 開始下一輪", True, INFO_TEXT_COLOR)
-            next_rect = next_surf.get_rect(
-                center=(
-                    self.config.WINDOW_WIDTH // 2,
-                    self.config.WINDOW_HEIGHT // 2 + 30,
-                )
+        # 控制 FPS（等待的時間記在 sleep）；閒置時停下來等事件，不用每秒重畫 FPS 次
+        lap_start = timer.start()
+        is_idle = self._is_idle()
+        if is_idle:
+            events = self._wait_for_idle_events()
+        else:
+            self.frame_pacer.wait()
+            events = None
+        lap_start = timer.lap("sleep", lap_start)
+        work_start = time.perf_counter()
+        if telemetry is not None:
+            telemetry.record_frame(
+                self.frame_pacer.get_time(), self._get_telemetry_extra, is_idle=is_idle
             )
-            self.screen.blit(next_surf, next_rect)
+
+        # 處理事件
+        running = self.handle_events(events)
+        timer.lap("events", lap_start)
+
+        # 更新遊戲邏輯
+        self.update()
+
+        # 繪製前再讀一次滑鼠位置，畫面上的底板才是最新的
+        self._latch_pointer()
+
+        # 繪製畫面（閒置時只有畫面改變或收到事件才重畫）
+        is_view_changed = self._update_view_signature()
+        if not is_idle or is_view_changed or events:
+            self.draw()
+
+        # 畫質調整只看一般的格（閒置時本來就很閒，不用算進去）
+        if self.quality_governor is not None and not is_idle:
+            quality = self.quality_governor.record((time.perf_counter() - work_start) * 1000)
+            if quality is not None:
+                self._apply_quality(quality)
+        timer.end_frame()
+        if capture is not None:
+            capture.end_frame()
+        return running
 
     def run(self):
         """運行遊戲主迴圈"""
-        running = True
+        if self.telemetry is not None:
+            self.telemetry.start()
+        if self.event_recorder is not None:
+            self.event_recorder.start()
+        if self.input_probe is not None:
+            self.input_probe.start()
+        if self.sound_mixer is not None:
+            self.sound_mixer.start()
+        if self.leaderboard is not None:
+            self.leaderboard.start()
 
+        running = True
         while running:
-            # 控制 FPS
-            self.clock.tick(self.config.FPS)
+            running = self.run_frame()
 
-            # 處理事件
-            running = self.handle_events()
-
-            # 更新遊戲邏輯
-            self.update()
-
-            # 繪製畫面
-            self.draw()
+        # 退出遊戲前把最後一筆遙測、事件和成績寫完
+        if self.input_probe is not None:
+            self.input_probe.stop()
+        if self.telemetry is not None:
+            self.telemetry.close()
+        if self.event_recorder is not None:
+            self.event_recorder.close()
+        if self.sound_mixer is not None:
+            self.sound_mixer.close()
+        if self.leaderboard is not None:
+            from ..utils.leaderboard import OUTCOME_QUIT
 
-        # 退出遊戲
+            # 還沒打完就關掉遊戲，這一輪也記一筆
+            self._submit_score(OUTCOME_QUIT)
+            self.leaderboard.close()
         pygame.quit()
         sys.exit()
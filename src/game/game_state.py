@@ -23,6 +23,7 @@ class GameStateManager:
         self.current_state = GameState.WAITING_TO_START
         self.score = 0
         self.level = 1
+        self._state_before_pause = None  # 暫停前的狀態，繼續時回到這個狀態
 
     def set_state(self, new_state):
         """設定新的遊戲狀態"""
@@ -40,6 +41,22 @@ class GameStateManager:
         """檢查是否勝利"""
         return self.current_state == GameState.WIN
 
+    def is_paused(self):
+        """檢查是否暫停中"""
+        return self.current_state == GameState.PAUSED
+
+    def pause(self):
+        """暫停遊戲，記住暫停前的狀態"""
+        if not self.is_paused():
+            self._state_before_pause = self.current_state
+            self.current_state = GameState.PAUSED
+
+    def resume(self):
+        """從暫停回到暫停前的狀態"""
+        if self.is_paused():
+            self.current_state = self._state_before_pause
+            self._state_before_pause = None
+
     def is_game_over(self):
         """檢查是否遊戲結束"""
         return self.current_state == GameState.GAME_OVER
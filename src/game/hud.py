@@ -0,0 +1,243 @@
+"""
+介面模組
+分數、提示訊息和排行榜只在內容改變時重新排版，每格只把排好的圖貼上去
+"""
+
+from ..utils.colors import BACKGROUND_COLOR, INFO_TEXT_COLOR, TEXT_COLOR
+from .game_state import GameState
+
+# 分數前面的標籤
+SCORE_LABEL = "分數: "
+
+# 分數用到的字，事先產生好
+SCORE_GLYPHS = "0123456789"
+
+# 每個狀態顯示的訊息：(字型, 文字, 顏色, 位置)
+# 位置 None 表示放在分數下方靠右，數字表示畫面中央往下偏移幾個像素（邏輯座標）
+STATE_MESSAGES = {
+    GameState.WAITING_TO_START: [
+        ("info", "滑鼠點擊或按空白鍵發球", INFO_TEXT_COLOR, None),
+    ],
+    GameState.PAUSED: [
+        ("win", "暫停", TEXT_COLOR, -20),
+        ("info", "按 P 繼續", INFO_TEXT_COLOR, 30),
+    ],
+    GameState.WIN: [
+        ("win", "你贏了！", TEXT_COLOR, -20),
+        ("info", "按 E 開始下一輪", INFO_TEXT_COLOR, 30),
+    ],
+}
+
+# 排行榜畫面的文字
+HIGH_SCORE_TITLE = "排行榜"
+HIGH_SCORE_EMPTY = "還沒有紀錄"
+HIGH_SCORE_BEST_LABEL = "你的最高分: "
+HIGH_SCORE_HINT = "按 H 關閉"
+HIGH_SCORE_LEVEL_FORMAT = "第 {} 關"
+HIGH_SCORE_DURATION_FORMAT = "{:.1f} 秒"
+
+
+class HudLayer:
+    """
+    介面圖層\n
+    \n
+    - 固定的訊息文字第一次用到時產生，之後一直沿用\n
+    - 分數用事先產生好的標籤和 0 到 9 的數字拼起來，分數改變時不用重新產生文字\n
+    - 分數或遊戲狀態改變時才重新排版，其他格只把排好的圖貼上\n
+    - 排行榜打開時才產生每一行文字，打開期間取代狀態訊息\n
+    texture 後端會把數字和訊息文字放進貼圖集，貼上只是送出貼圖指令\n
+    """
+
+    def __init__(self, renderer, fonts, padding, scale=1.0):
+        """
+        初始化介面圖層\n
+        renderer: 繪圖器（src/utils/renderer.py）\n
+        fonts: {"score": 分數字型, "info": 提示文字字型, "win": 大字字型}\n
+        padding: 分數離畫面邊緣的距離（內部解析度的像素）\n
+        scale: 內部解析度相對於邏輯座標的比例，訊息的間距跟著縮放\n
+        """
+        self.renderer = renderer
+        self.fonts = fonts
+        self.padding = padding
+        self.scale = scale
+        self.composites = 0  # 重新排版的次數
+
+        score_font = fonts["score"]
+        self._label = renderer.render_text(score_font, SCORE_LABEL, TEXT_COLOR)
+        self._glyphs = {
+            char: renderer.render_text(score_font, char, TEXT_COLOR) for char in SCORE_GLYPHS
+        }
+        self._texts = {}  # (字型, 文字) -> 產生好的訊息文字
+
+        self._items = []  # 排好的 [(圖, (x, y)), ...]
+        self._panel_rect = None  # 排行榜的底色範圍，沒打開時為 None
+        self._high_score_lines = None  # 排行榜每一行的 [圖, ...]，沒打開時為 None
+        self._is_dirty = False
+        self._score = None
+        self._state = None
+        self._frames = 0
+        self._composed_frame = 0
+
+    def draw(self, score, state, interval=1):
+        """
+        畫出介面\n
+        score: 目前分數\n
+        state: 目前的 GameState\n
+        interval: 分數至少隔幾次繪製才重新排版（畫質降低時用），狀態改變時一定馬上重新排版\n
+        """
+        self._frames += 1
+        if (
+            self._is_dirty
+            or state is not self._state
+            or (score != self._score and self._frames - self._composed_frame >= interval)
+        ):
+            self._compose(score, state)
+
+        if self._panel_rect is not None:
+            self.renderer.fill_rect(BACKGROUND_COLOR, self._panel_rect)
+        blit = self.renderer.blit
+        for image, position in self._items:
+            blit(image, position)
+
+    def show_high_scores(self, rows, best=None):
+        """
+        打開排行榜（每一行的文字在這裡產生好，打開期間分數改變也不用重新產生）\n
+        rows: Leaderboard.top_scores() 的結果\n
+        best: 玩家自己分數最高的一筆，None 表示沒有紀錄\n
+        """
+        render_text = self.renderer.render_text
+        info_font = self.fonts["info"]
+        lines = [[self._get_text("win", HIGH_SCORE_TITLE, TEXT_COLOR)]]
+        if not rows:
+            lines.append([self._get_text("info", HIGH_SCORE_EMPTY, INFO_TEXT_COLOR)])
+        for rank, row in enumerate(rows, 1):
+            # 名次、玩家、分數、關卡和時間分開產生，排版時才對得齊
+            columns = (
+                f"{rank}.",
+                row["player"],
+                str(row["score"]),
+                HIGH_SCORE_LEVEL_FORMAT.format(row["level"]),
+                HIGH_SCORE_DURATION_FORMAT.format(row["duration_ms"] / 1000),
+            )
+            lines.append([render_text(info_font, text, TEXT_COLOR) for text in columns])
+        if best is not None:
+            text = f"{HIGH_SCORE_BEST_LABEL}{best['score']}"
+            lines.append([render_text(info_font, text, INFO_TEXT_COLOR)])
+        lines.append([self._get_text("info", HIGH_SCORE_HINT, INFO_TEXT_COLOR)])
+        self._high_score_lines = lines
+        self._is_dirty = True
+
+    def hide_high_scores(self):
+        """關閉排行榜"""
+        self._high_score_lines = None
+        self._is_dirty = True
+
+    def _compose(self, score, state):
+        """依照分數和狀態重新排版"""
+        width, height = self.renderer.get_size()
+        padding = self.padding
+        items = []
+
+        # 分數靠右上角，從最後一個數字往左排回來
+        x = width - padding
+        for char in reversed(str(score)):
+            glyph = self._get_glyph(char)
+            x -= glyph.get_width()
+            items.append((glyph, (x, padding)))
+        x -= self._label.get_width()
+        items.append((self._label, (x, padding)))
+        score_bottom = padding + self._label.get_height()
+
+        self._panel_rect = None
+        if self._high_score_lines is not None:
+            items.extend(self._compose_high_scores(width, height))
+        else:
+            items.extend(self._compose_state_messages(state, width, height, score_bottom))
+
+        self._items = items
+        self._score = score
+        self._state = state
+        self._is_dirty = False
+        self._composed_frame = self._frames
+        self.composites += 1
+
+    def _compose_state_messages(self, state, width, height, score_bottom):
+        """排好狀態訊息，回傳 [(圖, (x, y)), ...]"""
+        padding = self.padding
+        items = []
+        for font_name, text, color, offset in STATE_MESSAGES.get(state, ()):
+            image = self._get_text(font_name, text, color)
+            if offset is None:
+                rect = image.get_rect(
+                    topright=(width - padding, score_bottom + round(6 * self.scale))
+                )
+            else:
+                rect = image.get_rect(
+                    center=(width // 2, height // 2 + round(offset * self.scale))
+                )
+            items.append((image, rect.topleft))
+        return items
+
+    def _compose_high_scores(self, width, height):
+        """
+        把排行榜排在畫面中央，回傳 [(圖, (x, y)), ...]\n
+        排名的每一行分成好幾欄：名次和分數靠右，其他靠左；標題和只有一欄的行置中\n
+        """
+        gap = round(16 * self.scale)
+        line_gap = round(6 * self.scale)
+        lines = self._high_score_lines
+        column_count = max(len(line) for line in lines)
+        column_widths = [0] * column_count
+        for line in lines:
+            if len(line) == column_count:
+                for index, image in enumerate(line):
+                    column_widths[index] = max(column_widths[index], image.get_width())
+        table_width = sum(column_widths) + gap * (column_count - 1)
+        panel_width = max([table_width] + [line[0].get_width() for line in lines])
+        panel_height = sum(max(image.get_height() for image in line) for line in lines)
+        panel_height += line_gap * (len(lines) - 1)
+
+        left = (width - panel_width) // 2
+        y = (height - panel_height) // 2
+        self._panel_rect = (
+            left - self.padding,
+            y - self.padding,
+            panel_width + self.padding * 2,
+            panel_height + self.padding * 2,
+        )
+
+        table_left = (width - table_width) // 2
+        right_aligned = {0, 2}
+        items = []
+        for line in lines:
+            line_height = max(image.get_height() for image in line)
+            if len(line) == 1:
+                image = line[0]
+                items.append((image, ((width - image.get_width()) // 2, y)))
+            else:
+                x = table_left
+                for index, image in enumerate(line):
+                    offset = 0
+                    if index in right_aligned:
+                        offset = column_widths[index] - image.get_width()
+                    items.append((image, (x + offset, y)))
+                    x += column_widths[index] + gap
+            y += line_height + line_gap
+        return items
+
+    def _get_glyph(self, char):
+        """取得分數用的字（事先沒產生的字，例如負號，第一次用到時才產生）"""
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            glyph = self.renderer.render_text(self.fonts["score"], char, TEXT_COLOR)
+            self._glyphs[char] = glyph
+        return glyph
+
+    def _get_text(self, font_name, text, color):
+        """取得訊息文字（第一次用到時才產生）"""
+        key = (font_name, text)
+        image = self._texts.get(key)
+        if image is None:
+            image = self.renderer.render_text(self.fonts[font_name], text, color)
+            self._texts[key] = image
+        return image
@@ -0,0 +1,137 @@
+"""
+關卡預先載入模組
+磚塊快打完時，在背景執行緒先把下一關建好，過關後直接換上
+"""
+
+import random
+import threading
+import time
+
+
+class PreparedLevel:
+    """
+    一關已經建好、可以直接換上的物件\n
+    brick_wall 的狀態陣列、特殊磚塊和區塊資料都已經準備好；\n
+    區塊畫面要用繪圖器建立，只能在主執行緒畫：勝利畫面時每格畫幾塊，來不及的換上時才畫\n
+    """
+
+    def __init__(self, level_number, brick_wall, world_height, camera, build_ms=0.0):
+        self.level_number = level_number
+        self.brick_wall = brick_wall
+        self.world_height = world_height
+        self.camera = camera
+        self.build_ms = build_ms  # 建立這一關花了多少毫秒
+        self.is_prerendered = False  # 一開始看得到的區塊畫面是否已經在主執行緒畫好
+
+
+class LevelPreloader:
+    """
+    下一關預先載入器\n
+    \n
+    request() 在背景執行緒呼叫 build_level 建立指定的關卡，\n
+    主迴圈過關時用 take() 拿走建好的關卡，只要換掉幾個參照，不用在這一格重新建磚牆。\n
+    還沒建好或建立失敗時 take() 回傳 None，由呼叫的人自己當場建立\n
+    """
+
+    def __init__(self, build_level):
+        """
+        初始化預先載入器\n
+        build_level: 函式 build_level(level_number, rng)，回傳 PreparedLevel；\n
+                     在背景執行緒執行，只能建立陣列和關卡配置這類普通資料，\n
+                     不能動到目前正在玩的遊戲物件，也不能建立繪圖器的圖層或 Surface\n
+        """
+        self.build_level = build_level
+        self._thread = None
+        self._level_number = None
+        self._prepared = None
+        self._done = threading.Event()
+
+    @property
+    def requested_level(self):
+        """目前正在準備（或已經準備好）的關卡編號，沒有時為 None"""
+        return self._level_number
+
+    def is_ready(self):
+        """要求的關卡是否已經建好（或已經失敗）"""
+        return self._level_number is not None and self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        等背景把要求的關卡建好\n
+        timeout: 最多等幾秒，若為 None 則一直等\n
+        return: 是否已經建好（沒有要求時為 False）\n
+        """
+        if self._level_number is None:
+            return False
+        return self._done.wait(timeout)
+
+    def peek(self, level_number):
+        """
+        看一下建好的關卡但不拿走（勝利畫面先畫區塊畫面用），只能在主執行緒呼叫\n
+        level_number: 要的關卡編號\n
+        return: PreparedLevel，還沒建好、建立失敗或編號不一樣時為 None\n
+        """
+        if self._level_number != level_number or not self._done.is_set():
+            return None
+        return self._prepared
+
+    def request(self, level_number):
+        """
+        開始在背景建立指定的關卡，已經在準備同一關時不做任何事\n
+        level_number: 要準備的關卡編號\n
+        """
+        if self._level_number == level_number:
+            return
+        self.discard()
+
+        # 特殊磚塊的亂數種子在主執行緒先抽好，關卡內容才不會受到背景執行緒什麼時候跑的影響
+        rng = random.Random(random.getrandbits(64))
+        self._level_number = level_number
+        self._thread = threading.Thread(
+            target=self._build_loop,
+            args=(level_number, rng),
+            name="level-preloader",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def take(self, level_number, timeout=0.0):
+        """
+        拿走建好的關卡\n
+        level_number: 要的關卡編號，跟準備中的不一樣時回傳 None\n
+        timeout: 還沒建好時最多等幾秒（0 代表不等）\n
+        return: PreparedLevel，沒有可用的關卡時為 None\n
+        """
+        if self._level_number != level_number:
+            return None
+        if not self._done.wait(timeout):
+            return None
+        prepared = self._prepared
+        self._reset()
+        return prepared
+
+    def discard(self):
+        """丟掉準備中或準備好的關卡（背景執行緒建完後結果會直接丟掉）"""
+        self._reset()
+
+    def _reset(self):
+        """清除目前的要求，換一個新的完成旗標給下一次要求使用"""
+        self._thread = None
+        self._level_number = None
+        self._prepared = None
+        self._done = threading.Event()
+
+    def _build_loop(self, level_number, rng):
+        """背景執行緒：建立關卡，結果只在要求還沒被取消時留下來"""
+        done = self._done
+        start = time.perf_counter()
+        try:
+            prepared = self.build_level(level_number, rng)
+            prepared.build_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            # 建立失敗就印出訊息，過關時改成當場建立
+            print(f"背景準備第 {level_number} 關失敗：{e}")
+            prepared = None
+        if done is self._done:
+            self._prepared = prepared
+        done.set()
@@ -0,0 +1,142 @@
+"""
+畫質調整模組
+每格的工作時間接近預算時，一級一級關掉比較花時間的畫面效果，
+有餘裕時再慢慢恢復，讓遊戲維持順暢
+"""
+
+from collections import deque
+
+
+def build_quality_levels(particle_limit, render_scale, hud_interval):
+    """
+    建立由高到低的畫質等級，每一級都保留上一級關掉的項目\n
+    particle_limit: 第 2 級起同時存在的粒子數上限\n
+    render_scale: 第 3 級起遊戲畫面的繪製比例（畫在縮小的畫布上再放大）\n
+    hud_interval: 第 4 級起分數最多每隔幾格才重新排版\n
+    return: 清單，每一級是一個 dict（name、special_effects、particle_limit、render_scale、hud_interval）\n
+    """
+    full = {
+        "name": "full",
+        "special_effects": True,  # 特殊磚塊的閃爍和『爆』字
+        "particle_limit": None,  # None 表示用粒子系統本身的容量
+        "render_scale": 1.0,
+        "hud_interval": 1,
+    }
+    no_effects = dict(full, name="no_special_effects", special_effects=False)
+    fewer_particles = dict(no_effects, name="fewer_particles", particle_limit=particle_limit)
+    low_resolution = dict(fewer_particles, name="low_resolution", render_scale=render_scale)
+    slow_hud = dict(low_resolution, name="slow_hud", hud_interval=hud_interval)
+    return [full, no_effects, fewer_particles, low_resolution, slow_hud]
+
+
+class QualityGovernor:
+    """
+    畫質調整器\n
+    \n
+    主迴圈每格用 record() 記下這一格實際工作的時間（不含等待下一格的時間），\n
+    每 check_interval 格看一次最近 window 格的 p90：\n
+    - 超過預算的 degrade_ratio 倍就降一級\n
+    - 低於預算的 restore_ratio 倍就升一級\n
+    兩個門檻中間留一段空間，再加上每次調整後的冷卻時間（cooldown_frames 格不再調整，\n
+    並重新收集資料），畫質才不會在兩級之間來回切換。每次調整都會印出紀錄\n
+    """
+
+    def __init__(
+        self,
+        budget_ms,
+        levels,
+        window=60,
+        degrade_ratio=0.85,
+        restore_ratio=0.5,
+        cooldown_frames=180,
+        check_interval=10,
+    ):
+        """
+        初始化畫質調整器\n
+        budget_ms: 每格的時間預算（毫秒），通常是 1000 / FPS\n
+        levels: build_quality_levels() 建立的畫質等級清單，第 0 級是最高畫質\n
+        window: 判斷時看最近幾格\n
+        degrade_ratio: p90 超過預算的這個比例就降低畫質\n
+        restore_ratio: p90 低於預算的這個比例才恢復畫質（要比 degrade_ratio 小）\n
+        cooldown_frames: 每次調整後至少等幾格才能再調整\n
+        check_interval: 每隔幾格檢查一次\n
+        """
+        if restore_ratio >= degrade_ratio:
+            raise ValueError("restore_ratio 必須小於 degrade_ratio，否則畫質會來回切換")
+
+        self.budget_ms = budget_ms
+        self.levels = levels
+        self.window = window
+        self.degrade_ratio = degrade_ratio
+        self.restore_ratio = restore_ratio
+        self.cooldown_frames = cooldown_frames
+        self.check_interval = check_interval
+
+        self.level = 0
+        self.frames = 0
+        self.changes = []  # 每次調整的紀錄：(第幾格, 原本等級, 新等級, p90 毫秒)
+        self._work_ms = deque(maxlen=window)
+        self._cooldown = 0
+
+    @property
+    def settings(self):
+        """目前畫質等級的設定 dict"""
+        return self.levels[self.level]
+
+    def record(self, work_ms):
+        """
+        記錄一格的工作時間，必要時調整畫質\n
+        work_ms: 這一格從開始處理到畫完花了幾毫秒\n
+        return: 畫質有調整時回傳新的設定 dict，沒有調整時為 None\n
+        """
+        self.frames += 1
+        self._work_ms.append(work_ms)
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return None
+        if len(self._work_ms) < self.window or self.frames % self.check_interval != 0:
+            return None
+
+        p90 = self.get_percentile(0.9)
+        if p90 > self.budget_ms * self.degrade_ratio and self.level + 1 < len(self.levels):
+            return self._change_level(self.level + 1, p90)
+        if p90 < self.budget_ms * self.restore_ratio and self.level > 0:
+            return self._change_level(self.level - 1, p90)
+        return None
+
+    def get_percentile(self, fraction):
+        """
+        取得最近幾格工作時間的百分位數\n
+        fraction: 0 到 1 之間，例如 0.9 就是 p90\n
+        return: 毫秒；還沒有資料時為 0\n
+        """
+        if not self._work_ms:
+            return 0.0
+        ordered = sorted(self._work_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    def get_report(self):
+        """
+        取得目前狀態（遙測用）\n
+        return: dict，包含等級、等級名稱、工作時間 p90 和調整次數\n
+        """
+        return {
+            "level": self.level,
+            "name": self.settings["name"],
+            "work_p90_ms": round(self.get_percentile(0.9), 3),
+            "changes": len(self.changes),
+        }
+
+    def _change_level(self, new_level, p90):
+        """換到指定的等級，印出紀錄並重新收集資料"""
+        old_level = self.level
+        self.level = new_level
+        self.changes.append((self.frames, old_level, new_level, p90))
+        print(
+            f"畫質調整：{old_level}（{self.levels[old_level]['name']}）→ "
+            f"{new_level}（{self.levels[new_level]['name']}），"
+            f"最近 {len(self._work_ms)} 格工作時間 p90 {p90:.2f} ms，預算 {self.budget_ms:.2f} ms"
+        )
+        self._work_ms.clear()
+        self._cooldown = self.cooldown_frames
+        return self.settings
@@ -3,5 +3,7 @@
 """
 
 from .ball import Ball
+from .ball_group import BallGroup
 from .brick import Brick
 from .paddle import Paddle
+from .particle_system import ParticleSystem
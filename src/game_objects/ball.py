@@ -41,6 +41,7 @@ class Ball:
         self.screen_height = screen_height
         self.follow_distance = follow_distance
         self.started = False  # 是否已開始移動
+        self.last_paddle_hit_factor = 0.0  # 上一次撞到底板實際用的撞擊位置（-1 到 1），給事件紀錄使用
 
         # 建立碰撞檢測用的矩形區域
         self.rect = pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)
@@ -58,7 +59,12 @@ class Ball:
         self.rect.centery = int(self.y)
 
     def check_wall_collision(self):
-        """檢查球與視窗邊界的碰撞"""
+        """
+        檢查球與視窗邊界的碰撞\n
+        return: 是否撞到任何一面牆\n
+        """
+        is_wall_hit = False
+
         # 左右邊界碰撞
         if self.x - self.radius <= 0 or self.x + self.radius >= self.screen_width:
             self.x_speed = -self.x_speed
@@ -68,12 +74,16 @@ class Ball:
             else:
                 self.x = self.screen_width - self.radius
             self._update_rect()
+            is_wall_hit = True
 
         # 上邊界碰撞
         if self.y - self.radius <= 0:
             self.y_speed = -self.y_speed
             self.y = self.radius
             self._update_rect()
+            is_wall_hit = True
+
+        return is_wall_hit
 
     def check_paddle_collision(self, paddle):
         """
@@ -81,9 +91,13 @@ class Ball:
         paddle: 底板物件\n
         return: 是否發生碰撞\n
         """
-        if self.rect.colliderect(paddle.rect) and self.y_speed > 0:
-            # 計算球撞擊底板的相對位置
-            hit_factor = paddle.get_hit_factor(self.x)
+        # 用底板這一格掃過的範圍判斷，底板移動很快時球才不會從中間穿過去
+        if self.y_speed > 0 and self.rect.colliderect(paddle.get_swept_rect()):
+            # 球的下緣在這一格的哪個時間點碰到底板上緣，用那時候底板的位置算撞擊點
+            overlap = self.y + self.radius - paddle.rect.top
+            t = min(1.0, max(0.0, 1.0 - overlap / self.y_speed))
+            hit_factor = paddle.get_hit_factor(self.x, t)
+            self.last_paddle_hit_factor = hit_factor
 
             # 根據撞擊位置改變球的水平速度
             self.x_speed = hit_factor * abs(self.y_speed)
@@ -135,6 +149,20 @@ class Ball:
         self.started = False
         self._update_rect()
 
-    def draw(self, screen):
-        """繪製球"""
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+    def draw(self, renderer, offset_y=0, scale=1.0):
+        """
+        繪製球\n
+        renderer: 繪圖器（src/utils/renderer.py）\n
+        offset_y: 鏡頭上緣在世界座標的 y，不捲動時為 0\n
+        scale: 畫布相對於世界座標的縮放比例（降低解析度繪製時小於 1）\n
+        """
+        if scale == 1.0:
+            renderer.draw_circle(
+                self.color, (int(self.x), int(self.y) - offset_y), self.radius
+            )
+            return
+        renderer.draw_circle(
+            self.color,
+            (round(self.x * scale), round((self.y - offset_y) * scale)),
+            max(1, round(self.radius * scale)),
+        )
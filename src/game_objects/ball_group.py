@@ -0,0 +1,287 @@
+"""
+多球群組模組
+用平行陣列管理大量的額外球（多球道具、壓力測試模式）
+"""
+
+import math
+import pygame
+import numpy as np
+from ..utils.colors import BALL_COLOR
+
+
+class BallGroup:
+    """
+    多球群組類別 - 一次移動、碰撞、繪製很多顆球\n
+    \n
+    跟 Ball 一顆球一個物件不同，這裡每顆球的位置、速度、半徑\n
+    都放在同一組陣列的同一個位置，所有計算都對整組陣列一次做完，\n
+    球變多時不會多出一堆 Python 方法呼叫\n
+    \n
+    屬性:\n
+    x, y (ndarray): 每顆球的中心位置\n
+    vx, vy (ndarray): 每顆球的速度\n
+    radius (ndarray): 每顆球的半徑\n
+    count (int): 目前有幾顆球，只有前 count 格是有效資料\n
+    """
+
+    def __init__(
+        self,
+        capacity=1000,
+        radius=8,
+        color=None,
+        screen_width=800,
+        screen_height=600,
+    ):
+        """
+        初始化多球群組\n
+        capacity: 最多能同時存在幾顆球，超過就不再加入\n
+        radius: 預設的球半徑\n
+        color: 球的顏色，若為 None 則使用預設顏色\n
+        screen_width, screen_height: 螢幕尺寸\n
+        """
+        self.capacity = capacity
+        self.default_radius = radius
+        self.color = color if color else BALL_COLOR
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.count = 0
+
+        # 上一次撞到底板的球的撞擊位置（-1 到 1），給事件紀錄使用
+        self.last_paddle_hit_factors = np.zeros(0)
+
+        # 預先配置好固定大小的陣列，加球時不用重新配置
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.radius = np.zeros(capacity, dtype=np.float64)
+
+        # 每種半徑的球只畫一次，之後都用貼圖
+        self._sprites = {}
+
+    def add(self, x, y, vx, vy, radius=None):
+        """
+        加入一顆球\n
+        x, y: 中心位置\n
+        vx, vy: 速度\n
+        radius: 半徑，若為 None 則使用預設半徑\n
+        return: 是否成功加入（滿了就回傳 False）\n
+        """
+        if self.count >= self.capacity:
+            return False
+        index = self.count
+        self.x[index] = x
+        self.y[index] = y
+        self.vx[index] = vx
+        self.vy[index] = vy
+        self.radius[index] = radius if radius is not None else self.default_radius
+        self.count += 1
+        return True
+
+    def spawn_from(self, ball, amount, spread_degrees=120):
+        """
+        從一顆球的位置分裂出好幾顆新球（多球道具）\n
+        ball: 作為分裂起點的球物件\n
+        amount: 要多出幾顆球\n
+        spread_degrees: 新球往上散開的角度範圍\n
+        return: 實際加入的球數\n
+        """
+        speed = math.hypot(ball.x_speed, ball.y_speed)
+        added = 0
+
+        # 把新球平均分散在往上的扇形範圍內
+        for i in range(amount):
+            if amount == 1:
+                offset = 0.5
+            else:
+                offset = i / (amount - 1)
+            angle = math.radians(-90 - spread_degrees / 2 + spread_degrees * offset)
+            vx = speed * math.cos(angle)
+            vy = speed * math.sin(angle)
+            if not self.add(ball.x, ball.y, vx, vy, ball.radius):
+                break
+            added += 1
+        return added
+
+    def spawn_random(self, x, y, amount, speed):
+        """
+        在同一個位置一次加入很多顆方向隨機的球（壓力測試用）\n
+        x, y: 起點位置\n
+        amount: 要加入的球數\n
+        speed: 每顆球的速率\n
+        return: 實際加入的球數\n
+        """
+        amount = min(amount, self.capacity - self.count)
+        if amount <= 0:
+            return 0
+        start, end = self.count, self.count + amount
+
+        # 全部往上半部的隨機方向射出，免得一出生就掉下去
+        angles = np.radians(np.random.uniform(-165, -15, amount))
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = speed * np.cos(angles)
+        self.vy[start:end] = speed * np.sin(angles)
+        self.radius[start:end] = self.default_radius
+        self.count = end
+        return amount
+
+    def pop(self):
+        """
+        取出最後一顆球（主球掉下去時，拿一顆額外的球來接替）\n
+        return: (x, y, vx, vy)，沒有球時回傳 None\n
+        """
+        if self.count == 0:
+            return None
+        self.count -= 1
+        index = self.count
+        return (
+            float(self.x[index]),
+            float(self.y[index]),
+            float(self.vx[index]),
+            float(self.vy[index]),
+        )
+
+    def clear(self):
+        """移除所有額外的球"""
+        self.count = 0
+
+    def move(self):
+        """讓所有球前進一格"""
+        n = self.count
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+
+    def check_wall_collision(self):
+        """
+        一次檢查所有球與視窗邊界的碰撞（規則跟 Ball 一樣）\n
+        return: 有幾顆球撞到牆\n
+        """
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        vx, vy = self.vx[:n], self.vy[:n]
+        r = self.radius[:n]
+
+        # 左右邊界：速度反過來，並把球拉回牆內避免卡住
+        is_left = x - r <= 0
+        is_right = ~is_left & (x + r >= self.screen_width)
+        is_side = is_left | is_right
+        vx[is_side] = -vx[is_side]
+        x[is_left] = r[is_left]
+        x[is_right] = self.screen_width - r[is_right]
+
+        # 上邊界
+        is_top = y - r <= 0
+        vy[is_top] = -vy[is_top]
+        y[is_top] = r[is_top]
+
+        return int(np.count_nonzero(is_side | is_top))
+
+    def check_paddle_collision(self, paddle):
+        """
+        一次檢查所有球與底板的碰撞（反彈角度的算法跟 Ball 一樣）\n
+        paddle: 底板物件\n
+        return: 有幾顆球撞到底板\n
+        """
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        vx, vy = self.vx[:n], self.vy[:n]
+        r = self.radius[:n]
+        rect = paddle.get_swept_rect()
+
+        # 往下掉而且跟底板這一格掃過的範圍重疊的球才算撞到
+        is_hit = (
+            (vy > 0)
+            & (x + r > rect.left)
+            & (x - r < rect.right)
+            & (y + r > rect.top)
+            & (y - r < rect.bottom)
+        )
+        if not is_hit.any():
+            return 0
+
+        # 根據撞到底板的位置改變左右速度，撞到邊邊會彈得比較斜
+        # 跟 Ball 一樣，用球的下緣碰到底板上緣的時間點算那時候底板的位置，
+        # 撞擊點在底板外面（碰到角落、底板掃過去才撞到）時限制在邊緣
+        speed_y = np.abs(vy[is_hit])
+        overlap = y[is_hit] + r[is_hit] - paddle.rect.top
+        t = np.clip(1.0 - overlap / speed_y, 0.0, 1.0)
+        hit_factor = np.clip(
+            (x[is_hit] - paddle.get_center_x_at(t)) / (paddle.width / 2), -1.0, 1.0
+        )
+        vx[is_hit] = hit_factor * speed_y
+        vy[is_hit] = -speed_y
+        self.last_paddle_hit_factors = hit_factor
+
+        # 把球放回底板上方，免得卡在底板裡
+        y[is_hit] = rect.top - r[is_hit]
+        return int(np.count_nonzero(is_hit))
+
+    def check_brick_collision(self, brick_wall):
+        """
+        一次檢查所有球與磚牆的碰撞，撞到的球依方向反彈\n
+        brick_wall: 磚牆物件\n
+        return: 被打掉的磚塊總數（包含爆炸連帶）\n
+        """
+        n = self.count
+        if n == 0:
+            return 0
+        ball_hit, is_horizontal, hit_count = brick_wall.check_collision_batch(
+            self.x[:n], self.y[:n], self.radius[:n]
+        )
+
+        # 水平撞到的把左右速度反過來，其他的把上下速度反過來
+        flip_x = ball_hit & is_horizontal
+        flip_y = ball_hit & ~is_horizontal
+        self.vx[:n][flip_x] *= -1
+        self.vy[:n][flip_y] *= -1
+        return hit_count
+
+    def remove_out_of_bounds(self):
+        """
+        移除掉出螢幕下方的球，剩下的球往前擠，陣列保持連續\n
+        return: 移除了幾顆球\n
+        """
+        n = self.count
+        is_kept = self.y[:n] - self.radius[:n] <= self.screen_height
+        kept = int(np.count_nonzero(is_kept))
+        if kept == n:
+            return 0
+        for values in (self.x, self.y, self.vx, self.vy, self.radius):
+            values[:kept] = values[:n][is_kept]
+        self.count = kept
+        return n - kept
+
+    def _get_sprite(self, radius):
+        """取得（或第一次時畫好）指定半徑的球貼圖"""
+        sprite = self._sprites.get(radius)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, self.color, (radius, radius), radius)
+            self._sprites[radius] = sprite
+        return sprite
+
+    def draw(self, renderer, offset_y=0, scale=1.0):
+        """
+        用一次批次貼圖畫出所有球\n
+        renderer: 繪圖器（src/utils/renderer.py）\n
+        offset_y: 鏡頭上緣在世界座標的 y，不捲動時為 0\n
+        scale: 畫布相對於世界座標的縮放比例（降低解析度繪製時小於 1）\n
+        """
+        n = self.count
+        if n == 0:
+            return
+        if scale == 1.0:
+            radii = self.radius[:n].astype(np.intp)
+            lefts = (self.x[:n] - radii).astype(np.intp).tolist()
+            tops = (self.y[:n] - radii - offset_y).astype(np.intp).tolist()
+        else:
+            radii = np.maximum(1, np.rint(self.radius[:n] * scale)).astype(np.intp)
+            lefts = (np.rint(self.x[:n] * scale) - radii).astype(np.intp).tolist()
+            tops = (np.rint((self.y[:n] - offset_y) * scale) - radii).astype(np.intp).tolist()
+        renderer.blits(
+            [
+                (self._get_sprite(radius), (left, top))
+                for radius, left, top in zip(radii.tolist(), lefts, tops)
+            ]
+        )
@@ -5,16 +5,90 @@
 
 import pygame
 import random
+import numpy as np
+from collections import OrderedDict, deque
 from ..utils.colors import (
     BRICK_COLORS,
     SPECIAL_BRICK_FLASH_COLORS,
     get_text_color_for_background,
 )
 from ..utils.font_loader import load_chinese_font
+from ..utils.level_file import BRICK_EMPTY, open_level
+from .wall_chunks import WallChunks
+
+# 支援的爆炸形狀
+BLAST_SHAPES = ("square", "circle", "cross", "row", "column")
+
+# 特殊磚塊閃爍外框每隔幾毫秒切換一次顏色
+SPECIAL_FLASH_INTERVAL = 300
+
+# 特殊磚塊中央顯示的字
+SPECIAL_BRICK_GLYPH = "爆"
+
+# 每面磚牆最多保留幾個特殊磚塊圖案（顏色數 x 閃爍階段 x 縮放比例，平常用不到這麼多）
+SPECIAL_SPRITE_CACHE_SIZE = 64
+
+
+def build_blast_mask(shape, radius):
+    """
+    產生以爆炸中心為中點的爆炸範圍遮罩\n
+    shape: 爆炸形狀，'square'、'circle' 或 'cross'\n
+    radius: 爆炸半徑（格數），範圍 >= 0\n
+    return: (2 * radius + 1) x (2 * radius + 1) 的布林陣列，True 代表會被炸到\n
+    \n
+    整列、整欄（'row'、'column'）不需要遮罩，直接取整條切片\n
+    """
+    if shape not in ("square", "circle", "cross"):
+        raise ValueError(f"不支援的爆炸形狀：{shape}")
+
+    # 每一格跟中心差幾列、幾欄
+    offsets = np.arange(-radius, radius + 1)
+    d_row = offsets[:, None]
+    d_col = offsets[None, :]
+
+    if shape == "square":
+        # 正方形：周圍 radius 圈全部炸掉（radius 為 1 時就是 3x3）
+        return np.ones((radius * 2 + 1, radius * 2 + 1), dtype=bool)
+    if shape == "circle":
+        # 圓形：離中心的直線距離不超過 radius
+        return d_row**2 + d_col**2 <= radius * radius
+    # 十字：跟中心同一列或同一欄
+    return (d_row == 0) | (d_col == 0)
+
+
+def _unique_indices(values, size):
+    """
+    去掉重複的格子編號，由小到大排列\n
+    values (ndarray): 介於 0 到 size - 1 的整數\n
+    size: 編號的範圍\n
+    \n
+    編號範圍固定（磚牆的格數），用布林陣列標記比 np.unique 排序快，\n
+    也不會在第一次爆炸時才載入 numpy.ma（np.unique 內部會用到，造成卡頓）；\n
+    超大關卡的範圍比編號數量大很多，改成自己排序，才不會每次都配置整面牆大小的陣列\n
+    """
+    if size > 65536 and size > len(values) * 64:
+        ordered = np.sort(values)
+        is_first = np.ones(len(ordered), dtype=bool)
+        np.not_equal(ordered[1:], ordered[:-1], out=is_first[1:])
+        return ordered[is_first]
+    is_present = np.zeros(size, dtype=bool)
+    is_present[values] = True
+    return np.flatnonzero(is_present)
 
 
 class Brick:
-    """磚塊牆類別，負責管理整面磚塊牆的生成、繪製和碰撞檢測"""
+    """
+    磚塊牆類別，負責管理整面磚塊牆的生成、繪製和碰撞檢測\n
+    \n
+    每塊磚的狀態存在以 (row, col) 排列的陣列裡，而不是一塊磚一個物件：\n
+    - is_hit: 是否已被擊中\n
+    - is_special: 是否為特殊爆炸磚塊\n
+    - color_index: 在調色盤中的顏色編號\n
+    磚塊位置由列、欄直接算出來，所以碰撞時只要查球附近的格子\n
+    \n
+    繪製時把磚牆切成區塊（WallChunks），只畫跟畫面重疊的區塊，\n
+    所以不管關卡多大，每格的成本只跟看得到的範圍有關\n
+    """
 
     def __init__(
         self,
@@ -26,6 +100,14 @@ class Brick:
         top_margin=50,
         screen_width=800,
         special_count=7,
+        blast_shape="square",
+        blast_radius=1,
+        chain_reaction=True,
+        level=None,
+        chunk_rows=16,
+        chunk_cols=16,
+        chunk_cache_bytes=32 * 1024 * 1024,
+        rng=None,
     ):
         """
         產生一整面磚牆（cols x rows）並自動置中\n
@@ -37,122 +119,554 @@ class Brick:
         top_margin: 磚牆上方邊距\n
         screen_width: 螢幕寬度（用於置中計算）\n
         special_count: 特殊爆炸磚塊數量\n
+        blast_shape: 爆炸形狀，'square'、'circle'、'cross'、'row' 或 'column'\n
+        blast_radius: 爆炸半徑（格數），整列、整欄形狀不使用\n
+        chain_reaction: 被炸到的特殊磚塊是否也會跟著爆炸\n
+        level: 從關卡檔讀進來的 Level 物件，有的話牆的大小和內容都照關卡，\n
+               cols、rows、special_count 不使用\n
+        chunk_rows, chunk_cols: 繪製用的區塊大小（格數）\n
+        chunk_cache_bytes: 畫好的區塊畫面最多佔用多少記憶體\n
+        rng: 選特殊磚塊用的 random.Random 物件，若為 None 則使用 random 模組\n
         """
+        if blast_shape not in BLAST_SHAPES:
+            raise ValueError(f"不支援的爆炸形狀：{blast_shape}")
+        if level is not None:
+            cols, rows = level.cols, level.rows
+
         self.cols = cols
         self.rows = rows
         self.brick_width = brick_width
         self.brick_height = brick_height
         self.padding = padding
         self.top_margin = top_margin
+        self.pitch_x = brick_width + padding
+        self.pitch_y = brick_height + padding
+        self.bottom = top_margin + rows * self.pitch_y - padding  # 磚牆最下緣的 y
 
         # 計算整個磚牆的寬度以便置中
         total_width = cols * brick_width + (cols - 1) * padding
         start_x = int((screen_width - total_width) / 2)
+        self.start_x = start_x
 
-        # 建立每個磚塊的資料結構
-        self.bricks = []
-        for row in range(rows):
-            for col in range(cols):
-                x = start_x + col * (brick_width + padding)
-                y = top_margin + row * (brick_height + padding)
-                # 每個磚塊使用不同的顏色（以 column 為主）
-                color = BRICK_COLORS[col % len(BRICK_COLORS)]
-                self.bricks.append(
-                    {
-                        "rect": pygame.Rect(x, y, brick_width, brick_height),
-                        "color": color,
-                        "is_hit": False,
-                        "row": row,
-                        "col": col,
-                        "is_special": False,  # 特殊炸裂磚塊標記
-                    }
-                )
+        self.palette = BRICK_COLORS
+        if level is not None:
+            self._use_level(level)
+        else:
+            # 建立每個磚塊的狀態陣列
+            self.is_hit = np.zeros((rows, cols), dtype=bool)
+            self.is_special = np.zeros((rows, cols), dtype=bool)  # 特殊炸裂磚塊標記
+
+            # 每個磚塊使用不同的顏色（以 column 為主）
+            column_colors = np.arange(cols) % len(BRICK_COLORS)
+            self.color_index = np.tile(column_colors, (rows, 1)).astype(np.uint8)
+
+            # 剩下的磚塊數量，打掉磚塊時同步扣掉，不用每次重新數
+            self.remaining_count = rows * cols
+
+        # 爆炸設定：整列、整欄以外的形狀先把遮罩做好
+        self.blast_shape = blast_shape
+        self.blast_radius = blast_radius
+        self.chain_reaction = chain_reaction
+        self._blast_offsets = None
+        if blast_shape not in ("row", "column"):
+            # 記下遮罩裡每一格相對於爆炸中心差幾列、幾欄
+            mask_rows, mask_cols = np.nonzero(build_blast_mask(blast_shape, blast_radius))
+            self._blast_offsets = (mask_rows - blast_radius, mask_cols - blast_radius)
+
+        # 特殊磚塊總共爆炸過幾次
+        self.explosion_count = 0
+
+        # 還沒被取走的被打掉磚塊和爆炸中心紀錄（給粒子特效使用）
+        self._destroyed_log = []
+        self._explosion_log = []
+
+        # 還沒被取走的球直接撞到的磚塊紀錄：(rows, cols, 每一下連帶打掉的磚塊數)
+        self._hit_log = []
+
+        # 隨機選擇特殊磚塊（關卡檔已經標好了）
+        if level is None:
+            self._set_special_bricks(special_count, rng)
+
+        # 特殊磚塊圖案：(磚塊寬, 磚塊高, 顏色編號, 閃爍階段) -> 畫好的圖案，最近用過的排在最後面
+        # 圖案是繪圖器建立的，換繪圖器時整個丟掉
+        self._special_sprites = OrderedDict()
+        self._sprite_renderer = None
+
+        # 每欄剩幾塊磚（自動駕駛瞄準用，不用掃整面牆），以及繪製用的區塊
+        self.chunks = WallChunks(self, chunk_rows, chunk_cols, chunk_cache_bytes)
+        self.col_alive_counts = None
+        self.refresh_counts()
+
+    @classmethod
+    def from_level_file(cls, path, **kwargs):
+        """
+        從關卡檔建立磚牆\n
+        path: 關卡檔路徑\n
+        kwargs: 其他 Brick 參數（磚塊大小、間距、爆炸設定等）\n
+        return: Brick 物件\n
+        """
+        return cls(level=open_level(path), **kwargs)
+
+    def _use_level(self, level):
+        """
+        直接使用關卡檔映射出來的欄位當作磚牆的狀態陣列\n
+        顏色和特殊標記不複製，用到哪一格才從檔案讀進來，所以再大的關卡也能馬上開啟\n
+        """
+        if level.color_count > len(self.palette):
+            raise ValueError(
+                f"關卡用了 {level.color_count} 種顏色，調色盤只有 {len(self.palette)} 種"
+            )
+        cells = level.cells
+        self.color_index = cells["color"]
+        self.is_special = cells["special"].view(bool)
+
+        # 沒有空格的關卡不用掃描整個檔案，直接從全部都在開始
+        if level.has_empty_cells:
+            self.is_hit = cells["type"] == BRICK_EMPTY
+        else:
+            self.is_hit = np.zeros((level.rows, level.cols), dtype=bool)
+        self.remaining_count = level.brick_count
 
-        # 隨機選擇特殊磚塊
-        self._set_special_bricks(special_count)
+    def refresh_counts(self):
+        """
+        依照目前的 is_hit 重新計算剩餘數量、每欄的數量和區塊資料\n
+        直接修改 is_hit 或 is_special 陣列之後（例如測試準備場景）要呼叫這個方法\n
+        """
+        if self.is_hit.any():
+            self.col_alive_counts = self.rows - np.count_nonzero(self.is_hit, axis=0)
+        else:
+            # 全部都在（剛建立的牆）就不用逐格數，超大關卡才能馬上開啟
+            self.col_alive_counts = np.full(self.cols, self.rows, dtype=np.intp)
+        self.remaining_count = int(self.col_alive_counts.sum())
+        self.chunks.refresh()
 
-    def _set_special_bricks(self, special_count):
+    def _set_special_bricks(self, special_count, rng=None):
         """隨機設定特殊磚塊"""
-        actual_count = min(special_count, len(self.bricks))
-        special_indices = random.sample(range(len(self.bricks)), k=actual_count)
-        for idx in special_indices:
-            self.bricks[idx]["is_special"] = True
-
-    def draw(self, screen):
-        """繪製整面磚牆（未被擊中的磚塊才繪製）"""
-        for brick in self.bricks:
-            if not brick["is_hit"]:
-                # 繪製磚塊本體
-                pygame.draw.rect(screen, brick["color"], brick["rect"])
-
-                # 若為特殊磚塊，加上閃爍效果和標示
-                if brick.get("is_special", False):
-                    self._draw_special_brick_effects(screen, brick)
-
-    def _draw_special_brick_effects(self, screen, brick):
+        total = self.rows * self.cols
+        actual_count = min(special_count, total)
+        special_indices = (rng or random).sample(range(total), k=actual_count)
+        self.is_special.flat[special_indices] = True
+
+    def get_brick_rect(self, row, col):
+        """
+        取得指定格子的磚塊矩形\n
+        row, col: 磚塊所在的列與欄\n
+        return: pygame.Rect\n
+        """
+        return pygame.Rect(
+            self.start_x + col * self.pitch_x,
+            self.top_margin + row * self.pitch_y,
+            self.brick_width,
+            self.brick_height,
+        )
+
+    def get_cell_centers(self, rows, cols):
+        """
+        一次算出很多格子的磚塊中心座標\n
+        rows, cols (ndarray): 格子的列與欄\n
+        return: (xs, ys) 中心座標陣列\n
+        """
+        xs = self.start_x + cols * self.pitch_x + self.brick_width / 2
+        ys = self.top_margin + rows * self.pitch_y + self.brick_height / 2
+        return xs, ys
+
+    def pop_destroyed_cells(self):
+        """
+        取出上次呼叫之後被打掉的所有磚塊位置，並清空紀錄\n
+        return: (rows, cols) 兩個整數陣列\n
+        """
+        return self._pop_log(self._destroyed_log)
+
+    def pop_explosion_centers(self):
+        """
+        取出上次呼叫之後所有爆炸的中心位置，並清空紀錄\n
+        return: (rows, cols) 兩個整數陣列\n
+        """
+        return self._pop_log(self._explosion_log)
+
+    def pop_hit_events(self):
+        """
+        取出上次呼叫之後球直接撞到的磚塊，並清空紀錄\n
+        return: (rows, cols, hit_counts) 三個整數陣列，\n
+                hit_counts 是每一下總共打掉幾塊（包含爆炸連帶）\n
+        """
+        return self._pop_log(self._hit_log, width=3)
+
+    def _pop_log(self, log, width=2):
+        """把一份紀錄裡的每個欄位合併成陣列回傳，並清空紀錄"""
+        if not log:
+            empty = np.zeros(0, dtype=np.intp)
+            return (empty,) * width
+        columns = tuple(
+            np.concatenate([np.atleast_1d(entry[index]) for entry in log])
+            for index in range(width)
+        )
+        log.clear()
+        return columns
+
+    def get_brick_color(self, row, col):
+        """取得指定格子的磚塊顏色"""
+        return self.palette[self.color_index[row, col]]
+
+    def draw(self, renderer, offset_y=0, scale=1.0, special_effects=True):
+        """
+        繪製磚牆（未被擊中的磚塊才繪製，只畫跟畫面重疊的區塊）\n
+        renderer: 繪圖器（src/utils/renderer.py）\n
+        offset_y: 鏡頭上緣在世界座標的 y，不捲動時為 0\n
+        scale: 畫布相對於世界座標的縮放比例（降低解析度繪製時小於 1）\n
+        special_effects: 是否畫特殊磚塊的閃爍和『爆』字（畫質降低時關掉，只留固定的外框）\n
+        """
+        # 同一格所有特殊磚塊用同一個閃爍階段
+        phase = self.get_flash_phase(pygame.time.get_ticks()) if special_effects else None
+        self.chunks.draw(
+            renderer,
+            offset_y,
+            lambda color: self._get_special_sprite(color, phase, renderer, scale),
+            scale,
+        )
+
+    @property
+    def has_visible_specials(self):
+        """上一次繪製時畫面上有沒有特殊磚塊（有的話閃爍會讓畫面改變）"""
+        return self.chunks.visible_special_count > 0
+
+    def get_flash_phase(self, now):
+        """
+        取得特殊磚塊的閃爍階段\n
+        now: 目前時間（毫秒）\n
+        return: 0 或 1\n
+        """
+        return (now // SPECIAL_FLASH_INTERVAL) % 2
+
+    def get_time_until_flash(self, now):
+        """
+        距離下一次閃爍切換還有幾毫秒\n
+        now: 目前時間（毫秒）\n
+        """
+        return SPECIAL_FLASH_INTERVAL - now % SPECIAL_FLASH_INTERVAL
+
+    def clear_sprite_cache(self):
+        """丟掉畫好的特殊磚塊圖案（畫質改變時呼叫，之後用到時重新畫）"""
+        self._special_sprites.clear()
+
+    def _get_special_sprite(self, color_index, phase, renderer, scale=1.0):
+        """
+        取得特殊磚塊的圖案（磚塊本體、閃爍外框、『爆』字），同樣的顏色和階段只畫一次\n
+        第一次用到某個顏色時兩個閃爍階段一起畫好，閃爍切換時不用在遊戲中繪製『爆』字\n
+        phase: 閃爍階段，None 表示不要特效（固定顏色的外框，沒有『爆』字）\n
+        renderer: 繪圖器，跟上一次不同時丟掉所有畫好的圖案\n
+        scale: 圖案相對於世界座標的縮放比例\n
+        """
+        sprites = self._special_sprites
+        if renderer is not self._sprite_renderer:
+            sprites.clear()
+            self._sprite_renderer = renderer
+
+        width = max(1, round(self.brick_width * scale))
+        height = max(1, round(self.brick_height * scale))
+        key = (width, height, color_index, phase)
+        sprite = sprites.get(key)
+        if sprite is not None:
+            sprites.move_to_end(key)
+            return sprite
+
+        color = self.palette[color_index]
+        phases = (None,) if phase is None else range(len(SPECIAL_BRICK_FLASH_COLORS))
+        for sprite_phase in phases:
+            sprite = renderer.create_sprite((width, height))
+            rect = sprite.get_rect()
+            sprite.fill(color)
+            if sprite_phase is None:
+                outline_width = max(1, round(3 * scale))
+                pygame.draw.rect(sprite, SPECIAL_BRICK_FLASH_COLORS[0], rect, outline_width)
+            else:
+                self._draw_special_brick_effects(sprite, rect, color, sprite_phase)
+            sprites[(width, height, color_index, sprite_phase)] = sprite
+
+        # 超過上限時從最久沒用到的圖案開始丟掉
+        while len(sprites) > SPECIAL_SPRITE_CACHE_SIZE:
+            sprites.popitem(last=False)
+        return sprites[key]
+
+    def _draw_special_brick_effects(self, screen, rect, color, phase):
         """繪製特殊磚塊的視覺效果"""
         # 閃爍外框效果
-        tick = pygame.time.get_ticks()
-        phase = (tick // 300) % 2
         outline_color = SPECIAL_BRICK_FLASH_COLORS[phase]
-        pygame.draw.rect(screen, outline_color, brick["rect"], 3)
+        pygame.draw.rect(screen, outline_color, rect, 3)
 
         # 在磚塊中央顯示中文字『爆』
         try:
-            font_size = max(12, int(min(brick["rect"].height * 0.9, 24)))
+            font_size = max(12, int(min(rect.height * 0.9, 24)))
             font = load_chinese_font(font_size)
-            text_color = get_text_color_for_background(brick["color"])
-            text_surf = font.render("爆", True, text_color)
-            text_rect = text_surf.get_rect(center=brick["rect"].center)
+            text_color = get_text_color_for_background(color)
+            text_surf = font.render(SPECIAL_BRICK_GLYPH, True, text_color)
+            text_rect = text_surf.get_rect(center=rect.center)
             screen.blit(text_surf, text_rect)
         except Exception:
             # 若字型載入失敗，保留外框作為標示
             pass
 
+    def is_brick_alive(self, row, col):
+        """
+        查詢指定格子的磚塊是否還在\n
+        row, col: 磚塊所在的列與欄\n
+        return: 磚塊存在且尚未被擊中時為 True，超出範圍時為 False\n
+        """
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return not self.is_hit[row, col]
+        return False
+
     def get_remaining_bricks_count(self):
         """取得剩餘磚塊數量"""
-        return sum(1 for brick in self.bricks if not brick["is_hit"])
+        return self.remaining_count
 
     def check_collision(self, ball_rect):
         """
         檢查球與磚塊的碰撞\n
         ball_rect: 球的碰撞矩形\n
-        return: (is_hit, hit_count, collision_direction)\n
+        return: (is_hit, hit_count, collision_direction, destroyed_cells)\n
                is_hit: 是否有碰撞\n
-               hit_count: 被擊中的磚塊數量（包含爆炸連帶）\n
+               hit_count: 被擊中的磚塊數量（包含爆炸和連鎖爆炸）\n
                collision_direction: 碰撞方向 ('horizontal' 或 'vertical')\n
+               destroyed_cells: 這次被打掉的所有磚塊 [(row, col), ...]\n
         """
-        for brick in self.bricks:
-            if not brick["is_hit"] and ball_rect.colliderect(brick["rect"]):
+        # 只檢查球的矩形蓋到的那幾格，不用掃整面牆
+        row_lo = max(0, (ball_rect.top - self.top_margin) // self.pitch_y)
+        row_hi = min(self.rows - 1, (ball_rect.bottom - 1 - self.top_margin) // self.pitch_y)
+        col_lo = max(0, (ball_rect.left - self.start_x) // self.pitch_x)
+        col_hi = min(self.cols - 1, (ball_rect.right - 1 - self.start_x) // self.pitch_x)
+
+        for row in range(row_lo, row_hi + 1):
+            for col in range(col_lo, col_hi + 1):
+                if self.is_hit[row, col]:
+                    continue
+                brick_rect = self.get_brick_rect(row, col)
+                if not ball_rect.colliderect(brick_rect):
+                    continue
+
                 # 標記磚塊被擊中
-                brick["is_hit"] = True
+                log_start = len(self._destroyed_log)
+                self._mark_destroyed(row, col)
                 hit_count = 1
 
-                # 若為特殊磚塊，觸發爆炸效果
-                if brick.get("is_special", False):
-                    hit_count += self._explode_around(brick["row"], brick["col"])
+                # 若為特殊磚塊，觸發爆炸效果（包含連鎖爆炸）
+                if self.is_special[row, col]:
+                    hit_count += self._trigger_explosion(row, col)
+                self._hit_log.append((row, col, hit_count))
 
                 # 計算碰撞方向
                 collision_direction = self._calculate_collision_direction(
-                    ball_rect, brick["rect"]
+                    ball_rect, brick_rect
                 )
 
-                return True, hit_count, collision_direction
+                destroyed_cells = self._collect_cells(self._destroyed_log[log_start:])
+                return True, hit_count, collision_direction, destroyed_cells
+
+        return False, 0, None, []
+
+    def _collect_cells(self, entries):
+        """把紀錄裡的位置整理成 [(row, col), ...] 清單"""
+        cells = []
+        for rows, cols in entries:
+            cells.extend(
+                zip(np.atleast_1d(rows).tolist(), np.atleast_1d(cols).tolist())
+            )
+        return cells
+
+    def check_collision_batch(self, xs, ys, radii):
+        """
+        一次檢查很多顆球與磚塊的碰撞（多球模式用）\n
+        \n
+        每顆球只會碰到它四個角落所在的格子（球的直徑要小於磚塊間距），\n
+        所以對每顆球查最多四格，全部用陣列一起算，不用一顆一顆跑迴圈\n
+        \n
+        參數:\n
+        xs, ys (ndarray): 每顆球的中心座標\n
+        radii (ndarray): 每顆球的半徑\n
+        \n
+        回傳:\n
+        tuple: (ball_hit, is_horizontal, hit_count)\n
+            ball_hit (ndarray[bool]): 每顆球是否撞到磚塊\n
+            is_horizontal (ndarray[bool]): 撞到的話是否為水平方向反彈\n
+            hit_count (int): 被打掉的磚塊總數（包含爆炸連帶）\n
+        \n
+        副作用:\n
+        - 被撞到的磚塊會標記為擊中，同一塊磚被好幾顆球撞到只算一次\n
+        """
+        count = len(xs)
+        left = xs - radii
+        right = xs + radii
+        top = ys - radii
+        bottom = ys + radii
 
-        return False, 0, None
+        # 算出每顆球左上角和右下角分別落在哪一格
+        col_lo = np.floor((left - self.start_x) / self.pitch_x).astype(np.intp)
+        col_hi = np.floor((right - self.start_x) / self.pitch_x).astype(np.intp)
+        row_lo = np.floor((top - self.top_margin) / self.pitch_y).astype(np.intp)
+        row_hi = np.floor((bottom - self.top_margin) / self.pitch_y).astype(np.intp)
+
+        hit_row = np.full(count, -1, dtype=np.intp)
+        hit_col = np.full(count, -1, dtype=np.intp)
+        is_pending = np.ones(count, dtype=bool)
+
+        # 依照跟單顆球一樣的順序（先上後下、先左後右）找第一塊撞到的磚
+        for cell_rows, cell_cols in (
+            (row_lo, col_lo),
+            (row_lo, col_hi),
+            (row_hi, col_lo),
+            (row_hi, col_hi),
+        ):
+            is_inside = (
+                is_pending
+                & (cell_rows >= 0)
+                & (cell_rows < self.rows)
+                & (cell_cols >= 0)
+                & (cell_cols < self.cols)
+            )
+            safe_rows = np.clip(cell_rows, 0, self.rows - 1)
+            safe_cols = np.clip(cell_cols, 0, self.cols - 1)
+            cell_x = self.start_x + safe_cols * self.pitch_x
+            cell_y = self.top_margin + safe_rows * self.pitch_y
+
+            # 格子裡的磚塊還在，而且球真的碰到磚塊（不是卡在磚縫）
+            is_found = (
+                is_inside
+                & ~self.is_hit[safe_rows, safe_cols]
+                & (left < cell_x + self.brick_width)
+                & (right > cell_x)
+                & (top < cell_y + self.brick_height)
+                & (bottom > cell_y)
+            )
+            hit_row[is_found] = safe_rows[is_found]
+            hit_col[is_found] = safe_cols[is_found]
+            is_pending &= ~is_found
+
+        ball_hit = hit_row >= 0
+        is_horizontal = np.zeros(count, dtype=bool)
+        if not ball_hit.any():
+            return ball_hit, is_horizontal, 0
+
+        # 跟單顆球一樣用撞擊位置的比例判斷反彈方向
+        center_x = self.start_x + hit_col[ball_hit] * self.pitch_x + self.brick_width / 2
+        center_y = self.top_margin + hit_row[ball_hit] * self.pitch_y + self.brick_height / 2
+        dx = np.abs(xs[ball_hit] - center_x) / (self.brick_width / 2)
+        dy = np.abs(ys[ball_hit] - center_y) / (self.brick_height / 2)
+        is_horizontal[ball_hit] = dx > dy
+
+        # 同一塊磚被好幾顆球撞到只打掉一次
+        flat_cells = _unique_indices(
+            hit_row[ball_hit] * self.cols + hit_col[ball_hit], self.rows * self.cols
+        )
+        cell_rows, cell_cols = np.divmod(flat_cells, self.cols)
+        self._mark_destroyed(cell_rows, cell_cols)
+        hit_count = len(flat_cells)
+
+        # 撞到的特殊磚塊一個一個爆炸
+        is_special_hit = self.is_special[cell_rows, cell_cols]
+        cell_hit_counts = np.ones(len(flat_cells), dtype=np.intp)
+        for index in np.flatnonzero(is_special_hit).tolist():
+            chain = self._trigger_explosion(int(cell_rows[index]), int(cell_cols[index]))
+            cell_hit_counts[index] += chain
+            hit_count += chain
+        self._hit_log.append((cell_rows, cell_cols, cell_hit_counts))
+
+        return ball_hit, is_horizontal, hit_count
+
+    def _trigger_explosion(self, center_row, center_col):
+        """
+        從一塊特殊磚塊開始引爆，並處理連鎖爆炸\n
+        center_row, center_col: 第一塊爆炸的特殊磚塊位置\n
+        return: 所有爆炸連帶打掉的磚塊數（不含第一塊）\n
+        \n
+        連鎖爆炸用排隊的方式一層一層處理：這一層所有爆炸一起算，\n
+        被炸到的特殊磚塊排進佇列成為下一層。每塊磚只會被打掉一次，\n
+        所以每塊特殊磚塊也只會爆炸一次，整串連鎖只會經過被影響的格子一遍\n
+        """
+        queue = deque([(np.array([center_row]), np.array([center_col]))])
+        total_hits = 0
+
+        # 佇列裡還有等著爆炸的特殊磚塊就繼續，全部炸完就停
+        while queue:
+            rows, cols = queue.popleft()
+            self.explosion_count += len(rows)
+            self._explosion_log.append((rows, cols))
+            blast_rows, blast_cols = self._apply_blasts(rows, cols)
+            total_hits += len(blast_rows)
+
+            # 這一層被炸掉的特殊磚塊排進佇列，成為下一層的爆炸
+            if self.chain_reaction:
+                is_special = self.is_special[blast_rows, blast_cols]
+                if is_special.any():
+                    queue.append((blast_rows[is_special], blast_cols[is_special]))
+        return total_hits
 
     def _explode_around(self, center_row, center_col):
-        """爆炸效果：破壞周圍 3x3 範圍的磚塊"""
-        additional_hits = 0
-        for brick in self.bricks:
-            if not brick["is_hit"]:
-                if (
-                    abs(brick["row"] - center_row) <= 1
-                    and abs(brick["col"] - center_col) <= 1
-                ):
-                    brick["is_hit"] = True
-                    additional_hits += 1
-        return additional_hits
+        """
+        爆炸效果：依照爆炸形狀破壞周圍的磚塊（只炸一次，不處理連鎖）\n
+        center_row, center_col: 爆炸中心\n
+        return: 這次炸掉的磚塊數\n
+        """
+        blast_rows, _ = self._apply_blasts(
+            np.array([center_row]), np.array([center_col])
+        )
+        return len(blast_rows)
+
+    def _apply_blasts(self, center_rows, center_cols):
+        """
+        把好幾個爆炸範圍一起套到磚牆上，標記還沒被打掉的磚塊\n
+        center_rows, center_cols (ndarray): 各個爆炸中心\n
+        return: (rows, cols) 這次新被打掉的磚塊位置\n
+        """
+        if self.blast_shape == "row":
+            # 整列：把有爆炸的那幾列整條拿出來
+            blast_rows = _unique_indices(center_rows, self.rows)
+            lines = self.is_hit[blast_rows]
+            line_index, new_cols = np.nonzero(~lines)
+            new_rows = blast_rows[line_index]
+        elif self.blast_shape == "column":
+            # 整欄：把有爆炸的那幾欄整條拿出來
+            blast_cols = _unique_indices(center_cols, self.cols)
+            lines = self.is_hit[:, blast_cols]
+            new_rows, line_index = np.nonzero(~lines)
+            new_cols = blast_cols[line_index]
+        else:
+            # 把遮罩裡每一格的位置加到每個爆炸中心上，算出所有會被炸到的格子
+            target_rows = (center_rows[:, None] + self._blast_offsets[0]).ravel()
+            target_cols = (center_cols[:, None] + self._blast_offsets[1]).ravel()
+            is_inside = (
+                (target_rows >= 0)
+                & (target_rows < self.rows)
+                & (target_cols >= 0)
+                & (target_cols < self.cols)
+            )
+
+            # 幾個爆炸重疊的格子只算一次，已經打掉的格子跳過
+            cells = _unique_indices(
+                target_rows[is_inside] * self.cols + target_cols[is_inside],
+                self.rows * self.cols,
+            )
+            cells = cells[~self.is_hit.ravel()[cells]]
+            new_rows, new_cols = np.divmod(cells, self.cols)
+
+        # 記下這次被炸掉的是哪幾格
+        self._mark_destroyed(new_rows, new_cols)
+        return new_rows, new_cols
+
+    def _mark_destroyed(self, rows, cols):
+        """
+        把格子標記成被打掉，並同步更新剩餘數量、每欄的數量、區塊資料和紀錄\n
+        rows, cols: 被打掉的格子（整數或陣列，同一格不能重複）\n
+        """
+        self.is_hit[rows, cols] = True
+        if isinstance(rows, int):
+            # 單顆球撞到一塊磚是最常見的情況，直接扣比 np.subtract.at 快很多
+            self.remaining_count -= 1
+            self.col_alive_counts[cols] -= 1
+        else:
+            self.remaining_count -= len(rows)
+            np.subtract.at(self.col_alive_counts, cols, 1)
+        self.chunks.mark_destroyed(rows, cols)
+        self._destroyed_log.append((rows, cols))
 
     def _calculate_collision_direction(self, ball_rect, brick_rect):
         """計算碰撞方向"""
@@ -48,14 +48,44 @@ class Paddle:
         self.y = screen_height - y_offset
         self.rect = pygame.Rect(start_x, self.y, self.width, self.height)
 
-    def update(self):
-        """更新底板位置（跟隨滑鼠移動）"""
-        mx, _ = pygame.mouse.get_pos()
-        new_x = mx - self.width // 2
+        # 上一次檢查碰撞時底板的 x，這一格底板從這裡移動到 rect.x
+        self.motion_start_x = start_x
+
+    def update(self, target_x=None):
+        """
+        更新底板位置（跟隨滑鼠移動）\n
+        target_x: 底板中心的目標 x 座標，若為 None 則使用滑鼠位置\n
+        """
+        if target_x is None:
+            target_x, _ = pygame.mouse.get_pos()
+        new_x = int(target_x) - self.width // 2
         # 限制在螢幕範圍內
         new_x = max(0, min(new_x, self.screen_width - self.width))
         self.rect.x = new_x
 
+    def end_motion(self):
+        """檢查完碰撞後呼叫，下一格從目前的位置開始算移動範圍"""
+        self.motion_start_x = self.rect.x
+
+    def get_swept_rect(self):
+        """
+        取得這一格底板掃過的範圍（上一次檢查碰撞時的位置到現在的位置）\n
+        滑鼠移動很快時，球就算落在兩個位置中間也算撞到\n
+        """
+        if self.motion_start_x == self.rect.x:
+            return self.rect
+        left = min(self.motion_start_x, self.rect.x)
+        width = abs(self.rect.x - self.motion_start_x) + self.width
+        return pygame.Rect(left, self.rect.y, width, self.height)
+
+    def get_center_x_at(self, t):
+        """
+        取得這一格之中某個時間點底板中心的 x（假設底板等速移動）\n
+        t: 0 代表上一次檢查碰撞時，1 代表現在\n
+        """
+        start_center = self.motion_start_x + self.width / 2
+        return start_center + (self.rect.centerx - start_center) * t
+
     def shrink(self):
         """縮小底板（擊中磚塊時調用）"""
         old_centerx = self.rect.centerx
@@ -68,14 +98,37 @@ class Paddle:
             # 確保不超出螢幕邊界
             self.rect.x = max(0, min(self.rect.x, self.screen_width - self.width))
 
-    def draw(self, screen):
-        """繪製底板"""
-        pygame.draw.rect(screen, self.color, self.rect)
+    def draw(self, renderer, offset_y=0, scale=1.0):
+        """
+        繪製底板\n
+        renderer: 繪圖器（src/utils/renderer.py）\n
+        offset_y: 鏡頭上緣在世界座標的 y，不捲動時為 0\n
+        scale: 畫布相對於世界座標的縮放比例（降低解析度繪製時小於 1）\n
+        """
+        if scale == 1.0:
+            renderer.fill_rect(self.color, self.rect.move(0, -offset_y))
+            return
+        rect = self.rect
+        renderer.fill_rect(
+            self.color,
+            (
+                round(rect.x * scale),
+                round((rect.y - offset_y) * scale),
+                max(1, round(rect.width * scale)),
+                max(1, round(rect.height * scale)),
+            ),
+        )
 
-    def get_hit_factor(self, ball_x):
+    def get_hit_factor(self, ball_x, t=1.0):
         """
         計算球撞擊底板的相對位置（用於改變反彈角度）\n
         ball_x: 球的 x 座標\n
+        t: 撞到的時間點在這一格的哪裡（0 到 1，1 代表用底板現在的位置）\n
         return: -1 到 1 之間的值，表示撞擊位置\n
         """
-        return (ball_x - self.rect.centerx) / (self.width / 2)
+        if t == 1.0:
+            factor = (ball_x - self.rect.centerx) / (self.width / 2)
+        else:
+            factor = (ball_x - self.get_center_x_at(t)) / (self.width / 2)
+        # 球的邊緣碰到底板角落、或底板掃過去的時候才撞到，算出來的撞擊點可能在底板外面，限制在邊緣
+        return max(-1.0, min(1.0, factor))
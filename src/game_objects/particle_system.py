@@ -0,0 +1,195 @@
+"""
+粒子系統模組
+磚塊被打掉和特殊磚塊爆炸時的碎片特效
+"""
+
+import pygame
+import numpy as np
+
+
+class ParticleSystem:
+    """
+    粒子系統類別 - 用固定大小的陣列管理所有碎片粒子\n
+    \n
+    設計重點：\n
+    - 不替每個粒子建立物件，位置、速度、年齡都放在陣列裡一起計算\n
+    - 陣列大小固定（capacity），粒子數量永遠不會超過上限\n
+    - 像繞圈圈一樣依序寫入，滿了就覆蓋最早產生的粒子，\n
+      所以連環爆炸時畫面上的粒子數量有上限，不會拖慢遊戲\n
+    - 粒子的圖案事先畫好（每種顏色幾種大小），繪製時一次批次貼圖\n
+    """
+
+    def __init__(
+        self,
+        capacity=2000,
+        colors=None,
+        sizes=(1, 2, 3),
+        lifetime=30,
+        speed=4,
+        gravity=0.25,
+    ):
+        """
+        初始化粒子系統\n
+        capacity: 最多同時存在的粒子數量（硬上限）\n
+        colors: 粒子可以使用的顏色清單，粒子用編號指定顏色\n
+        sizes: 粒子的半徑有哪幾種，粒子會隨著年齡由大變小\n
+        lifetime: 粒子存活的格數\n
+        speed: 粒子噴出的最大速率\n
+        gravity: 每格往下增加的速度\n
+        """
+        self.capacity = capacity
+        self.colors = list(colors) if colors else [(255, 255, 255)]
+        self.sizes = sizes
+        self.lifetime = lifetime
+        self.speed = speed
+        self.gravity = gravity
+
+        # 所有粒子的狀態都放在固定大小的陣列裡
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.int32)
+        self.color_index = np.zeros(capacity, dtype=np.int32)
+        self.is_alive = np.zeros(capacity, dtype=bool)
+
+        # 實際使用的粒子數上限（畫質降低時可以調小，不超過 capacity）
+        self.limit = capacity
+
+        # 下一個要寫入的位置，繞一圈後會覆蓋最早的粒子
+        self._cursor = 0
+
+        # 事先把每種顏色、每種大小的粒子畫好；降低解析度繪製用的縮小圖案用到才畫
+        self._sprites = self._build_sprites(sizes)
+        self._scaled_sprites = {}
+
+    def _build_sprites(self, sizes):
+        """
+        預先畫好所有粒子圖案\n
+        sizes: 每種大小的半徑\n
+        return: 清單，編號為 顏色編號 * 大小種類數 + 大小編號\n
+        """
+        sprites = []
+        for color in self.colors:
+            for size in sizes:
+                sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, color, (size, size), size)
+                sprites.append(sprite)
+        return sprites
+
+    def set_limit(self, limit):
+        """
+        設定同時存在的粒子數上限（畫質調整用），超過新上限的粒子直接移除\n
+        limit: 新的上限，若為 None 則恢復成 capacity\n
+        """
+        limit = self.capacity if limit is None else max(1, min(int(limit), self.capacity))
+        if limit == self.limit:
+            return
+        self.is_alive[limit:] = False
+        self.limit = limit
+        self._cursor %= limit
+
+    def get_alive_count(self):
+        """取得目前還活著的粒子數量"""
+        return int(np.count_nonzero(self.is_alive))
+
+    def emit(self, xs, ys, color_indices, amount_each):
+        """
+        從好幾個位置一次噴出粒子\n
+        xs, ys: 每個噴出點的座標（陣列或清單）\n
+        color_indices: 每個噴出點使用的顏色編號\n
+        amount_each: 每個噴出點要噴出幾個粒子\n
+        \n
+        副作用:\n
+        - 陣列滿了就從最早產生的粒子開始覆蓋\n
+        """
+        if len(xs) == 0 or amount_each <= 0:
+            return
+
+        # 一次噴太多就只留最後的部分，反正前面的也會馬上被覆蓋
+        limit = self.limit
+        keep = -(-limit // amount_each)
+        xs = np.asarray(xs, dtype=np.float32)[-keep:]
+        ys = np.asarray(ys, dtype=np.float32)[-keep:]
+        color_indices = np.asarray(color_indices, dtype=np.int32)[-keep:]
+        source_x = np.repeat(xs, amount_each)[-limit:]
+        source_y = np.repeat(ys, amount_each)[-limit:]
+        source_color = np.repeat(color_indices, amount_each)[-limit:]
+        total = len(source_x)
+
+        # 從目前的位置往後繞圈寫入（只用到前 limit 格）
+        slots = (self._cursor + np.arange(total)) % limit
+        self._cursor = int((self._cursor + total) % limit)
+
+        # 每個粒子往隨機方向、隨機速度噴出
+        angles = np.random.uniform(0, 2 * np.pi, total).astype(np.float32)
+        speeds = np.random.uniform(0.3, 1.0, total).astype(np.float32) * self.speed
+        self.x[slots] = source_x
+        self.y[slots] = source_y
+        self.vx[slots] = np.cos(angles) * speeds
+        self.vy[slots] = np.sin(angles) * speeds
+        self.age[slots] = 0
+        self.color_index[slots] = source_color
+        self.is_alive[slots] = True
+
+    def clear(self):
+        """移除所有粒子"""
+        self.is_alive[:] = False
+
+    def update(self):
+        """讓所有粒子前進一格，並讓太老的粒子消失"""
+        if not self.is_alive.any():
+            return
+
+        # 所有粒子一起移動，並受重力往下掉（死掉的粒子也一起算，比挑出來更快）
+        self.vy += self.gravity
+        self.x += self.vx
+        self.y += self.vy
+        self.age += 1
+        self.is_alive &= self.age < self.lifetime
+
+    def draw(self, renderer, offset_y=0, scale=1.0):
+        """
+        用一次批次貼圖畫出所有活著的粒子\n
+        renderer: 繪圖器（src/utils/renderer.py）\n
+        offset_y: 鏡頭上緣在世界座標的 y，不捲動時為 0\n
+        scale: 畫布相對於世界座標的縮放比例（降低解析度繪製時小於 1）\n
+        """
+        alive = np.flatnonzero(self.is_alive)
+        if len(alive) == 0:
+            return
+
+        # 越老的粒子用越小的圖案，看起來像慢慢消失
+        size_count = len(self.sizes)
+        remaining = 1.0 - self.age[alive] / self.lifetime
+        size_index = np.minimum((remaining * size_count).astype(np.int32), size_count - 1)
+        sprite_index = self.color_index[alive] * size_count + size_index
+        if scale == 1.0:
+            sprites = self._sprites
+            radius = np.asarray(self.sizes, dtype=np.int32)[size_index]
+            lefts = (self.x[alive] - radius).astype(np.int32).tolist()
+            tops = (self.y[alive] - radius - offset_y).astype(np.int32).tolist()
+        else:
+            sprites, sizes = self._get_scaled_sprites(scale)
+            radius = sizes[size_index]
+            lefts = (np.rint(self.x[alive] * scale) - radius).astype(np.int32).tolist()
+            tops = (np.rint((self.y[alive] - offset_y) * scale) - radius).astype(np.int32).tolist()
+
+        renderer.blits(
+            [
+                (sprites[index], (left, top))
+                for index, left, top in zip(sprite_index.tolist(), lefts, tops)
+            ]
+        )
+
+    def _get_scaled_sprites(self, scale):
+        """
+        取得（或第一次時畫好）縮小後的粒子圖案\n
+        return: (圖案清單, 每種大小縮小後的半徑陣列)\n
+        """
+        cached = self._scaled_sprites.get(scale)
+        if cached is None:
+            sizes = [max(1, round(size * scale)) for size in self.sizes]
+            cached = (self._build_sprites(sizes), np.asarray(sizes, dtype=np.int32))
+            self._scaled_sprites[scale] = cached
+        return cached
@@ -0,0 +1,371 @@
+"""
+磚牆區塊模組
+把磚牆切成固定大小的區塊，每個區塊有自己的剩餘磚塊數和畫好的畫面，
+繪製時只處理跟畫面重疊的區塊
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+
+class WallChunks:
+    """
+    磚牆區塊管理類別\n
+    \n
+    每個區塊（chunk_rows x chunk_cols 格）記錄：\n
+    - 剩餘磚塊數（get_alive_counts）：0 的區塊不用畫也不用建畫面，球路預測也直接跳過\n
+    - 畫好的畫面：第一次出現在畫面上時才畫，之後每格只要貼一次圖；\n
+      磚塊被打掉時只把那一格擦掉，不用整塊重畫\n
+    - 區塊裡的特殊磚塊位置：閃爍效果每格都要畫，只查看得到的區塊\n
+    \n
+    畫好的畫面依最近使用的順序排隊，總大小超過 cache_bytes 時，\n
+    從最久沒出現在畫面上的區塊開始丟掉，之後再捲回來時重新畫\n
+    \n
+    畫質降低時可以畫在縮小的畫布上（scale 小於 1），區塊畫面也用同樣的比例畫，\n
+    比例改變時丟掉所有畫好的畫面重新畫\n
+    \n
+    區塊畫面是繪圖器建立的圖層（create_layer），打掉磚塊時用繪圖器擦掉那一格並通知內容改變；\n
+    換了繪圖器時丟掉所有畫好的畫面，用新的繪圖器重新畫\n
+    """
+
+    def __init__(self, wall, chunk_rows=16, chunk_cols=16, cache_bytes=32 * 1024 * 1024):
+        """
+        初始化磚牆區塊\n
+        wall: Brick 物件\n
+        chunk_rows, chunk_cols: 每個區塊幾列、幾欄\n
+        cache_bytes: 畫好的區塊畫面最多佔用多少記憶體（看得到的區塊一定保留）\n
+        """
+        self.wall = wall
+        self.chunk_rows = chunk_rows
+        self.chunk_cols = chunk_cols
+        self.grid_rows = -(-wall.rows // chunk_rows)
+        self.grid_cols = -(-wall.cols // chunk_cols)
+        self.chunk_width = chunk_cols * wall.pitch_x
+        self.chunk_height = chunk_rows * wall.pitch_y
+        self.cache_bytes = cache_bytes
+        self.cached_bytes = 0
+
+        # (區塊列, 區塊欄) -> 畫面，最近畫過的排在最後面
+        self._surfaces = OrderedDict()
+        # (區塊列, 區塊欄) -> 區塊裡特殊磚塊的 (rows, cols)，跟畫面一起建立、一起丟掉
+        self._specials = {}
+        # 被打掉但還沒算進區塊資料的格子：[(rows, cols), ...]
+        self._pending = []
+
+        # 每個區塊剩幾塊磚，由 refresh() 算出（Brick 建立完狀態陣列後會呼叫）
+        self._alive_counts = None
+
+        # 上一次繪製時畫面上有幾塊特殊磚塊（閒置時用來判斷閃爍會不會改變畫面）
+        self.visible_special_count = 0
+
+        # 區塊畫面相對於世界座標的縮放比例
+        self.scale = 1.0
+
+        # 建立區塊畫面的繪圖器（第一次繪製或預先畫好時記下來）
+        self._renderer = None
+
+    def refresh(self):
+        """依照磚牆目前的 is_hit 重新計算每個區塊的剩餘數量，並丟掉所有畫好的畫面"""
+        is_hit = self.wall.is_hit
+        row_starts = np.arange(0, self.wall.rows, self.chunk_rows)
+        col_starts = np.arange(0, self.wall.cols, self.chunk_cols)
+
+        # 最後一列、一欄的區塊可能不滿
+        row_sizes = np.diff(np.append(row_starts, self.wall.rows))
+        col_sizes = np.diff(np.append(col_starts, self.wall.cols))
+        self._alive_counts = row_sizes[:, None] * col_sizes[None, :]
+        if is_hit.any():
+            self._alive_counts -= np.add.reduceat(
+                np.add.reduceat(is_hit, row_starts, axis=0, dtype=np.intp),
+                col_starts,
+                axis=1,
+            )
+
+        self._pending.clear()
+        self._clear_surfaces()
+
+    def set_scale(self, scale):
+        """
+        設定區塊畫面的縮放比例，跟原本不同時丟掉所有畫好的畫面\n
+        scale: 畫布相對於世界座標的比例\n
+        """
+        if scale != self.scale:
+            self.scale = scale
+            self._clear_surfaces()
+
+    def _clear_surfaces(self):
+        """丟掉所有畫好的區塊畫面"""
+        self._surfaces.clear()
+        self._specials.clear()
+        self.cached_bytes = 0
+
+    def _scale_rect(self, x, y, width, height):
+        """把世界座標（或區塊內座標）的矩形換成目前縮放比例下的矩形"""
+        scale = self.scale
+        if scale == 1.0:
+            return (x, y, width, height)
+        return (
+            round(x * scale),
+            round(y * scale),
+            max(1, round(width * scale)),
+            max(1, round(height * scale)),
+        )
+
+    def mark_destroyed(self, rows, cols):
+        """
+        磚塊被打掉時呼叫，先記下來，等到要用區塊資料時（繪製、查詢剩餘數量）再整批更新，\n
+        一格之內好幾顆球、好幾次爆炸打掉的磚塊只要算一次\n
+        rows, cols: 被打掉的格子（整數或陣列）\n
+        """
+        self._pending.append((rows, cols))
+
+    def get_alive_counts(self):
+        """
+        取得每個區塊剩幾塊磚\n
+        return: (區塊列數, 區塊欄數) 的整數陣列\n
+        """
+        if self._pending:
+            self._apply_pending()
+        return self._alive_counts
+
+    def get_visible_range(self, view_left, view_top, view_width, view_height):
+        """
+        算出跟畫面重疊的區塊範圍\n
+        view_left, view_top: 畫面左上角在世界座標的位置\n
+        view_width, view_height: 畫面大小\n
+        return: (列起點, 列終點, 欄起點, 欄終點)，終點不包含；沒有重疊時範圍是空的\n
+        """
+        wall = self.wall
+        top = view_top - wall.top_margin
+        left = view_left - wall.start_x
+        row_lo = max(0, top // self.chunk_height)
+        row_hi = min(self.grid_rows, (top + view_height - 1) // self.chunk_height + 1)
+        col_lo = max(0, left // self.chunk_width)
+        col_hi = min(self.grid_cols, (left + view_width - 1) // self.chunk_width + 1)
+        return row_lo, row_hi, col_lo, col_hi
+
+    def draw(self, renderer, offset_y, special_sprites, scale=1.0):
+        """
+        畫出看得到的區塊\n
+        renderer: 繪圖器（src/utils/renderer.py）\n
+        offset_y: 鏡頭上緣在世界座標的 y（世界座標減掉它就是畫面座標）\n
+        special_sprites: 函式，傳入顏色編號回傳這一格要用的特殊磚塊圖案（要跟 scale 同樣大小）\n
+        scale: 畫布相對於世界座標的縮放比例\n
+        """
+        self.set_scale(scale)
+        self._use_renderer(renderer)
+        alive_counts = self.get_alive_counts()
+
+        view_width, view_height = renderer.get_size()
+        if scale != 1.0:
+            view_width = -(-view_width // scale)
+            view_height = -(-view_height // scale)
+        row_lo, row_hi, col_lo, col_hi = self.get_visible_range(
+            0, offset_y, int(view_width), int(view_height)
+        )
+        if row_lo >= row_hi or col_lo >= col_hi:
+            self.visible_special_count = 0
+            return
+
+        wall = self.wall
+        visible = alive_counts[row_lo:row_hi, col_lo:col_hi]
+        grid_rows, grid_cols = np.nonzero(visible > 0)
+
+        blits = []
+        special_blits = []
+        visible_count = 0
+        for grid_row, grid_col in zip(
+            (grid_rows + row_lo).tolist(), (grid_cols + col_lo).tolist()
+        ):
+            key = (grid_row, grid_col)
+            surface = self._get_surface(key)
+            visible_count += 1
+            x = wall.start_x + grid_col * self.chunk_width
+            y = wall.top_margin + grid_row * self.chunk_height - offset_y
+            if scale != 1.0:
+                x = round(x * scale)
+                y = round(y * scale)
+            blits.append((surface, (x, y)))
+
+            # 區塊裡還在的特殊磚塊蓋上閃爍的圖案
+            special_rows, special_cols = self._specials[key]
+            if len(special_rows) == 0:
+                continue
+            is_alive = ~wall.is_hit[special_rows, special_cols]
+            alive_rows = special_rows[is_alive]
+            alive_cols = special_cols[is_alive]
+            colors = wall.color_index[alive_rows, alive_cols].tolist()
+            xs = wall.start_x + alive_cols * wall.pitch_x
+            ys = wall.top_margin + alive_rows * wall.pitch_y - offset_y
+            if scale != 1.0:
+                xs = np.rint(xs * scale).astype(np.intp)
+                ys = np.rint(ys * scale).astype(np.intp)
+            xs = xs.tolist()
+            ys = ys.tolist()
+            special_blits.extend(
+                (special_sprites(color), (x, y)) for color, x, y in zip(colors, xs, ys)
+            )
+
+        if blits:
+            renderer.blits(blits)
+        if special_blits:
+            renderer.blits(special_blits)
+        self.visible_special_count = len(special_blits)
+        self._evict(visible_count)
+
+    def prerender(self, view_top, view_width, view_height, renderer, limit=None):
+        """
+        先把一個範圍內還有磚塊的區塊畫面畫好（準備換上新的一關時使用，換上後第一格不用再畫）\n
+        已經畫好的區塊跳過；會用繪圖器建立圖層，只能在主執行緒呼叫\n
+        view_top: 範圍上緣在世界座標的 y\n
+        view_width, view_height: 範圍大小\n
+        renderer: 用來建立區塊畫面的繪圖器，不會畫到畫面上\n
+        limit: 這次最多畫幾塊（分好幾格慢慢畫），若為 None 則全部畫完\n
+        return: 這次新畫的區塊數量，比 limit 少就表示範圍內都畫好了\n
+        """
+        self._use_renderer(renderer)
+        alive_counts = self.get_alive_counts()
+        row_lo, row_hi, col_lo, col_hi = self.get_visible_range(
+            0, view_top, view_width, view_height
+        )
+        count = 0
+        for grid_row in range(row_lo, row_hi):
+            for grid_col in range(col_lo, col_hi):
+                key = (grid_row, grid_col)
+                if alive_counts[key] == 0 or key in self._surfaces:
+                    continue
+                if count == limit:
+                    return count
+                self._get_surface(key)
+                count += 1
+        return count
+
+    def _use_renderer(self, renderer):
+        """換成指定的繪圖器，跟原本不同時丟掉用舊繪圖器建立的區塊畫面"""
+        if renderer is not self._renderer:
+            if self._renderer is not None:
+                self._clear_surfaces()
+            self._renderer = renderer
+
+    def _get_surface(self, key):
+        """取得區塊畫好的畫面，還沒畫過就現在畫，並移到最近使用的位置"""
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+
+        wall = self.wall
+        grid_row, grid_col = key
+        row_start = grid_row * self.chunk_rows
+        col_start = grid_col * self.chunk_cols
+        row_end = min(row_start + self.chunk_rows, wall.rows)
+        col_end = min(col_start + self.chunk_cols, wall.cols)
+
+        # 由繪圖器建立一開始全透明的圖層，格式跟畫布相配，貼圖時不用轉換
+        _, _, width, height = self._scale_rect(
+            0, 0, (col_end - col_start) * wall.pitch_x, (row_end - row_start) * wall.pitch_y
+        )
+        surface = self._renderer.create_layer((width, height))
+
+        self._fill_layer(surface, row_start, row_end, col_start, col_end)
+
+        special_rows, special_cols = np.nonzero(
+            wall.is_special[row_start:row_end, col_start:col_end]
+        )
+        self._specials[key] = (special_rows + row_start, special_cols + col_start)
+        self._surfaces[key] = surface
+        self.cached_bytes += surface.get_pitch() * surface.get_height()
+        return surface
+
+    def _fill_layer(self, surface, row_start, row_end, col_start, col_end):
+        """
+        把區塊的磚塊一次寫進剛建立（全透明）的圖層，不用每塊磚呼叫一次 pygame.draw.rect：\n
+        先把每一列磚換成一整行像素值，再直接複製到那一列磚佔的每一行像素\n
+        磚塊的範圍跟 _scale_rect 算出來的矩形一樣，打掉時擦掉的範圍才會剛好對上\n
+        """
+        wall = self.wall
+        width, height = surface.get_size()
+
+        # 每一格換成這個圖層的像素值，打掉的格子是透明（圖層左上角目前的值）；
+        # 多留一欄透明，給落在磚塊間隔裡的像素對到
+        # （map_rgb 在最高位元是 1 時會回傳負數，轉成 32 位元的無號數）
+        transparent = surface.get_at_mapped((0, 0)) & 0xFFFFFFFF
+        mapped = [transparent]
+        mapped.extend(surface.map_rgb(color) & 0xFFFFFFFF for color in wall.palette)
+        block = (slice(row_start, row_end), slice(col_start, col_end))
+        cells = np.full((row_end - row_start, col_end - col_start + 1), transparent, np.uint32)
+        cells[:, :-1] = np.array(mapped, dtype=np.uint32)[
+            np.where(wall.is_hit[block], 0, wall.color_index[block] + 1)
+        ]
+
+        # 每個 x 落在哪一欄磚上，落在間隔裡的是 -1（對到多留的那一欄）
+        col_of_x = np.full(width, -1, dtype=np.intp)
+        for col in range(col_end - col_start):
+            x, _, brick_width, _ = self._scale_rect(
+                col * wall.pitch_x, 0, wall.brick_width, wall.brick_height
+            )
+            col_of_x[x : x + brick_width] = col
+        lines = cells.take(col_of_x, axis=1)
+
+        # pixels2d 是 (x, y) 排列，轉置後每一行像素是連續的記憶體
+        view = pygame.surfarray.pixels2d(surface).T
+        for row in range(row_end - row_start):
+            _, y, _, brick_height = self._scale_rect(
+                0, row * wall.pitch_y, wall.brick_width, wall.brick_height
+            )
+            view[y : y + brick_height] = lines[row]
+        # 放掉 pixels2d 對圖層的鎖定，之後才能貼圖或上傳成貼圖
+        del view
+
+    def _apply_pending(self):
+        """
+        把累積的打掉紀錄算進區塊資料：扣掉剩餘數量，\n
+        已經畫好的區塊把那一格擦掉，打光的區塊直接丟掉畫面\n
+        """
+        rows = np.concatenate([np.atleast_1d(rows) for rows, _ in self._pending])
+        cols = np.concatenate([np.atleast_1d(cols) for _, cols in self._pending])
+        self._pending.clear()
+        grid_rows = rows // self.chunk_rows
+        grid_cols = cols // self.chunk_cols
+        np.subtract.at(self._alive_counts, (grid_rows, grid_cols), 1)
+        if not self._surfaces:
+            return
+
+        wall = self.wall
+        for row, col, key in zip(
+            rows.tolist(), cols.tolist(), zip(grid_rows.tolist(), grid_cols.tolist())
+        ):
+            surface = self._surfaces.get(key)
+            if surface is None:
+                continue
+            if self._alive_counts[key] <= 0:
+                self._drop(key)
+                continue
+            self._renderer.erase(
+                surface,
+                self._scale_rect(
+                    (col % self.chunk_cols) * wall.pitch_x,
+                    (row % self.chunk_rows) * wall.pitch_y,
+                    wall.brick_width,
+                    wall.brick_height,
+                ),
+            )
+            self._renderer.mark_changed(surface)
+
+    def _evict(self, visible_count):
+        """超過記憶體預算時，從最久沒畫過的區塊開始丟掉畫面（這一格看得到的排在最後，不會被丟）"""
+        while self.cached_bytes > self.cache_bytes and len(self._surfaces) > visible_count:
+            key = next(iter(self._surfaces))
+            self._drop(key)
+
+    def _drop(self, key):
+        """丟掉一個區塊的畫面"""
+        surface = self._surfaces.pop(key)
+        del self._specials[key]
+        self.cached_bytes -= surface.get_pitch() * surface.get_height()
+
+    def get_cached_count(self):
+        """取得目前有幾個區塊的畫面留在記憶體裡"""
+        return len(self._surfaces)
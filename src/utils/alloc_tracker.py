@@ -0,0 +1,234 @@
+"""
+每格記憶體配置追蹤工具模組
+用 tracemalloc 找出主迴圈每一格、每一段配置了多少記憶體，以及是哪幾行配置的
+"""
+
+import collections
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# 追蹤時排除的檔案：tracemalloc 自己和這個模組在拍快照時也會配置記憶體
+_EXCLUDED_FILES = (tracemalloc.__file__, os.path.abspath(__file__))
+
+
+class AllocationTracker:
+    """
+    記憶體配置追蹤器\n
+    \n
+    用法跟 FrameTimer 一樣（start、lap、begin_frame、end_frame），\n
+    所以直接把 engine.frame_timer 換成這個物件，就能沿用遊戲裡已經切好的段落：\n
+    tracker = AllocationTracker()\n
+    engine.frame_timer = tracker\n
+    tracker.install()\n
+    tracker.run_frames(step, 600)\n
+    tracker.uninstall()\n
+    tracker.assert_steady_state(max_bytes_per_frame=256)\n
+    \n
+    暖身之後，每一段每一格都會記錄（只讀計數器，很便宜）：\n
+    - 淨增加的位元組數和記憶體區塊數（段落結束時還沒釋放的記憶體）\n
+    - 暫時配置的高峰（段落中配置後又馬上釋放的記憶體，這部分會造成 GC 負擔）\n
+    拍快照很慢，所以只有每隔 snapshot_interval 格才拍，用來找出是哪幾行配置的；\n
+    拍快照的那幾格不算進每格統計和垃圾回收次數\n
+    \n
+    注意：pygame 的 Surface 像素資料是 SDL 配置的，tracemalloc 看不到，\n
+    只看得到 Python 端的 Surface 物件本身\n
+    """
+
+    def __init__(self, traceback_limit=1, warmup_frames=60, snapshot_interval=30):
+        """
+        初始化追蹤器\n
+        traceback_limit: 每筆配置記住幾層呼叫堆疊（1 就是只記配置的那一行）\n
+        warmup_frames: 前幾格不算進穩定狀態（字型、快取第一次建立時會配置較多）\n
+        snapshot_interval: 每隔幾格拍一次快照找出配置的程式行，0 代表不拍\n
+        """
+        self.traceback_limit = traceback_limit
+        self.warmup_frames = warmup_frames
+        self.snapshot_interval = snapshot_interval
+        self.is_enabled = True
+
+        self.phase_stats = {}
+        self.line_stats = collections.Counter()
+        self.line_blocks = collections.Counter()
+        self.frame_bytes = []
+        self.gc_collections = [0, 0, 0]
+        self.gc_pause_ms = 0.0
+
+        self._was_tracing = False
+        self._frame_index = 0
+        self._is_sampling = False
+        self._frame_start_bytes = 0
+        self._gc_start = 0
+
+    def install(self):
+        """開始追蹤記憶體配置和垃圾回收"""
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start(self.traceback_limit)
+        gc.callbacks.append(self._on_gc)
+
+    def uninstall(self):
+        """停止追蹤（如果追蹤是別人先打開的就不關掉）"""
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if not self._was_tracing:
+            tracemalloc.stop()
+
+    def set_enabled(self, enabled):
+        """為了跟 FrameTimer 相容，追蹤器安裝後一律啟用"""
+
+    def run_frames(self, step, frames):
+        """
+        執行固定格數，每格呼叫一次 step\n
+        step: 不帶參數的函式，做一格的事情（例如 update 加 draw）\n
+        frames: 要跑幾格\n
+        """
+        for _ in range(frames):
+            self.begin_frame()
+            step()
+            self.end_frame()
+
+    def start(self):
+        """開始一段，回傳比較基準"""
+        snapshot = self._take_snapshot() if self._is_sampling else None
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0], sys.getallocatedblocks(), snapshot
+
+    def lap(self, phase, start):
+        """
+        結束一段並開始下一段\n
+        phase: 段落名稱\n
+        start: start() 或上一次 lap() 的回傳值\n
+        return: 下一段的比較基準\n
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        start_bytes, start_blocks, start_snapshot = start
+
+        if start_snapshot is not None:
+            # 抽樣的這一格：比較前後兩張快照，找出這一段留下來的配置是哪幾行產生的
+            self._record_lines(phase, start_snapshot)
+        elif self._frame_index > self.warmup_frames:
+            stats = self.phase_stats.get(phase)
+            if stats is None:
+                stats = {"bytes": 0, "blocks": 0, "peak_bytes": 0, "samples": 0}
+                self.phase_stats[phase] = stats
+            stats["samples"] += 1
+            stats["bytes"] += current - start_bytes
+            stats["blocks"] += blocks - start_blocks
+            stats["peak_bytes"] = max(stats["peak_bytes"], peak - start_bytes)
+
+        del start_snapshot
+        return self.start()
+
+    def begin_frame(self):
+        """標記一格的開始，決定這一格要不要拍快照"""
+        self._is_sampling = (
+            self.snapshot_interval > 0
+            and self._frame_index >= self.warmup_frames
+            and self._frame_index % self.snapshot_interval == 0
+        )
+        self._frame_index += 1
+        self._frame_start_bytes = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self):
+        """標記一格的結束，記錄這一格淨增加的位元組數"""
+        if not self._is_sampling:
+            self.frame_bytes.append(
+                tracemalloc.get_traced_memory()[0] - self._frame_start_bytes
+            )
+        self._is_sampling = False
+
+    def _take_snapshot(self):
+        """拍一張快照，排除追蹤工具自己的配置"""
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in _EXCLUDED_FILES]
+        )
+
+    def _record_lines(self, phase, start_snapshot):
+        """比較段落開始時的快照和現在，把增加的記憶體記到對應的程式行"""
+        snapshot = self._take_snapshot()
+        for diff in snapshot.compare_to(start_snapshot, "lineno"):
+            if diff.size_diff <= 0:
+                continue
+            frame = diff.traceback[0]
+            key = (phase, f"{frame.filename}:{frame.lineno}")
+            self.line_stats[key] += diff.size_diff
+            self.line_blocks[key] += diff.count_diff
+
+    def _on_gc(self, phase, info):
+        """垃圾回收開始和結束時由 gc 模組呼叫，記錄次數和暫停時間（拍快照的格不算）"""
+        if self._is_sampling:
+            return
+        if phase == "start":
+            self._gc_start = time.perf_counter_ns()
+        elif self._gc_start:
+            self.gc_collections[info["generation"]] += 1
+            self.gc_pause_ms += (time.perf_counter_ns() - self._gc_start) / 1_000_000
+            self._gc_start = 0
+
+    def get_report(self):
+        """
+        取得每一段的統計\n
+        return: {段落名稱: {'bytes_per_frame', 'blocks_per_frame', 'peak_bytes', 'samples'}}\n
+        """
+        report = {}
+        for phase, stats in self.phase_stats.items():
+            samples = max(1, stats["samples"])
+            report[phase] = {
+                "bytes_per_frame": stats["bytes"] / samples,
+                "blocks_per_frame": stats["blocks"] / samples,
+                "peak_bytes": stats["peak_bytes"],
+                "samples": stats["samples"],
+            }
+        return report
+
+    def get_top_lines(self, limit=10):
+        """
+        取得留下最多記憶體的程式行\n
+        return: [(段落名稱, 檔案:行號, 位元組數, 區塊數)]，由多到少排列\n
+        """
+        return [
+            (phase, line, size, self.line_blocks[(phase, line)])
+            for (phase, line), size in self.line_stats.most_common(limit)
+        ]
+
+    def get_steady_state_bytes_per_frame(self):
+        """暖身之後平均每格淨增加的位元組數，沒有資料時回傳 0"""
+        steady = self.frame_bytes[self.warmup_frames :]
+        if not steady:
+            return 0.0
+        return sum(steady) / len(steady)
+
+    def check_steady_state(self, max_bytes_per_frame, max_gc_collections=None):
+        """
+        檢查暖身之後的每格配置有沒有超出門檻\n
+        max_bytes_per_frame: 平均每格最多可以淨增加幾個位元組\n
+        max_gc_collections: 整段期間最多可以觸發幾次垃圾回收，若為 None 則不檢查\n
+        return: 超出門檻的說明清單（都在門檻內就是空清單）\n
+        """
+        problems = []
+        growth = self.get_steady_state_bytes_per_frame()
+        if growth > max_bytes_per_frame:
+            problems.append(
+                f"穩定狀態平均每格增加 {growth:.1f} bytes，超過門檻 {max_bytes_per_frame} bytes"
+            )
+        total_collections = sum(self.gc_collections)
+        if max_gc_collections is not None and total_collections > max_gc_collections:
+            problems.append(
+                f"垃圾回收 {total_collections} 次，超過門檻 {max_gc_collections} 次"
+            )
+        return problems
+
+    def assert_steady_state(self, max_bytes_per_frame, max_gc_collections=None):
+        """
+        測試用：穩定狀態的配置超出門檻就丟出 AssertionError\n
+        max_bytes_per_frame: 平均每格最多可以淨增加幾個位元組\n
+        max_gc_collections: 整段期間最多可以觸發幾次垃圾回收\n
+        """
+        problems = self.check_steady_state(max_bytes_per_frame, max_gc_collections)
+        if problems:
+            raise AssertionError("記憶體配置超出門檻：\n" + "\n".join(problems))
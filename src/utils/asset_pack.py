@@ -0,0 +1,293 @@
+"""
+資源包模組
+把圖片、音效和字型打包成一個檔案（由 tools/pack_assets.py 離線產生），
+遊戲中記憶體映射整個檔案，每個資源第一次用到時才解開，之後直接用快取
+"""
+
+import io
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+# 標頭：識別碼、格式版本、標頭長度、資源數、索引長度、資料區開始位置，補到 32 bytes
+PACK_MAGIC = b"BAPK"
+PACK_VERSION = 1
+_HEADER = struct.Struct("<4sHHIII12x")
+HEADER_SIZE = _HEADER.size
+
+# 每個資源的資料都從這個倍數的位置開始
+DATA_ALIGNMENT = 64
+
+# 圖片的像素格式：跟 convert_alpha() 產生的格式一樣（32 位元 ARGB，小端序存成 B、G、R、A），
+# 載入時直接把映射的資料當成 Surface，不用解碼也不用轉換
+IMAGE_PIXEL_FORMAT = "BGRA"
+
+# 解開後超過這個大小的圖片（例如整張背景）保留原本的 PNG 等壓縮格式，第一次用到時才解碼，
+# 資源包才不會因為大圖變得很大；小圖案的解碼成本主要是一個一個開檔、解碼的固定開銷，所以直接存像素
+RAW_IMAGE_MAX_BYTES = 256 * 1024
+
+# 保留壓縮格式的圖片在索引裡的格式名稱
+ENCODED_IMAGE_FORMAT = "encoded"
+
+# assets 底下的資料夾 -> 資源種類，以及每種資源接受的副檔名
+ASSET_FOLDERS = {"images": "image", "sounds": "sound", "fonts": "font"}
+ASSET_EXTENSIONS = {
+    "image": (".png", ".jpg", ".jpeg", ".bmp", ".tga", ".gif"),
+    "sound": (".wav", ".ogg", ".mp3", ".flac"),
+    "font": (".ttf", ".otf", ".ttc"),
+}
+
+
+def convert_image(path, raw_max_bytes=RAW_IMAGE_MAX_BYTES):
+    """
+    讀進一張圖片，轉成資源包的像素格式\n
+    path: 圖片檔路徑\n
+    raw_max_bytes: 解開後超過這個大小就保留原本的檔案內容\n
+    return: (資料, 索引資訊 dict)\n
+    """
+    surface = pygame.image.load(path)
+    width, height = surface.get_size()
+    pixels = pygame.image.tobytes(surface, IMAGE_PIXEL_FORMAT)
+    # 每個像素的透明度都是 255 的圖，載入後可以轉成不透明的 Surface，貼的時候不用混色
+    is_opaque = width * height == 0 or min(pixels[3::4]) == 255
+    info = {"width": width, "height": height, "format": IMAGE_PIXEL_FORMAT, "opaque": is_opaque}
+    if len(pixels) > raw_max_bytes:
+        with open(path, "rb") as file:
+            data = file.read()
+        info["format"] = ENCODED_IMAGE_FORMAT
+        info["extension"] = os.path.splitext(path)[1].lower()
+        return data, info
+    return pixels, info
+
+
+def subset_font(data, text):
+    """
+    把字型縮減到只剩指定的字（需要 fontTools，只有打包工具會用到，所以用到時才 import）\n
+    data: 字型檔內容（.ttc 只取第一個字型）\n
+    text: 要保留的字\n
+    return: 縮減後的字型檔內容；沒有安裝 fontTools 時拋出 ImportError\n
+    """
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(io.BytesIO(data), fontNumber=0)
+    subsetter = subset.Subsetter(subset.Options())
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    output = io.BytesIO()
+    font.save(output)
+    return output.getvalue()
+
+
+def write_asset_pack(path, assets):
+    """
+    把資源寫成資源包\n
+    path: 輸出檔案路徑，資料夾不存在會自動建立\n
+    assets: [(名稱, 種類, 資料, 索引資訊 dict), ...]，名稱例如 'images/ball'\n
+    return: 資源包的大小（bytes）\n
+    """
+    # 先排好每個資源在資料區的位置，索引才寫得出來
+    index = {}
+    offset = 0
+    for name, kind, data, info in assets:
+        if name in index:
+            raise ValueError(f"資源名稱重複：{name}")
+        index[name] = dict(info, kind=kind, offset=offset, size=len(data))
+        offset += -(-len(data) // DATA_ALIGNMENT) * DATA_ALIGNMENT
+    index_bytes = json.dumps(index, ensure_ascii=False).encode("utf-8")
+    data_offset = -(-(HEADER_SIZE + len(index_bytes)) // DATA_ALIGNMENT) * DATA_ALIGNMENT
+
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(
+            _HEADER.pack(
+                PACK_MAGIC, PACK_VERSION, HEADER_SIZE, len(index), len(index_bytes), data_offset
+            )
+        )
+        file.write(index_bytes)
+        for name, kind, data, info in assets:
+            file.seek(data_offset + index[name]["offset"])
+            file.write(data)
+        file.truncate(data_offset + offset)
+    return data_offset + offset
+
+
+class _FontFile:
+    """
+    字型用的唯讀檔案物件，直接讀映射的記憶體，不複製整個字型檔\n
+    pygame 只在要畫新的字時才讀字型檔，同一個字型的各種大小共用一個；\n
+    pygame 丟掉 Font 時會呼叫 close()，這裡不做事，其他大小的 Font 才讀得下去\n
+    """
+
+    def __init__(self, view):
+        self._view = view
+        self._position = 0
+
+    def read(self, size=-1):
+        start = self._position
+        end = len(self._view) if size is None or size < 0 else start + size
+        end = min(max(start, end), len(self._view))
+        self._position = end
+        return bytes(self._view[start:end])
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        """Font 被丟掉時 pygame 會呼叫，共用的檔案物件不能在這裡關掉"""
+
+
+class AssetPack:
+    """
+    開啟的資源包\n
+    \n
+    整個檔案記憶體映射，開啟時只讀標頭和索引；每個資源第一次用到時才解開：\n
+    - 圖片直接把映射的資料當成 Surface（pygame.image.frombuffer），不用解碼；\n
+      保留壓縮格式的大圖第一次用到時才解碼\n
+    - 字型直接讀映射的資料，不複製整個字型檔；同一個字型的各種大小共用一個檔案物件，\n
+      同樣的名稱和大小只建立一次\n
+    - 音效第一次用到時才交給 pygame.mixer 解碼\n
+    映射使用 copy-on-write 模式，修改載入的圖片不會寫回檔案\n
+    """
+
+    def __init__(self, path, index, data_offset, buffer):
+        self.path = path
+        self.index = index
+        self._data_offset = data_offset
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._images = {}
+        self._fonts = {}
+        self._font_files = {}  # 字型名稱 -> _FontFile，各種大小共用
+        self._sounds = {}
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def names(self, kind=None):
+        """
+        列出資源名稱\n
+        kind: 只列出這一種資源（'image'、'sound'、'font'），None 表示全部\n
+        """
+        return [name for name, entry in self.index.items() if kind is None or entry["kind"] == kind]
+
+    def get_bytes(self, name):
+        """
+        取得資源的原始資料（不複製，直接指到映射的記憶體）\n
+        return: memoryview\n
+        """
+        entry = self._get_entry(name)
+        start = self._data_offset + entry["offset"]
+        return self._view[start : start + entry["size"]]
+
+    def load_image(self, name):
+        """
+        載入圖片（第一次用到時才建立 Surface，之後回傳同一個物件）\n
+        已經開啟視窗時，不透明的圖片會轉成視窗的格式（只是複製，像素格式本來就一樣）\n
+        """
+        image = self._images.get(name)
+        if image is None:
+            entry = self._get_entry(name, "image")
+            is_display_ready = pygame.display.get_surface() is not None
+            if entry["format"] == ENCODED_IMAGE_FORMAT:
+                image = pygame.image.load(io.BytesIO(self.get_bytes(name)), entry["extension"])
+                if is_display_ready:
+                    image = image.convert() if entry["opaque"] else image.convert_alpha()
+            else:
+                image = pygame.image.frombuffer(
+                    self.get_bytes(name), (entry["width"], entry["height"]), entry["format"]
+                )
+                if entry["opaque"] and is_display_ready:
+                    image = image.convert()
+            self._images[name] = image
+        return image
+
+    def load_font(self, name, size):
+        """載入字型（同樣的名稱和大小只建立一次）"""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font_file = self._font_files.get(name)
+            if font_file is None:
+                self._get_entry(name, "font")
+                font_file = _FontFile(self.get_bytes(name))
+                self._font_files[name] = font_file
+            font = pygame.font.Font(font_file, size)
+            self._fonts[key] = font
+        return font
+
+    def load_sound(self, name):
+        """載入音效（第一次用到時才解碼，需要先初始化 pygame.mixer）"""
+        sound = self._sounds.get(name)
+        if sound is None:
+            self._get_entry(name, "sound")
+            sound = pygame.mixer.Sound(file=io.BytesIO(self.get_bytes(name)))
+            self._sounds[name] = sound
+        return sound
+
+    def close(self):
+        """
+        關閉資源包\n
+        還有圖片指到映射的記憶體時不能馬上關，等那些圖片都不用了才會釋放\n
+        """
+        self._images.clear()
+        self._fonts.clear()
+        self._font_files.clear()
+        self._sounds.clear()
+        self._view.release()
+        try:
+            self._buffer.close()
+        except BufferError:
+            pass
+
+    def _get_entry(self, name, kind=None):
+        """取得資源的索引資訊，名稱不存在或種類不對時拋出 KeyError"""
+        entry = self.index.get(name)
+        if entry is None:
+            raise KeyError(f"資源包 {self.path} 裡沒有 {name}")
+        if kind is not None and entry["kind"] != kind:
+            raise KeyError(f"{name} 是 {entry['kind']}，不是 {kind}")
+        return entry
+
+
+def open_asset_pack(path):
+    """
+    開啟資源包（記憶體映射，只讀標頭和索引，資源等用到時才從硬碟讀進來）\n
+    path: 資源包路徑\n
+    return: AssetPack 物件\n
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"{path} 太短，不是資源包")
+
+        magic, version, header_size, count, index_size, data_offset = _HEADER.unpack(header)
+        if magic != PACK_MAGIC:
+            raise ValueError(f"{path} 不是資源包")
+        if version != PACK_VERSION:
+            raise ValueError(f"{path} 的格式版本 {version} 不支援")
+
+        file.seek(header_size)
+        index = json.loads(file.read(index_size).decode("utf-8"))
+        if len(index) != count:
+            raise ValueError(f"{path} 的索引不完整")
+        end = max(
+            (data_offset + entry["offset"] + entry["size"] for entry in index.values()), default=0
+        )
+        if os.path.getsize(path) < end:
+            raise ValueError(f"{path} 的資料不完整")
+
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    return AssetPack(path, index, data_offset, buffer)
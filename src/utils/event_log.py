@@ -0,0 +1,249 @@
+"""
+遊戲事件紀錄工具模組
+把每一次擊中磚塊、底板接球、底板縮小、掉球和過關記錄成欄位式陣列，
+壓縮成區塊在背景寫檔，分析時直接讀回 NumPy 陣列
+"""
+
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+# 事件種類
+EVENT_BRICK_HIT = 1  # 球直接打到磚塊（row, col, is_special, count=連帶打掉的總數）
+EVENT_PADDLE_HIT = 2  # 底板接到球（value=反彈實際用的撞擊位置，-1 到 1）
+EVENT_PADDLE_SHRINK = 3  # 底板縮小（count=縮了幾次，value=縮完的寬度）
+EVENT_BALL_LOST = 4  # 球掉出畫面（count=掉了幾顆）
+EVENT_WIN = 5  # 過關（value=分數）
+
+EVENT_NAMES = {
+    EVENT_BRICK_HIT: "brick_hit",
+    EVENT_PADDLE_HIT: "paddle_hit",
+    EVENT_PADDLE_SHRINK: "paddle_shrink",
+    EVENT_BALL_LOST: "ball_lost",
+    EVENT_WIN: "win",
+}
+# 事件名稱 -> 事件種類（遊戲引擎用名稱記事件，沒開事件紀錄時不用載入這個模組）
+EVENT_CODES = {name: code for code, name in EVENT_NAMES.items()}
+
+# 每個欄位的名稱和型別，寫檔時照這個順序把欄位一個接一個排好
+EVENT_COLUMNS = (
+    ("event", np.uint8),
+    ("frame", np.uint32),
+    ("time_ms", np.uint32),
+    ("row", np.int32),
+    ("col", np.int32),
+    ("is_special", np.bool_),
+    ("count", np.uint32),
+    ("value", np.float32),
+)
+
+# 區塊標頭：識別碼、格式版本、遊戲場次編號、筆數、壓縮後長度
+CHUNK_MAGIC = b"BEVT"
+CHUNK_VERSION = 1
+_CHUNK_HEADER = struct.Struct("<4sHQII")
+
+
+def _new_columns(size):
+    """配置一組空的欄位陣列"""
+    return {name: np.zeros(size, dtype=dtype) for name, dtype in EVENT_COLUMNS}
+
+
+class EventRecorder:
+    """
+    遊戲事件紀錄器\n
+    \n
+    事件先寫進預先配置好的欄位陣列（每個欄位一個固定型別的陣列），\n
+    滿 chunk_rows 筆就把整組陣列交給背景執行緒，由背景執行緒壓縮後接在檔案後面，\n
+    主迴圈不會等壓縮和硬碟。佇列滿了就丟掉那一塊並計數，不讓遊戲等待\n
+    \n
+    檔案格式：很多個區塊接在一起，每個區塊是\n
+    [標頭][zlib 壓縮的欄位資料（依 EVENT_COLUMNS 順序，每個欄位 rows 筆）]\n
+    同一個檔案可以放很多場遊戲，用 load_events 讀回來\n
+    """
+
+    def __init__(self, path, chunk_rows=4096, compression_level=6, queue_size=16):
+        """
+        初始化事件紀錄器\n
+        path: 輸出檔案路徑（接在既有檔案後面）\n
+        chunk_rows: 每個區塊幾筆事件\n
+        compression_level: zlib 壓縮等級（1 最快，9 最小）\n
+        queue_size: 等待寫入的區塊最多幾個\n
+        """
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.compression_level = compression_level
+        self.session_id = int.from_bytes(os.urandom(8), "little")
+        self.dropped_chunks = 0
+
+        self._columns = _new_columns(chunk_rows)
+        self._size = 0
+        self._start_time = time.perf_counter()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer_thread = None
+
+    def start(self):
+        """開始背景寫檔執行緒"""
+        if self._writer_thread is not None:
+            return
+        self._start_time = time.perf_counter()
+        self._writer_thread = threading.Thread(
+            target=self._write_loop, name="event-log-writer", daemon=True
+        )
+        self._writer_thread.start()
+
+    def close(self, timeout=2.0):
+        """把還沒寫出的事件送出，並等背景執行緒寫完"""
+        if self._writer_thread is None:
+            return
+        self.flush()
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._writer_thread.join(timeout)
+        self._writer_thread = None
+
+    def record(self, event, frame, row=-1, col=-1, is_special=False, count=1, value=0.0):
+        """
+        記錄一筆事件\n
+        event: 事件種類（EVENT_* 常數）\n
+        frame: 第幾格\n
+        row, col: 相關的磚塊位置，沒有的話是 -1\n
+        is_special: 是否為特殊磚塊\n
+        count: 數量（打掉幾塊、縮了幾次、掉了幾顆）\n
+        value: 附帶的數值（撞擊位置、底板寬度、分數）\n
+        """
+        index = self._size
+        columns = self._columns
+        columns["event"][index] = event
+        columns["frame"][index] = frame
+        columns["time_ms"][index] = (time.perf_counter() - self._start_time) * 1000
+        columns["row"][index] = row
+        columns["col"][index] = col
+        columns["is_special"][index] = is_special
+        columns["count"][index] = count
+        columns["value"][index] = value
+        self._size += 1
+        if self._size == self.chunk_rows:
+            self.flush()
+
+    def record_many(self, event, frame, rows=-1, cols=-1, is_special=False, count=1, value=0.0):
+        """
+        一次記錄很多筆同種類的事件（例如這一格被撞到的所有磚塊）\n
+        rows, cols, is_special, count, value: 陣列或單一數值（單一數值會套用到每一筆）\n
+        """
+        values = {
+            "row": rows,
+            "col": cols,
+            "is_special": is_special,
+            "count": count,
+            "value": value,
+        }
+        total = max(np.size(item) for item in values.values())
+        time_ms = (time.perf_counter() - self._start_time) * 1000
+
+        # 超過區塊剩下的空間就分好幾次寫
+        written = 0
+        while written < total:
+            index = self._size
+            amount = min(total - written, self.chunk_rows - index)
+            end = index + amount
+            columns = self._columns
+            columns["event"][index:end] = event
+            columns["frame"][index:end] = frame
+            columns["time_ms"][index:end] = time_ms
+            for name, item in values.items():
+                columns[name][index:end] = (
+                    item[written : written + amount] if np.ndim(item) else item
+                )
+            self._size = end
+            written += amount
+            if self._size == self.chunk_rows:
+                self.flush()
+
+    def flush(self):
+        """把目前累積的事件交給背景執行緒，換一組新的陣列繼續記錄"""
+        if self._size == 0:
+            return
+        chunk = {name: values[: self._size] for name, values in self._columns.items()}
+        try:
+            self._queue.put_nowait(chunk)
+        except queue.Full:
+            self.dropped_chunks += 1
+        self._columns = _new_columns(self.chunk_rows)
+        self._size = 0
+
+    def _write_loop(self):
+        """背景執行緒：從佇列拿區塊壓縮後寫檔，拿到 None 就結束"""
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            try:
+                self._append_chunk(chunk)
+            except OSError as e:
+                # 寫不進去就印出訊息，不影響遊戲
+                print(f"寫入事件紀錄失敗：{e}")
+
+    def _append_chunk(self, chunk):
+        """壓縮一個區塊並接在檔案後面"""
+        rows = len(chunk["event"])
+        raw = b"".join(chunk[name].tobytes() for name, _ in EVENT_COLUMNS)
+        payload = zlib.compress(raw, self.compression_level)
+        header = _CHUNK_HEADER.pack(
+            CHUNK_MAGIC, CHUNK_VERSION, self.session_id, rows, len(payload)
+        )
+
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        with open(self.path, "ab") as file:
+            file.write(header + payload)
+
+
+def load_events(paths):
+    """
+    讀回事件紀錄檔\n
+    paths: 一個檔案路徑，或很多個檔案路徑的清單\n
+    return: {欄位名稱: ndarray}，另外多一個 'session_id' 欄位（uint64）標明每筆屬於哪一場\n
+    \n
+    檔案最後一個區塊如果只寫了一半（例如遊戲當掉），會直接略過\n
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    parts = {name: [] for name, _ in EVENT_COLUMNS}
+    parts["session_id"] = []
+    for path in paths:
+        with open(path, "rb") as file:
+            data = file.read()
+
+        offset = 0
+        while offset + _CHUNK_HEADER.size <= len(data):
+            magic, version, session_id, rows, length = _CHUNK_HEADER.unpack_from(data, offset)
+            if magic != CHUNK_MAGIC or version != CHUNK_VERSION:
+                raise ValueError(f"{path} 不是事件紀錄檔，或格式版本不支援")
+            offset += _CHUNK_HEADER.size
+            if offset + length > len(data):
+                break
+            raw = zlib.decompress(data[offset : offset + length])
+            offset += length
+
+            # 依照欄位順序把解壓縮後的資料切回一個一個陣列（不複製）
+            position = 0
+            for name, dtype in EVENT_COLUMNS:
+                size = rows * np.dtype(dtype).itemsize
+                parts[name].append(np.frombuffer(raw, dtype=dtype, count=rows, offset=position))
+                position += size
+            parts["session_id"].append(np.full(rows, session_id, dtype=np.uint64))
+
+    dtypes = dict(EVENT_COLUMNS)
+    dtypes["session_id"] = np.uint64
+    return {
+        name: np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtypes[name])
+        for name, chunks in parts.items()
+    }
@@ -3,8 +3,25 @@
 提供載入繁體中文字型的功能
 """
 
+import functools
+
 import pygame
 
+# 預設的繁體中文字體候選清單
+DEFAULT_FONT_CANDIDATES = (
+    "Microsoft JhengHei",
+    "Microsoft JhengHei UI",
+    "Noto Sans CJK TC",
+    "PingFang TC",
+    "Arial Unicode MS",
+)
+
+# 已經建立過的字型：(大小, 候選清單) -> 字型物件
+_font_cache = {}
+
+# 資源包裡的字型：(AssetPack, 資源名稱)，設定之後預設的候選清單改用它，不用搜尋系統字型
+_packed_font = None
+
 
 def load_chinese_font(size, font_candidates=None):
     """
@@ -12,24 +29,65 @@ def load_chinese_font(size, font_candidates=None):
     size: 字體大小\n
     font_candidates: 字體候選清單，若為 None 則使用預設清單\n
     return: 字體物件\n
+    \n
+    同樣的大小和候選清單只會建立一次字型，之後直接回傳同一個物件，\n
+    所以可以在每格繪製時呼叫，不用擔心重複搜尋系統字型\n
+    """
+    if _packed_font is not None and not font_candidates:
+        pack, name = _packed_font
+        return pack.load_font(name, size)
+
+    candidates = tuple(font_candidates) if font_candidates else DEFAULT_FONT_CANDIDATES
+    key = (size, candidates)
+    font = _font_cache.get(key)
+    if font is None:
+        font_path = _find_font_path(candidates)
+        if font_path:
+            font = pygame.font.Font(font_path, size)
+        else:
+            # 若以上都找不到，回退到系統預設字體
+            font = pygame.font.SysFont(None, size)
+        _font_cache[key] = font
+    return font
+
+
+def use_packed_font(pack, name):
+    """
+    之後載入預設字型時改用資源包裡的字型（資源包會記住建立過的字型）\n
+    pack: AssetPack 物件，None 表示恢復使用系統字型\n
+    name: 字型在資源包裡的名稱，例如 'fonts/ui'\n
+    """
+    global _packed_font
+    _packed_font = (pack, name) if pack is not None else None
+
+
+def find_chinese_font_path(font_candidates=None):
+    """
+    尋找支援繁體中文的系統字型檔（打包資源時用）\n
+    font_candidates: 字體候選清單，若為 None 則使用預設清單\n
+    return: 字型檔路徑，都找不到時回傳 None\n
     """
-    if font_candidates is None:
-        font_candidates = [
-            "Microsoft JhengHei",
-            "Microsoft JhengHei UI",
-            "Noto Sans CJK TC",
-            "PingFang TC",
-            "Arial Unicode MS",
-        ]
-
-    # 依序嘗試載入字體
-    for font_name in font_candidates:
+    candidates = tuple(font_candidates) if font_candidates else DEFAULT_FONT_CANDIDATES
+    return _find_font_path(candidates)
+
+
+def clear_font_cache():
+    """清除已建立的字型（pygame.font 重新初始化之後，舊的字型物件就不能用了）"""
+    _font_cache.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _find_font_path(candidates):
+    """
+    依序尋找候選字體的檔案路徑（第一次搜尋系統字型很慢，結果會記住）\n
+    candidates: 字體名稱 tuple\n
+    return: 找到的字體檔路徑，都找不到時回傳 None\n
+    """
+    for font_name in candidates:
         try:
             font_path = pygame.font.match_font(font_name)
         except Exception:
             font_path = None
         if font_path:
-            return pygame.font.Font(font_path, size)
-
-    # 若以上都找不到，回退到系統預設字體
-    return pygame.font.SysFont(None, size)
+            return font_path
+    return None
@@ -0,0 +1,190 @@
+"""
+畫面節奏控制模組
+控制每一格之間等待的方式，並統計每格間隔的抖動和沒趕上的格數
+"""
+
+import time
+
+from .frame_timer import RollingHistogram
+
+# 支援的等待方式
+PACING_STRATEGIES = ("sleep", "hybrid", "busy", "vsync")
+
+# 自動選擇時由便宜（CPU 用得少）到貴依序嘗試
+# （tick_busy_loop 只有毫秒精度，抖動反而比 hybrid 大，所以不在自動選擇的清單裡；
+#  hybrid 還是不夠穩時改成加長空轉的時間）
+AUTO_PACING_LADDER = ("sleep", "hybrid")
+
+
+class FramePacer:
+    """
+    畫面節奏控制類別\n
+    \n
+    等待方式：\n
+    - sleep：clock.tick，交給作業系統睡眠，最省 CPU，但間隔受睡眠精度影響\n
+    - hybrid：先睡到目標時間前 spin_ms 毫秒，剩下的用空轉等，兼顧 CPU 和精準度\n
+    - busy：clock.tick_busy_loop，整段空轉，最精準也最耗 CPU\n
+    - vsync：畫面更新時等顯示器的垂直同步（視窗要用 vsync 開啟），\n
+      這裡只在間隔明顯太短時補等（顯示器更新率比 FPS 高，或驅動沒有真的同步）\n
+    \n
+    每一格記錄跟目標間隔差多少（抖動）、超過目標間隔 missed_tolerance 倍的格數（沒趕上），\n
+    以及等待時用掉的 CPU 時間。auto 開啟時從最便宜的 sleep 開始，\n
+    每 evaluate_frames 格檢查一次，抖動 p99 超過 jitter_target_ms 就換成 hybrid，\n
+    hybrid 還是超過就把空轉的時間加倍（最多整格都空轉）\n
+    """
+
+    def __init__(
+        self,
+        clock,
+        fps,
+        strategy="sleep",
+        window=300,
+        spin_ms=2.0,
+        missed_tolerance=1.5,
+        auto=False,
+        jitter_target_ms=1.0,
+        evaluate_frames=120,
+    ):
+        """
+        初始化畫面節奏控制\n
+        clock: pygame.time.Clock 物件\n
+        fps: 目標 FPS\n
+        strategy: 等待方式，'sleep'、'hybrid'、'busy' 或 'vsync'\n
+        window: 統計記住最近幾格\n
+        spin_ms: hybrid 方式最後空轉的毫秒數\n
+        missed_tolerance: 間隔超過目標的幾倍算沒趕上\n
+        auto: 是否依抖動自動換等待方式（從 sleep 開始）\n
+        jitter_target_ms: 自動選擇時可以接受的抖動 p99（毫秒）\n
+        evaluate_frames: 自動選擇時每隔幾格檢查一次\n
+        """
+        if strategy not in PACING_STRATEGIES:
+            raise ValueError(f"不支援的畫面節奏方式：{strategy}")
+
+        self.clock = clock
+        self.fps = fps
+        self.period = 1 / fps
+        self.spin = spin_ms / 1000
+        self.missed_tolerance = missed_tolerance
+        self.auto = auto
+        self.jitter_target_ms = jitter_target_ms
+        self.evaluate_frames = evaluate_frames
+        self.strategy = AUTO_PACING_LADDER[0] if auto else strategy
+
+        # 抖動（微秒）只記有趕上的格，沒趕上的格另外計數
+        self.jitter = RollingHistogram(window=window)
+        self._evaluate_jitter = RollingHistogram(window=evaluate_frames)
+        self.frames = 0
+        self.missed_frames = 0
+        self.wait_cpu = 0.0  # 等待時用掉的 CPU 秒數
+        self.last_interval_ms = 0.0
+        self._last = time.perf_counter()
+
+    def set_strategy(self, strategy):
+        """
+        換一種等待方式，統計從頭開始\n
+        strategy: 等待方式，'sleep'、'hybrid'、'busy' 或 'vsync'\n
+        """
+        if strategy not in PACING_STRATEGIES:
+            raise ValueError(f"不支援的畫面節奏方式：{strategy}")
+        self.strategy = strategy
+        self.reset_stats()
+
+    def reset_stats(self):
+        """清除統計資料"""
+        self.jitter.clear()
+        self._evaluate_jitter.clear()
+        self.frames = 0
+        self.missed_frames = 0
+        self.wait_cpu = 0.0
+
+    def wait(self):
+        """
+        等到下一格該開始的時間（每格呼叫一次）\n
+        return: 跟上一格開始時間的間隔（毫秒）\n
+        """
+        cpu_start = time.process_time()
+        if self.strategy == "sleep":
+            self.clock.tick(self.fps)
+        elif self.strategy == "busy":
+            self.clock.tick_busy_loop(self.fps)
+        else:
+            if self.strategy == "hybrid":
+                target = self._last + self.period
+            else:
+                # vsync：畫面更新時已經等過垂直同步，只有間隔明顯太短才補等
+                target = self._last + self.period * 0.9
+            self._sleep_then_spin(target)
+            self.clock.tick()
+        self.wait_cpu += time.process_time() - cpu_start
+
+        now = time.perf_counter()
+        interval = now - self._last
+        self._last = now
+        self._record(interval)
+        return self.last_interval_ms
+
+    def skip(self):
+        """
+        不等待直接開始下一格（例如閒置時已經自己等過事件），\n
+        這段時間不算進間隔統計\n
+        """
+        self.clock.tick()
+        self._last = time.perf_counter()
+
+    def get_time(self):
+        """取得上一格的間隔（毫秒），用法跟 clock.get_time() 一樣"""
+        return self.last_interval_ms
+
+    def get_report(self):
+        """
+        取得統計結果\n
+        return: dict，包含等待方式、抖動 p50／p99（毫秒）、沒趕上的格數和每格等待的 CPU 時間\n
+        """
+        frames = max(1, self.frames)
+        return {
+            "strategy": self.strategy,
+            "spin_ms": round(self.spin * 1000, 3),
+            "jitter_p50_ms": round(self.jitter.percentile(0.5) / 1000, 3),
+            "jitter_p99_ms": round(self.jitter.percentile(0.99) / 1000, 3),
+            "missed_frames": self.missed_frames,
+            "frames": self.frames,
+            "wait_cpu_ms_per_frame": round(self.wait_cpu * 1000 / frames, 3),
+        }
+
+    def _sleep_then_spin(self, target):
+        """先睡到目標時間前 spin 秒，剩下的時間空轉等待"""
+        remaining = target - time.perf_counter()
+        if remaining > self.spin:
+            time.sleep(remaining - self.spin)
+        while time.perf_counter() < target:
+            pass
+
+    def _record(self, interval):
+        """記錄一格的間隔，自動選擇時定期檢查要不要換等待方式"""
+        self.frames += 1
+        self.last_interval_ms = interval * 1000
+        if interval > self.period * self.missed_tolerance:
+            self.missed_frames += 1
+        else:
+            jitter_us = abs(interval - self.period) * 1_000_000
+            self.jitter.add(jitter_us)
+            self._evaluate_jitter.add(jitter_us)
+
+        if self.auto and self.frames % self.evaluate_frames == 0:
+            self._evaluate()
+
+    def _evaluate(self):
+        """抖動 p99 超過目標時換成比較精準（也比較耗 CPU）的等待方式，只往上換，不會再換回來"""
+        if self.strategy not in AUTO_PACING_LADDER:
+            return
+        if self._evaluate_jitter.size < self.evaluate_frames // 2:
+            return
+        jitter_p99_ms = self._evaluate_jitter.percentile(0.99) / 1000
+        if jitter_p99_ms <= self.jitter_target_ms:
+            return
+        position = AUTO_PACING_LADDER.index(self.strategy)
+        if position + 1 < len(AUTO_PACING_LADDER):
+            self.set_strategy(AUTO_PACING_LADDER[position + 1])
+        elif self.spin < self.period:
+            self.spin = min(self.period, self.spin * 2)
+            self.reset_stats()
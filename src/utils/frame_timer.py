@@ -0,0 +1,248 @@
+"""
+每格分段計時工具模組
+量測遊戲主迴圈每一段（事件、更新、繪製、等待）花了多少時間
+"""
+
+import bisect
+import time
+
+from .font_loader import load_chinese_font
+
+# 計時桶的邊界（微秒）：從 1 微秒到 1 秒，每一格大約放大 10%
+HISTOGRAM_EDGES_US = [round(1.1**i, 3) for i in range(0, 146)]
+
+
+class RollingHistogram:
+    """
+    滾動直方圖 - 只記住最近 window 筆資料的分布\n
+    \n
+    每筆時間放進對應的計時桶，新資料進來時把最舊的那筆從桶裡拿掉，\n
+    查百分位數時只要從小到大累加桶子的數量，不用每次重新排序\n
+    """
+
+    def __init__(self, window=300, edges=None):
+        """
+        初始化滾動直方圖\n
+        window: 要記住最近幾筆資料\n
+        edges: 計時桶邊界（由小到大），若為 None 則使用預設邊界\n
+        """
+        self.window = window
+        self.edges = edges if edges else HISTOGRAM_EDGES_US
+        self.counts = [0] * (len(self.edges) + 1)
+        self._ring = [0] * window  # 每筆資料落在哪個桶
+        self._position = 0
+        self.size = 0
+        self.last_value = 0.0
+
+    def add(self, value_us):
+        """
+        加入一筆時間\n
+        value_us: 花費時間（微秒）\n
+        """
+        bucket = bisect.bisect_left(self.edges, value_us)
+
+        # 已經記滿了，就把最舊的那筆從桶子裡拿掉
+        if self.size == self.window:
+            self.counts[self._ring[self._position]] -= 1
+        else:
+            self.size += 1
+
+        self._ring[self._position] = bucket
+        self.counts[bucket] += 1
+        self._position = (self._position + 1) % self.window
+        self.last_value = value_us
+
+    def percentile(self, fraction):
+        """
+        取得最近資料的百分位數\n
+        fraction: 0 到 1 之間，例如 0.99 代表 p99\n
+        return: 該百分位數所在計時桶的上緣（微秒），沒有資料時回傳 0\n
+        """
+        if self.size == 0:
+            return 0.0
+        target = max(1, int(fraction * self.size + 0.5))
+        running = 0
+        for bucket, count in enumerate(self.counts):
+            running += count
+            if running >= target:
+                return self.edges[min(bucket, len(self.edges) - 1)]
+        return self.edges[-1]
+
+    def clear(self):
+        """清除所有資料"""
+        self.counts = [0] * (len(self.edges) + 1)
+        self._position = 0
+        self.size = 0
+        self.last_value = 0.0
+
+
+class FrameTimer:
+    """
+    每格分段計時器\n
+    \n
+    使用方式：\n
+    start = timer.start()\n
+    ...要量的程式...\n
+    start = timer.lap("update.movement", start)  # 記錄這一段並開始下一段\n
+    \n
+    關閉時 start() 和 lap() 都直接回傳，不會讀取時鐘，所以幾乎不花時間\n
+    """
+
+    def __init__(self, window=300, enabled=False):
+        """
+        初始化計時器\n
+        window: 每一段保留最近幾格的資料\n
+        enabled: 是否一開始就開啟計時\n
+        """
+        self.window = window
+        self.is_enabled = enabled
+        self.histograms = {}
+        self._frame_start = 0
+
+    def set_enabled(self, enabled):
+        """開啟或關閉計時，關閉時會清掉舊資料，下次開啟重新累積"""
+        if not enabled:
+            self.histograms.clear()
+        self.is_enabled = enabled
+
+    def start(self):
+        """取得目前時間（奈秒），計時關閉時回傳 0"""
+        if not self.is_enabled:
+            return 0
+        return time.perf_counter_ns()
+
+    def lap(self, phase, start_ns):
+        """
+        記錄一段的耗時，並回傳現在時間當作下一段的開始\n
+        phase: 這一段的名稱，例如 'update.collisions'\n
+        start_ns: 這一段開始的時間（start() 或上一次 lap() 的回傳值）\n
+        return: 現在時間（奈秒），計時關閉時回傳 0\n
+        """
+        if not self.is_enabled:
+            return 0
+        now = time.perf_counter_ns()
+        self._record(phase, (now - start_ns) / 1000)
+        return now
+
+    def begin_frame(self):
+        """標記一格的開始"""
+        if self.is_enabled:
+            self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        """標記一格的結束，記錄整格的耗時到 'frame'"""
+        if self.is_enabled and self._frame_start:
+            self._record("frame", (time.perf_counter_ns() - self._frame_start) / 1000)
+
+    def _record(self, phase, value_us):
+        """把一筆時間放進對應的直方圖"""
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            histogram = RollingHistogram(self.window)
+            self.histograms[phase] = histogram
+        histogram.add(value_us)
+
+    def get_percentile(self, phase, fraction):
+        """
+        取得某一段最近的百分位數\n
+        phase: 段落名稱\n
+        fraction: 0 到 1 之間\n
+        return: 毫秒，沒有資料時回傳 0\n
+        """
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            return 0.0
+        return histogram.percentile(fraction) / 1000
+
+    def get_report(self):
+        """
+        取得所有段落的統計\n
+        return: {段落名稱: {'p50_ms', 'p99_ms', 'last_ms', 'samples'}}\n
+        """
+        report = {}
+        for phase, histogram in self.histograms.items():
+            report[phase] = {
+                "p50_ms": histogram.percentile(0.5) / 1000,
+                "p99_ms": histogram.percentile(0.99) / 1000,
+                "last_ms": histogram.last_value / 1000,
+                "samples": histogram.size,
+            }
+        return report
+
+    def check_budgets(self, budgets_ms, fraction=0.99):
+        """
+        檢查各段落有沒有超出預算\n
+        budgets_ms: {段落名稱: 預算毫秒數}\n
+        fraction: 用哪個百分位數比較，預設 p99\n
+        return: 超出預算的說明清單（都在預算內就是空清單）\n
+        """
+        problems = []
+        for phase, budget in budgets_ms.items():
+            value = self.get_percentile(phase, fraction)
+            if value > budget:
+                problems.append(
+                    f"{phase}: p{fraction * 100:g} = {value:.3f} ms 超過預算 {budget} ms"
+                )
+        return problems
+
+    def assert_within_budgets(self, budgets_ms, fraction=0.99):
+        """
+        測試用：任何段落超出預算就丟出 AssertionError\n
+        budgets_ms: {段落名稱: 預算毫秒數}\n
+        fraction: 用哪個百分位數比較，預設 p99\n
+        """
+        problems = self.check_budgets(budgets_ms, fraction)
+        if problems:
+            raise AssertionError("畫面時間超出預算：\n" + "\n".join(problems))
+
+
+class FrameTimingOverlay:
+    """
+    分段計時的畫面顯示 - 在左上角列出每一段的 p50、p99\n
+    文字不用每格重畫，每隔 refresh_interval 格才更新一次\n
+    """
+
+    def __init__(self, timer, font=None, color=(0, 255, 0), refresh_interval=15, font_size=14):
+        """
+        初始化顯示\n
+        timer: 分段計時器\n
+        font: 顯示用的字型，若為 None 則第一次顯示時才用 font_size 載入\n
+        color: 文字顏色\n
+        refresh_interval: 每隔幾格更新一次文字\n
+        font_size: 沒有指定字型時使用的字體大小\n
+        """
+        self.timer = timer
+        self.font = font
+        self.font_size = font_size
+        self.color = color
+        self.refresh_interval = refresh_interval
+        self._frames_until_refresh = 0
+        self._lines = []
+
+    def draw(self, renderer, position=(8, 8)):
+        """
+        把統計文字畫在畫面上\n
+        renderer: 繪圖器（src/utils/renderer.py）\n
+        """
+        # 時間到了才重新產生文字，平常直接貼上次做好的圖
+        if self._frames_until_refresh <= 0:
+            self._lines = self._render_lines(renderer)
+            self._frames_until_refresh = self.refresh_interval
+        self._frames_until_refresh -= 1
+
+        x, y = position
+        for surface in self._lines:
+            renderer.blit(surface, (x, y))
+            y += surface.get_height()
+
+    def _render_lines(self, renderer):
+        """把目前的統計轉成一行一行的文字圖"""
+        if self.font is None:
+            self.font = load_chinese_font(self.font_size)
+        lines = []
+        report = self.timer.get_report()
+        for phase in sorted(report):
+            stats = report[phase]
+            text = f"{phase:<18} p50 {stats['p50_ms']:6.2f}  p99 {stats['p99_ms']:6.2f} ms"
+            lines.append(renderer.render_text(self.font, text, self.color))
+        return lines
@@ -0,0 +1,138 @@
+"""
+輸入延遲工具模組
+從滑鼠移動事件追蹤指標位置，並量測輸入從進到事件佇列到顯示在畫面上的時間
+"""
+
+import random
+import threading
+import time
+
+import pygame
+
+from .frame_timer import RollingHistogram
+
+
+class PointerInput:
+    """
+    滑鼠指標輸入類別\n
+    \n
+    指標位置來自 MOUSEMOTION 事件，每個事件處理時都記下時間。\n
+    latch() 在繪製前把事件佇列裡新到的移動事件拿出來，讓畫面用最新的位置，\n
+    不用等到下一格處理事件時才看得到。\n
+    \n
+    帶有 probe_ns 屬性的移動事件是 InputLatencyProbe 送進來的量測事件，\n
+    等到畫面顯示後（mark_displayed）就記下從送出到顯示的時間\n
+    """
+
+    def __init__(self, window=300, scale=1.0):
+        """
+        初始化指標輸入\n
+        window: 延遲統計記住最近幾筆\n
+        scale: 滑鼠事件座標相對於邏輯座標的比例（繪圖器的 pointer_scale，除以它換回邏輯座標）\n
+        """
+        self.scale = scale
+        self.x = self._to_logical(pygame.mouse.get_pos()[0])
+        self.last_motion_ns = None  # 最後一次處理移動事件的時間
+        self.latency = RollingHistogram(window=window)
+        self._pending_probes = []
+
+    def handle_motion(self, event):
+        """
+        處理一個 MOUSEMOTION 事件\n
+        event: pygame 事件\n
+        """
+        self.last_motion_ns = time.perf_counter_ns()
+        probe_ns = getattr(event, "probe_ns", None)
+        if probe_ns is not None:
+            # 量測事件的位置本來就是目前的邏輯座標，不用換算
+            self._pending_probes.append(probe_ns)
+            return
+        self.x = self._to_logical(event.pos[0])
+
+    def _to_logical(self, x):
+        """把滑鼠事件的 x 座標換回邏輯座標"""
+        if self.scale == 1.0:
+            return x
+        return round(x / self.scale)
+
+    def latch(self):
+        """
+        把事件佇列裡新到的移動事件全部處理掉（其他事件留在佇列）\n
+        return: 指標位置有沒有改變\n
+        """
+        old_x = self.x
+        for event in pygame.event.get(pygame.MOUSEMOTION):
+            self.handle_motion(event)
+        return self.x != old_x
+
+    def mark_displayed(self):
+        """畫面更新後呼叫，記下已經處理的量測事件從送出到顯示花了多久"""
+        if not self._pending_probes:
+            return
+        now = time.perf_counter_ns()
+        for probe_ns in self._pending_probes:
+            self.latency.add((now - probe_ns) / 1000)
+        self._pending_probes.clear()
+
+    def get_latency_report(self):
+        """
+        取得輸入到顯示的延遲統計\n
+        return: dict，包含 p50_ms、p99_ms、samples；還沒有資料時為 None\n
+        """
+        if self.latency.size == 0:
+            return None
+        return {
+            "p50_ms": round(self.latency.percentile(0.5) / 1000, 3),
+            "p99_ms": round(self.latency.percentile(0.99) / 1000, 3),
+            "samples": self.latency.size,
+        }
+
+
+class InputLatencyProbe:
+    """
+    輸入延遲探針 - 背景執行緒在隨機時間送出帶有時間戳記的滑鼠移動事件\n
+    \n
+    pygame 的事件沒有帶產生時間，所以由探針自己送出事件並記下送出的時間，\n
+    事件位置就是指標目前的位置，底板不會因為量測而移動\n
+    """
+
+    def __init__(self, pointer, interval_ms=50):
+        """
+        初始化延遲探針\n
+        pointer: PointerInput 物件（用它目前的位置當作事件位置）\n
+        interval_ms: 平均每隔幾毫秒送一次事件（實際間隔在 0.5 到 1.5 倍之間隨機）\n
+        """
+        self.pointer = pointer
+        self.interval_ms = interval_ms
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """開始送出量測事件"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._probe_loop, name="input-probe", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """停止送出量測事件"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _probe_loop(self):
+        """背景執行緒：隨機間隔送出量測事件，時間點跟遊戲的每一格無關"""
+        rng = random.Random()
+        while not self._stop.wait(self.interval_ms * rng.uniform(0.5, 1.5) / 1000):
+            pygame.event.post(
+                pygame.event.Event(
+                    pygame.MOUSEMOTION,
+                    pos=(self.pointer.x, 0),
+                    rel=(0, 0),
+                    buttons=(0, 0, 0),
+                    probe_ns=time.perf_counter_ns(),
+                )
+            )
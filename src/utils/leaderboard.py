@@ -0,0 +1,226 @@
+"""
+排行榜模組
+每一輪（一關）結束時把分數、花的時間、打掉的磚塊數和重播位置記一筆到本機的 SQLite 檔案，
+由背景執行緒整批寫入，主迴圈不會等硬碟；前幾名和個別玩家的紀錄都有索引，幾百萬筆也能馬上查到
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# 結果種類
+OUTCOME_WIN = "win"  # 過關
+OUTCOME_QUIT = "quit"  # 這一關還沒打完就關掉遊戲
+
+# 資料表和索引（檔案已經存在時不會重建）
+# 分數一樣時先達成的排前面，所以兩個索引最後都加上 id
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    bricks INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    replay TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_by_player ON scores (player, score DESC, id);
+"""
+
+# 每筆紀錄的欄位，submit() 送出的 tuple 照這個順序排
+SCORE_COLUMNS = (
+    "player",
+    "score",
+    "duration_ms",
+    "bricks",
+    "level",
+    "outcome",
+    "replay",
+    "created_at",
+)
+
+INSERT_SQL = (
+    f"INSERT INTO scores ({', '.join(SCORE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(SCORE_COLUMNS))})"
+)
+
+TOP_SCORES_SQL = (
+    f"SELECT {', '.join(SCORE_COLUMNS)} FROM scores "
+    "ORDER BY score DESC, id LIMIT ?"
+)
+PLAYER_SCORES_SQL = (
+    f"SELECT {', '.join(SCORE_COLUMNS)} FROM scores "
+    "WHERE player = ? ORDER BY score DESC, id LIMIT ?"
+)
+
+
+def connect_leaderboard(path):
+    """
+    開啟排行榜資料庫，沒有資料表時建立\n
+    使用 WAL 模式，背景執行緒寫入時主執行緒照樣可以查詢\n
+    path: 資料庫檔案路徑，資料夾不存在會自動建立\n
+    return: sqlite3.Connection\n
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=5.0)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # WAL 模式下 NORMAL 只在檢查點時同步，當機最多少掉最後幾筆，不會弄壞檔案
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class Leaderboard:
+    """
+    排行榜\n
+    \n
+    - submit() 只把一筆紀錄放進佇列就回傳，佇列滿了就丟掉那一筆並計數，不讓遊戲等待\n
+    - 背景執行緒一拿到紀錄，就把佇列裡已經在等的紀錄（最多 batch_size 筆）一起拿出來，\n
+      用一次交易寫進去\n
+    - top_scores()、player_scores() 在呼叫的執行緒用另一個連線查詢，都走索引，\n
+      只讀需要的那幾筆\n
+    """
+
+    def __init__(self, path, batch_size=64, queue_size=1024):
+        """
+        初始化排行榜（還不會開啟資料庫，要呼叫 start()）\n
+        path: SQLite 檔案路徑\n
+        batch_size: 一次交易最多寫幾筆\n
+        queue_size: 等待寫入的紀錄最多幾筆\n
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.submitted = 0  # submit() 放進佇列的筆數
+        self.written = 0  # 已經寫進資料庫的筆數
+        self.batches = 0  # 寫入的交易次數
+        self.dropped = 0  # 佇列滿了或寫不進去而丟掉的筆數
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer_thread = None
+        self._reader = None
+
+    def start(self):
+        """開始背景寫入執行緒"""
+        if self._writer_thread is not None:
+            return
+        self._writer_thread = threading.Thread(
+            target=self._write_loop, name="leaderboard-writer", daemon=True
+        )
+        self._writer_thread.start()
+
+    def close(self, timeout=2.0):
+        """等背景執行緒把佇列裡的紀錄寫完，並關閉查詢用的連線"""
+        if self._writer_thread is not None:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._writer_thread.join(timeout)
+            self._writer_thread = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def submit(self, player, score, duration_ms, bricks, level, outcome, replay=None):
+        """
+        記下一筆成績（只放進佇列，由背景執行緒寫入）\n
+        player: 玩家名稱\n
+        score: 分數\n
+        duration_ms: 這一輪花的時間（毫秒）\n
+        bricks: 這一輪打掉的磚塊數\n
+        level: 第幾關\n
+        outcome: OUTCOME_WIN 或 OUTCOME_QUIT\n
+        replay: 重播位置（事件紀錄檔和場次），沒有開事件紀錄時為 None\n
+        """
+        row = (player, score, duration_ms, bricks, level, outcome, replay, time.time())
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.submitted += 1
+
+    def top_scores(self, limit=10):
+        """
+        查詢分數最高的幾筆\n
+        return: [{欄位名稱: 值}, ...]，分數由高到低\n
+        """
+        return self._query(TOP_SCORES_SQL, (limit,))
+
+    def player_scores(self, player, limit=10):
+        """
+        查詢某個玩家分數最高的幾筆\n
+        return: [{欄位名稱: 值}, ...]，分數由高到低\n
+        """
+        return self._query(PLAYER_SCORES_SQL, (player, limit))
+
+    def get_report(self):
+        """
+        取得寫入統計（遙測用）\n
+        return: dict，包含送出、寫入、交易和丟掉的筆數\n
+        """
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+        }
+
+    def _query(self, sql, parameters):
+        """用查詢專用的連線執行查詢（第一次查詢時才開啟），失敗時回傳空的清單"""
+        try:
+            if self._reader is None:
+                self._reader = connect_leaderboard(self.path)
+            cursor = self._reader.execute(sql, parameters)
+            return [dict(zip(SCORE_COLUMNS, row)) for row in cursor]
+        except (OSError, sqlite3.Error) as e:
+            print(f"讀取排行榜失敗：{e}")
+            return []
+
+    def _write_loop(self):
+        """背景執行緒：拿到紀錄後連同佇列裡在等的一起寫入，拿到 None 就結束"""
+        try:
+            connection = connect_leaderboard(self.path)
+        except (OSError, sqlite3.Error) as e:
+            # 開不了資料庫就印出訊息，之後的紀錄都丟掉，不影響遊戲
+            print(f"無法開啟排行榜 {self.path}：{e}")
+            connection = None
+
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while batch[-1] is not None and len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                is_closing = batch[-1] is None
+                rows = batch[:-1] if is_closing else batch
+                if connection is None:
+                    self.dropped += len(rows)
+                elif rows:
+                    self._insert(connection, rows)
+                if is_closing:
+                    return
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def _insert(self, connection, rows):
+        """用一次交易寫入一批紀錄"""
+        try:
+            with connection:
+                connection.executemany(INSERT_SQL, rows)
+        except sqlite3.Error as e:
+            print(f"寫入排行榜失敗：{e}")
+            self.dropped += len(rows)
+            return
+        self.written += len(rows)
+        self.batches += 1
@@ -0,0 +1,118 @@
+"""
+關卡檔案格式模組
+關卡檔由固定大小的標頭加上每一格一筆的緊密紀錄組成，讀取時直接記憶體映射，不用逐格解析
+"""
+
+import os
+import random
+import struct
+
+import numpy as np
+
+# 標頭：識別碼、格式版本、標頭長度、欄數、列數、磚塊數、用到的顏色數、旗標，補到 32 bytes
+LEVEL_MAGIC = b"BLVL"
+LEVEL_VERSION = 1
+_HEADER = struct.Struct("<4sHHIIIHH8x")
+HEADER_SIZE = _HEADER.size
+
+# 標頭旗標：有空格（沒有磚塊的格子）
+FLAG_HAS_EMPTY_CELLS = 1
+
+# 磚塊種類
+BRICK_EMPTY = 0  # 這一格沒有磚塊
+BRICK_NORMAL = 1  # 一般磚塊
+
+# 每一格的紀錄：種類、顏色編號、是否為特殊磚塊、保留欄位（湊成 4 bytes）
+CELL_DTYPE = np.dtype(
+    [("type", np.uint8), ("color", np.uint8), ("special", np.uint8), ("reserved", np.uint8)]
+)
+
+
+class Level:
+    """
+    讀進來的關卡\n
+    cells 是 (rows, cols) 的結構陣列，直接對應到檔案內容（記憶體映射，用到才從硬碟讀）\n
+    """
+
+    def __init__(self, cols, rows, brick_count, color_count, flags, cells):
+        self.cols = cols
+        self.rows = rows
+        self.brick_count = brick_count
+        self.color_count = color_count
+        self.has_empty_cells = bool(flags & FLAG_HAS_EMPTY_CELLS)
+        self.cells = cells
+
+
+def build_level_cells(cols, rows, special_count, color_count, rng=None):
+    """
+    產生跟預設磚牆一樣的關卡內容：每一格都有磚塊、顏色依欄輪替、隨機挑選特殊磚塊\n
+    cols, rows: 關卡大小\n
+    special_count: 特殊磚塊數量\n
+    color_count: 調色盤有幾種顏色\n
+    rng: random.Random 物件，若為 None 則使用 random 模組\n
+    return: (rows, cols) 的 CELL_DTYPE 結構陣列\n
+    """
+    rng = rng if rng is not None else random
+    cells = np.zeros((rows, cols), dtype=CELL_DTYPE)
+    cells["type"] = BRICK_NORMAL
+    cells["color"] = np.arange(cols) % color_count
+
+    total = rows * cols
+    special_indices = rng.sample(range(total), k=min(special_count, total))
+    cells["special"].flat[special_indices] = 1
+    return cells
+
+
+def write_level(path, cells):
+    """
+    把關卡內容寫成關卡檔\n
+    path: 輸出檔案路徑，資料夾不存在會自動建立\n
+    cells: (rows, cols) 的 CELL_DTYPE 結構陣列\n
+    """
+    cells = np.ascontiguousarray(cells, dtype=CELL_DTYPE)
+    rows, cols = cells.shape
+    is_brick = cells["type"] != BRICK_EMPTY
+    brick_count = int(np.count_nonzero(is_brick))
+    color_count = int(cells["color"][is_brick].max()) + 1 if brick_count else 0
+    flags = FLAG_HAS_EMPTY_CELLS if brick_count < rows * cols else 0
+
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(
+            _HEADER.pack(
+                LEVEL_MAGIC, LEVEL_VERSION, HEADER_SIZE, cols, rows, brick_count, color_count, flags
+            )
+        )
+        cells.tofile(file)
+
+
+def open_level(path):
+    """
+    開啟關卡檔（記憶體映射，只讀標頭，格子的資料等用到時才從硬碟讀進來）\n
+    path: 關卡檔路徑\n
+    return: Level 物件\n
+    \n
+    映射使用 copy-on-write 模式：遊戲中修改格子只會改到記憶體裡的副本，不會寫回檔案\n
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path} 太短，不是關卡檔")
+
+    magic, version, header_size, cols, rows, brick_count, color_count, flags = _HEADER.unpack(
+        header
+    )
+    if magic != LEVEL_MAGIC:
+        raise ValueError(f"{path} 不是關卡檔")
+    if version != LEVEL_VERSION:
+        raise ValueError(f"{path} 的格式版本 {version} 不支援")
+
+    expected_size = header_size + rows * cols * CELL_DTYPE.itemsize
+    if os.path.getsize(path) < expected_size:
+        raise ValueError(f"{path} 的資料不完整")
+
+    cells = np.memmap(
+        path, dtype=CELL_DTYPE, mode="c", offset=header_size, shape=(rows, cols)
+    )
+    return Level(cols, rows, brick_count, color_count, flags, cells)
@@ -0,0 +1,183 @@
+"""
+效能剖析擷取工具模組
+在遊戲執行中按熱鍵或送訊號，就能錄下接下來幾格的效能剖析資料
+"""
+
+import collections
+import os
+import signal
+import sys
+import threading
+import time
+
+# 擷取方式：每次擷取只用一種，兩種同時開會互相干擾
+# - sample：背景執行緒定時查看主執行緒的呼叫堆疊，額外負擔小，時間比例比較準
+# - cprofile：cProfile 記錄每一次函式呼叫，呼叫次數準確，但每次呼叫都有額外負擔
+PROFILER_MODES = ("sample", "cprofile")
+
+# 每種擷取方式輸出的副檔名
+OUTPUT_EXTENSIONS = {"sample": ".collapsed", "cprofile": ".pstats"}
+
+
+class ProfilerCapture:
+    """
+    效能剖析擷取器\n
+    \n
+    收到擷取要求後（熱鍵或 SIGUSR1 訊號），從下一格開始依照擷取方式記錄：\n
+    - sample：另開一條背景執行緒定時查看主執行緒的呼叫堆疊，寫出 .collapsed，\n
+      每行一條呼叫堆疊和次數，可直接交給火焰圖工具（flamegraph.pl、speedscope）\n
+    - cprofile：用 cProfile 記錄主執行緒每個函式花的時間，寫出 .pstats，\n
+      可以用 pstats 或 snakeviz 打開\n
+    cProfile 的追蹤負擔會灌進取樣到的堆疊，取樣執行緒搶 GIL 也會讓 cProfile 的時間失真，\n
+    所以一次只開一種。錄滿指定格數後寫出檔案，檔名會標上擷取當下的遊戲狀態和剩餘磚塊數\n
+    """
+
+    def __init__(
+        self, output_dir="profiles", frame_count=300, sample_interval=0.001, mode="sample"
+    ):
+        """
+        初始化擷取器\n
+        output_dir: 擷取檔案要存放的資料夾\n
+        frame_count: 每次擷取要錄幾格\n
+        sample_interval: 取樣執行緒多久看一次呼叫堆疊（秒，只有 sample 使用）\n
+        mode: 擷取方式，'sample' 或 'cprofile'\n
+        """
+        if mode not in PROFILER_MODES:
+            raise ValueError(f"不支援的擷取方式：{mode}")
+        self.output_dir = output_dir
+        self.frame_count = frame_count
+        self.sample_interval = sample_interval
+        self.mode = mode
+        self.is_requested = False
+        self.is_capturing = False
+        self.last_output_path = None
+
+        self._frames_left = 0
+        self._profile = None
+        self._tags = {}
+        self._stack_counts = None
+        self._sampler_thread = None
+        self._stop_sampling = threading.Event()
+        self._main_thread_id = threading.main_thread().ident
+
+    def install_signal_handler(self, signum=None):
+        """
+        註冊訊號處理，收到訊號就要求擷取（例如 kill -USR1 <pid>）\n
+        signum: 要使用的訊號，若為 None 則使用 SIGUSR1\n
+        return: 是否註冊成功（Windows 沒有 SIGUSR1，或不在主執行緒時會失敗）\n
+        """
+        if signum is None:
+            signum = getattr(signal, "SIGUSR1", None)
+        if signum is None:
+            return False
+        try:
+            # 訊號處理函式裡只設定旗標，真正的擷取留到下一格開始時才做
+            signal.signal(signum, lambda _signum, _frame: self.request())
+        except ValueError:
+            # 不在主執行緒時不能註冊訊號處理
+            return False
+        return True
+
+    def request(self):
+        """要求從下一格開始擷取（正在擷取時會被忽略）"""
+        if not self.is_capturing:
+            self.is_requested = True
+
+    def begin_frame(self, tags):
+        """
+        每格開始時呼叫，有擷取要求就開始錄\n
+        tags: 會寫進檔名的標記，例如 {'state': 'playing', 'bricks': 42}\n
+        """
+        if not self.is_requested:
+            return
+        self.is_requested = False
+        self.is_capturing = True
+        self._frames_left = self.frame_count
+        self._tags = dict(tags)
+
+        if self.mode == "cprofile":
+            # 開始記錄主執行緒的函式呼叫（只有這種方式用得到 cProfile，用到才載入）
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            # 開始取樣執行緒
+            self._stack_counts = collections.Counter()
+            self._stop_sampling.clear()
+            self._sampler_thread = threading.Thread(
+                target=self._sample_loop, name="profiler-sampler", daemon=True
+            )
+            self._sampler_thread.start()
+
+    def end_frame(self):
+        """每格結束時呼叫，錄滿指定格數就停止並寫出檔案"""
+        if not self.is_capturing:
+            return
+        self._frames_left -= 1
+        if self._frames_left > 0:
+            return
+
+        # 停止記錄或取樣
+        if self._profile is not None:
+            self._profile.disable()
+        else:
+            self._stop_sampling.set()
+            self._sampler_thread.join()
+            self._sampler_thread = None
+        self.is_capturing = False
+
+        # 寫檔交給背景執行緒，遊戲不用等硬碟
+        profile, stack_counts = self._profile, self._stack_counts
+        self._profile = None
+        self._stack_counts = None
+        path = self._build_base_path() + OUTPUT_EXTENSIONS[self.mode]
+        self.last_output_path = path
+        threading.Thread(
+            target=self._write_file,
+            args=(profile, stack_counts, path),
+            name="profiler-writer",
+            daemon=True,
+        ).start()
+
+    def _build_base_path(self):
+        """產生含有時間和標記的檔名（不含副檔名）"""
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        tag_text = "_".join(f"{key}-{value}" for key, value in self._tags.items())
+        name = f"capture_{stamp}_{tag_text}" if tag_text else f"capture_{stamp}"
+        return os.path.join(self.output_dir, name)
+
+    def _sample_loop(self):
+        """
+        取樣執行緒：定時記下主執行緒正在執行的呼叫堆疊\n
+        直到收到停止通知才結束\n
+        """
+        while not self._stop_sampling.wait(self.sample_interval):
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+
+            # 從最裡面的函式往外走，再反過來變成由外到內的順序
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            names.reverse()
+            self._stack_counts[";".join(names)] += 1
+
+    def _write_file(self, profile, stack_counts, path):
+        """把 cProfile 結果或取樣堆疊寫成檔案（沒有使用的那一個是 None）"""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            if profile is not None:
+                profile.dump_stats(path)
+                return
+            with open(path, "w", encoding="utf-8") as file:
+                for stack, count in stack_counts.most_common():
+                    file.write(f"{stack} {count}\n")
+        except OSError as e:
+            # 硬碟滿了或沒有權限時只印出訊息，不影響遊戲
+            print(f"寫入效能剖析檔案失敗：{e}")
@@ -0,0 +1,471 @@
+"""
+繪圖後端模組
+遊戲物件和介面都透過繪圖器畫圖，不直接呼叫 pygame.draw 或 Surface.blit，
+同一套繪製程式可以換成不同的後端：
+- surface：原本的做法，用 CPU 畫在視窗的 Surface 上
+- texture：用 pygame._sdl2.video 的 Renderer，小圖案和文字的字都放進貼圖集，
+  由顯示卡貼圖（沒有顯示卡時 SDL 會用軟體繪圖器，結果一樣）
+"""
+
+import hashlib
+import weakref
+
+import pygame
+
+# 支援的繪圖後端
+RENDER_BACKENDS = ("surface", "texture")
+
+# surface 後端的圖層上代表「透明」的顏色（調色盤裡沒有這個顏色）
+LAYER_COLORKEY = (255, 0, 255)
+
+# SDL 的混色模式：依透明度混色
+_BLENDMODE_BLEND = 1
+
+
+class SurfaceRenderer:
+    """
+    Surface 繪圖器 - 直接畫在視窗的 Surface 上\n
+    \n
+    遊戲畫面要降低解析度時（begin_world 的 scale 小於 1），\n
+    先畫在縮小的畫布上，end_world 時一次放大到整個畫面\n
+    內部解析度跟視窗不同時，整個畫面畫在內部解析度的畫布（screen）上，\n
+    present 時一次放大到視窗；視窗本身一直是邏輯座標的大小\n
+    """
+
+    name = "surface"
+
+    def __init__(self, window, render_size=None):
+        """
+        初始化繪圖器\n
+        window: 視窗的 Surface（pygame.display.set_mode 的回傳值）\n
+        render_size: 內部解析度 (寬, 高)，None 表示跟視窗一樣大\n
+        """
+        self.window = window
+        self.screen = window  # 整個畫面畫在這張畫布上（內部解析度）
+        self._is_scaled = render_size is not None and tuple(render_size) != window.get_size()
+        if self._is_scaled:
+            # 跟視窗同樣的像素格式，放大時不用轉換
+            self.screen = pygame.Surface(render_size, 0, window)
+        self.target = self.screen  # 目前畫上去的畫布
+        self._canvas = None
+        # 滑鼠事件座標相對於邏輯座標的比例（視窗是邏輯座標的大小，所以是 1）
+        self.pointer_scale = 1.0
+
+    def get_size(self):
+        """取得目前畫布的大小"""
+        return self.target.get_size()
+
+    def begin_world(self, scale=1.0):
+        """
+        開始畫遊戲畫面\n
+        scale: 遊戲畫面的繪製比例，小於 1 時先畫在縮小的畫布上\n
+        """
+        if scale == 1.0:
+            self.target = self.screen
+            return
+        width, height = self.screen.get_size()
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        if self._canvas is None or self._canvas.get_size() != size:
+            # 跟視窗同樣的像素格式，放大時不用轉換
+            self._canvas = pygame.Surface(size, 0, self.screen)
+        self.target = self._canvas
+
+    def end_world(self):
+        """遊戲畫面畫完，縮小的畫布放大到視窗，之後畫的介面直接畫在視窗上"""
+        if self.target is not self.screen:
+            pygame.transform.scale(self.target, self.screen.get_size(), self.screen)
+            self.target = self.screen
+
+    def clear(self, color):
+        """用指定顏色清除畫布"""
+        self.target.fill(color)
+
+    def fill_rect(self, color, rect):
+        """畫實心矩形"""
+        pygame.draw.rect(self.target, color, rect)
+
+    def draw_circle(self, color, center, radius):
+        """畫實心圓"""
+        pygame.draw.circle(self.target, color, center, radius)
+
+    def draw_lines(self, color, points):
+        """畫連續的折線（寬 1 像素）"""
+        pygame.draw.lines(self.target, color, False, points, 1)
+
+    def blit(self, image, position):
+        """
+        貼一張圖\n
+        image: create_sprite、create_layer 建立的 Surface，或 render_text 的回傳值\n
+        position: 左上角位置（也可以是 Rect）\n
+        """
+        self.target.blit(image, position)
+
+    def blits(self, items):
+        """
+        一次貼很多張圖\n
+        items: [(圖, (x, y)), ...]\n
+        """
+        self.target.blits(items, doreturn=False)
+
+    def render_text(self, font, text, color):
+        """
+        產生文字圖\n
+        return: 可以交給 blit 的圖，有 get_rect、get_width、get_height\n
+        """
+        return font.render(text, True, color)
+
+    def create_sprite(self, size):
+        """
+        建立不透明的小圖案（例如特殊磚塊），用 pygame.draw 畫好後交給 blit\n
+        只能在主執行緒呼叫\n
+        """
+        return pygame.Surface(size, 0, self.screen)
+
+    def create_layer(self, size):
+        """
+        建立一開始全透明的圖層（例如磚牆區塊），只能在主執行緒呼叫\n
+        畫好後要改內容時用 erase 擦掉一塊，再呼叫 mark_changed\n
+        """
+        layer = pygame.Surface(size, 0, self.screen)
+        layer.fill(LAYER_COLORKEY)
+        layer.set_colorkey(LAYER_COLORKEY)
+        return layer
+
+    def erase(self, layer, rect):
+        """把圖層的一塊變回透明"""
+        layer.fill(LAYER_COLORKEY, rect)
+
+    def mark_changed(self, layer):
+        """圖層內容改變了（Surface 後端直接貼最新內容，不用做事）"""
+
+    def present(self):
+        """把畫好的畫面顯示出來（內部解析度跟視窗不同時，先一次放大到視窗）"""
+        if self._is_scaled:
+            pygame.transform.scale(self.screen, self.window.get_size(), self.window)
+        pygame.display.update()
+
+
+class _TextureAtlas:
+    """
+    貼圖集 - 把很多小圖案放在同一張大貼圖上\n
+    用一列一列排的方式放，滿了就再開一張；\n
+    連續貼的圖案來自同一張貼圖時，SDL 可以把它們合併成一次送給顯示卡\n
+    位置用圖案的內容當索引：換關卡、換畫質時重新畫出來的同樣圖案共用原本的位置，\n
+    頁數只跟不同圖案的種類數有關，不會越跑越多\n
+    """
+
+    def __init__(self, renderer, page_size=1024, padding=1):
+        self.renderer = renderer
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        self._slots = {}  # (寬, 高, 像素內容的雜湊) -> (貼圖, 矩形)
+        self._x = 0
+        self._y = 0
+        self._row_height = 0
+
+    def add(self, surface):
+        """
+        把一張圖案放進貼圖集（同樣內容的圖案已經放過時直接共用那個位置）\n
+        return: (貼圖, 圖案在貼圖上的矩形)；圖案比一頁還大時回傳 None\n
+        """
+        width, height = surface.get_size()
+        if width + self.padding > self.page_size or height + self.padding > self.page_size:
+            return None
+
+        # 貼圖要用有透明度的 32 位元格式，其他格式（包含透明色）先轉成這種，
+        # 轉好之後的像素才能拿來比對內容
+        if not surface.get_flags() & pygame.SRCALPHA:
+            converted = pygame.Surface((width, height), pygame.SRCALPHA, 32)
+            converted.blit(surface, (0, 0))
+            surface = converted
+        pixels = pygame.image.tobytes(surface, "RGBA")
+        key = (width, height, hashlib.blake2b(pixels, digest_size=16).digest())
+        placed = self._slots.get(key)
+        if placed is not None:
+            return placed
+
+        # 這一列放不下就換下一列，這一頁放不下就開新的一頁
+        if not self.pages or self._x + width > self.page_size:
+            self._x = 0
+            self._y += self._row_height
+            self._row_height = 0
+        if not self.pages or self._y + height > self.page_size:
+            from pygame._sdl2.video import Texture
+
+            page = Texture(self.renderer, (self.page_size, self.page_size))
+            page.blend_mode = _BLENDMODE_BLEND
+            self.pages.append(page)
+            self._x = 0
+            self._y = 0
+            self._row_height = 0
+
+        page = self.pages[-1]
+        rect = (self._x, self._y, width, height)
+        page.update(surface, area=rect)
+        self._x += width + self.padding
+        self._row_height = max(self._row_height, height + self.padding)
+        self._slots[key] = (page, rect)
+        return page, rect
+
+
+class TextRun:
+    """
+    texture 後端的文字圖 - 一串字在貼圖集裡的位置\n
+    每個字只畫一次，之後同樣的字型、顏色、字直接從貼圖集貼上\n
+    """
+
+    def __init__(self, glyphs, width, height):
+        self.glyphs = glyphs  # [(貼圖, 字在貼圖上的矩形, 字在文字裡的 x), ...]
+        self.width = width
+        self.height = height
+
+    def get_width(self):
+        return self.width
+
+    def get_height(self):
+        return self.height
+
+    def get_size(self):
+        return self.width, self.height
+
+    def get_rect(self, **anchor):
+        """跟 Surface.get_rect 一樣，可以用 topright=... 這類參數指定位置"""
+        rect = pygame.Rect(0, 0, self.width, self.height)
+        for name, value in anchor.items():
+            setattr(rect, name, value)
+        return rect
+
+
+class TextureRenderer:
+    """
+    GPU 貼圖繪圖器 - 用 pygame._sdl2.video 的 Renderer 畫圖\n
+    \n
+    - 小圖案（特殊磚塊、球、粒子、圓形）第一次貼的時候放進貼圖集，之後只要送出貼圖指令\n
+    - 文字拆成一個一個字放進貼圖集，分數改變時不用重新產生整段文字圖\n
+    - 大圖（磚牆區塊）各自一張貼圖，內容改變（mark_changed）後下一次貼之前才重新上傳\n
+    - 遊戲畫面降低解析度時畫在縮小的目標貼圖上，放大由顯示卡處理\n
+    - 內部解析度跟視窗（全螢幕、高 DPI）不同時，整個畫面畫在內部解析度的目標貼圖上，\n
+      顯示時一次放大到視窗\n
+    \n
+    圖案都用 Surface 本身當作索引（弱參照），Surface 被丟掉時對應的貼圖也跟著釋放；\n
+    貼圖集裡的位置不會收回，但用內容當索引，重新畫出來的同樣圖案（新關卡、換畫質）共用原本的位置；\n
+    Renderer 和記錄圖層、貼圖的表都不能在背景執行緒使用，\n
+    create_sprite、create_layer 也會登記到這些表，一樣只能在主執行緒呼叫\n
+    """
+
+    name = "texture"
+
+    def __init__(
+        self,
+        title,
+        size,
+        render_size=None,
+        fullscreen=False,
+        vsync=False,
+        atlas_size=1024,
+        sprite_max_size=128,
+    ):
+        """
+        初始化繪圖器（會自己開一個視窗，不能跟 pygame.display.set_mode 一起使用）\n
+        title: 視窗標題\n
+        size: 視窗大小 (寬, 高)\n
+        render_size: 內部解析度 (寬, 高)，None 表示跟視窗一樣大\n
+        fullscreen: 是否用桌面解析度全螢幕\n
+        vsync: 畫面顯示時是否等待垂直同步\n
+        atlas_size: 貼圖集每一頁的邊長\n
+        sprite_max_size: 寬高都不超過這個大小的圖案才放進貼圖集\n
+        """
+        from pygame._sdl2.video import Renderer, Texture, Window
+
+        self.window = Window(title, size=size, fullscreen_desktop=fullscreen, allow_highdpi=True)
+        self.renderer = Renderer(self.window, vsync=vsync)
+        self.size = tuple(render_size or size)
+        # 所有座標都以內部解析度為準，SDL 負責換算到視窗（保持比例，多出來的地方是黑邊），
+        # 滑鼠事件的座標也會換算回內部解析度
+        self.renderer.logical_size = self.size
+        # 滑鼠事件座標相對於邏輯座標（視窗大小）的比例
+        self.pointer_scale = self.size[0] / size[0]
+
+        # 內部解析度跟輸出不同時，整個畫面先畫在這張目標貼圖上，present 時一次放大，
+        # 不用讓每個圖案都在輸出解析度重新取樣
+        self._frame_target = None
+        if fullscreen or self.size != tuple(size):
+            self._frame_target = Texture(self.renderer, self.size, target=True)
+            self.renderer.target = self._frame_target
+        self.sprite_max_size = sprite_max_size
+        self._atlas = _TextureAtlas(self.renderer, page_size=atlas_size)
+
+        # Surface -> [貼圖, 來源矩形, 內容是否改變]；圖層會改變內容，不放進貼圖集
+        self._textures = weakref.WeakKeyDictionary()
+        self._layers = weakref.WeakSet()
+        # (顏色, 半徑) -> 圓形圖案；(字型, 顏色, 字) -> 字的圖案
+        self._circles = {}
+        self._glyphs = {}
+
+        self._world_target = None
+        self._target_size = self.size
+
+    def get_size(self):
+        """取得目前畫布的大小"""
+        return self._target_size
+
+    def begin_world(self, scale=1.0):
+        """
+        開始畫遊戲畫面\n
+        scale: 遊戲畫面的繪製比例，小於 1 時先畫在縮小的目標貼圖上\n
+        """
+        if scale == 1.0:
+            self.renderer.target = self._frame_target
+            self._target_size = self.size
+            return
+        size = (max(1, round(self.size[0] * scale)), max(1, round(self.size[1] * scale)))
+        if self._world_target is None or self._world_target.get_rect().size != size:
+            from pygame._sdl2.video import Texture
+
+            self._world_target = Texture(self.renderer, size, target=True)
+        self.renderer.target = self._world_target
+        self._target_size = size
+
+    def end_world(self):
+        """遊戲畫面畫完，縮小的目標貼圖放大到整個畫布"""
+        if self._target_size != self.size:
+            self.renderer.target = self._frame_target
+            self._target_size = self.size
+            self._world_target.draw(dstrect=(0, 0, *self.size))
+
+    def clear(self, color):
+        """用指定顏色清除畫布"""
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.clear()
+
+    def fill_rect(self, color, rect):
+        """畫實心矩形"""
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.fill_rect(rect)
+
+    def draw_circle(self, color, center, radius):
+        """畫實心圓（同樣顏色、半徑的圓只畫一次，之後從貼圖集貼上）"""
+        key = (tuple(color), radius)
+        sprite = self._circles.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self._circles[key] = sprite
+        self.blit(sprite, (center[0] - radius, center[1] - radius))
+
+    def draw_lines(self, color, points):
+        """畫連續的折線（寬 1 像素）"""
+        self.renderer.draw_color = pygame.Color(color)
+        draw_line = self.renderer.draw_line
+        for start, end in zip(points, points[1:]):
+            draw_line(start, end)
+
+    def blit(self, image, position):
+        """
+        貼一張圖\n
+        image: create_sprite、create_layer 建立的 Surface，其他 Surface，或 render_text 的回傳值\n
+        position: 左上角位置（也可以是 Rect）\n
+        """
+        x, y = position[0], position[1]
+        if type(image) is TextRun:
+            for texture, rect, offset_x in image.glyphs:
+                texture.draw(srcrect=rect, dstrect=(x + offset_x, y, rect[2], rect[3]))
+            return
+        texture, rect = self._get_texture(image)
+        texture.draw(srcrect=rect, dstrect=(x, y, rect[2], rect[3]))
+
+    def blits(self, items):
+        """
+        一次貼很多張圖\n
+        items: [(圖, (x, y)), ...]\n
+        """
+        get_texture = self._get_texture
+        for image, (x, y) in items:
+            texture, rect = get_texture(image)
+            texture.draw(srcrect=rect, dstrect=(x, y, rect[2], rect[3]))
+
+    def render_text(self, font, text, color):
+        """
+        產生文字圖（每個字第一次出現時才畫，之後從貼圖集貼上）\n
+        字是一個一個排的，沒有字距微調\n
+        return: TextRun 物件\n
+        """
+        color = tuple(color)
+        glyphs = []
+        x = 0
+        height = font.get_height()
+        for char in text:
+            key = (font, color, char)
+            sprite = self._glyphs.get(key)
+            if sprite is None:
+                sprite = font.render(char, True, color)
+                self._glyphs[key] = sprite
+            texture, rect = self._get_texture(sprite)
+            glyphs.append((texture, rect, x))
+            x += rect[2]
+        return TextRun(glyphs, x, height)
+
+    def get_atlas_report(self):
+        """
+        取得貼圖集的使用狀況\n
+        return: dict，包含頁數和放進去的不同圖案數\n
+        """
+        return {"pages": len(self._atlas.pages), "sprites": len(self._atlas._slots)}
+
+    def create_sprite(self, size):
+        """建立不透明的小圖案，用 pygame.draw 畫好後交給 blit（只能在主執行緒呼叫）"""
+        return pygame.Surface(size, 0, 32)
+
+    def create_layer(self, size):
+        """建立一開始全透明的圖層（只能在主執行緒呼叫，會登記到圖層表）"""
+        layer = pygame.Surface(size, pygame.SRCALPHA, 32)
+        self._layers.add(layer)
+        return layer
+
+    def erase(self, layer, rect):
+        """把圖層的一塊變回透明"""
+        layer.fill((0, 0, 0, 0), rect)
+
+    def mark_changed(self, layer):
+        """圖層內容改變了，下一次貼之前重新上傳"""
+        entry = self._textures.get(layer)
+        if entry is not None:
+            entry[2] = True
+
+    def present(self):
+        """把畫好的畫面顯示出來（有內部解析度的目標貼圖時，先一次放大到視窗）"""
+        if self._frame_target is None:
+            self.renderer.present()
+            return
+        self.renderer.target = None
+        self.renderer.draw_color = pygame.Color(0, 0, 0)
+        self.renderer.clear()
+        self._frame_target.draw(dstrect=(0, 0, *self.size))
+        self.renderer.present()
+        self.renderer.target = self._frame_target
+
+    def _get_texture(self, surface):
+        """
+        取得 Surface 對應的貼圖，第一次用到時才上傳\n
+        return: (貼圖, 來源矩形)\n
+        """
+        entry = self._textures.get(surface)
+        if entry is None:
+            placed = None
+            width, height = surface.get_size()
+            is_small = width <= self.sprite_max_size and height <= self.sprite_max_size
+            if is_small and surface not in self._layers:
+                placed = self._atlas.add(surface)
+            if placed is None:
+                from pygame._sdl2.video import Texture
+
+                texture = Texture.from_surface(self.renderer, surface)
+                texture.blend_mode = _BLENDMODE_BLEND
+                placed = (texture, (0, 0, width, height))
+            entry = [placed[0], placed[1], False]
+            self._textures[surface] = entry
+        elif entry[2]:
+            entry[0].update(surface)
+            entry[2] = False
+        return entry[0], entry[1]
@@ -0,0 +1,217 @@
+"""
+音效模組
+開機時在背景執行緒初始化 pygame.mixer 並把所有音效解碼好，遊戲中只送出播放指令；
+同一格同一種音效只播一次，聲道都在用時搶走最不重要、最早開始播的聲道
+"""
+
+import threading
+import time
+
+import numpy as np
+import pygame
+
+# 遊戲用到的音效：名稱 -> 優先順序（數字越大越重要，聲道不夠時不會被比較不重要的音效搶走）
+SOUND_EFFECTS = {
+    "brick_hit": 1,
+    "paddle_hit": 1,
+    "explosion": 2,
+    "win": 3,
+}
+
+# 資源包裡沒有對應的音效（sounds/名稱）時改用合成的聲音：
+# 名稱 -> (起始頻率 Hz, 結束頻率 Hz, 長度毫秒, 雜訊比例)
+SYNTH_TONES = {
+    "brick_hit": (880, 660, 60, 0.0),
+    "paddle_hit": (440, 440, 50, 0.0),
+    "explosion": (180, 40, 350, 0.7),
+    "win": (523, 1047, 600, 0.0),
+}
+
+
+def synthesize_tone(frequency, channels, start_hz, end_hz, duration_ms, noise=0.0):
+    """
+    合成一段滑音加雜訊的短音效（開頭 2 毫秒淡入，之後逐漸變小）\n
+    frequency: mixer 的取樣頻率\n
+    channels: mixer 的聲道數\n
+    start_hz, end_hz: 開始和結束時的音高\n
+    duration_ms: 長度（毫秒）\n
+    noise: 雜訊佔的比例，0 到 1\n
+    return: 可以交給 pygame.sndarray.make_sound 的 int16 陣列\n
+    """
+    count = max(1, int(frequency * duration_ms / 1000))
+    pitch = np.linspace(start_hz, end_hz, count)
+    wave = np.sin(2 * np.pi * np.cumsum(pitch) / frequency) * (1 - noise)
+    if noise > 0:
+        wave += np.random.default_rng(0).uniform(-1, 1, count) * noise
+
+    envelope = np.linspace(1, 0, count) ** 2
+    attack = min(count, max(1, frequency // 500))
+    envelope[:attack] *= np.linspace(0, 1, attack)
+    samples = (wave * envelope * 0.6 * 32767).astype(np.int16)
+    if channels > 1:
+        samples = np.repeat(samples[:, None], channels, axis=1)
+    return samples
+
+
+class SoundMixer:
+    """
+    音效混音器\n
+    \n
+    - start() 開一個背景執行緒初始化 pygame.mixer（用很小的緩衝區，延遲低）並解碼所有音效，\n
+      準備好之前要求播放的音效直接略過，遊戲不用等\n
+    - 遊戲邏輯用 request() 要求播放，只是記下名稱；每格結束時 flush() 一次送出，\n
+      同一格同一種音效只播一次（例如連鎖爆炸打掉幾十塊磚，也只會有一聲）\n
+    - 固定數量的聲道：有空的聲道就用，都在播時搶走優先順序最低、最早開始播的聲道；\n
+      每個聲道都在播更重要的音效時就不播\n
+    """
+
+    def __init__(self, channels=8, frequency=44100, buffer=256, volume=0.5, pack=None):
+        """
+        初始化音效混音器（還不會開啟音效裝置，要呼叫 start()）\n
+        channels: 聲道數量（同時最多播幾個音效）\n
+        frequency: 取樣頻率\n
+        buffer: mixer 緩衝區的取樣數，越小延遲越低，太小在慢的機器上會有爆音\n
+        volume: 音量，0 到 1\n
+        pack: AssetPack 物件，有 sounds/名稱 的音效就用它，None 表示全部用合成的聲音\n
+        """
+        self.channel_count = channels
+        self.frequency = frequency
+        self.buffer = buffer
+        self.volume = volume
+        self.pack = pack
+
+        self.is_ready = False
+        self.sounds = {}  # 名稱 -> 解碼好的 pygame.mixer.Sound
+        self.requests = 0  # request() 被呼叫的次數
+        self.played = 0  # 實際播放的次數
+        self.stolen = 0  # 搶走正在播的聲道的次數
+        self.dropped = 0  # 聲道都在播更重要的音效而沒播的次數
+
+        self._pending = set()
+        self._channels = []
+        self._voices = []  # 每個聲道目前播的 (優先順序, 開始時間)
+        self._thread = None
+
+    def start(self, background=True):
+        """
+        初始化 mixer 並解碼所有音效\n
+        background: 是否在背景執行緒做，False 時做完才回傳\n
+        """
+        if self._thread is not None or self.is_ready:
+            return
+        if not background:
+            self._load()
+            return
+        self._thread = threading.Thread(target=self._load, name="sound-loader", daemon=True)
+        self._thread.start()
+
+    def wait_ready(self, timeout=None):
+        """
+        等背景執行緒準備好\n
+        return: 是否已經可以播放\n
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.is_ready
+
+    def request(self, name):
+        """
+        要求在這一格結束時播放音效（同一格重複要求只會播一次）\n
+        name: SOUND_EFFECTS 裡的音效名稱\n
+        """
+        self.requests += 1
+        if self.is_ready:
+            self._pending.add(name)
+
+    def flush(self):
+        """每格結束時呼叫，把這一格要求的音效送出去，重要的音效先挑聲道"""
+        if not self._pending:
+            return
+        now = time.perf_counter_ns()
+        for name in sorted(self._pending, key=SOUND_EFFECTS.get, reverse=True):
+            self._play(name, now)
+        self._pending.clear()
+
+    def get_report(self):
+        """
+        取得播放統計（遙測用）\n
+        return: dict，包含是否準備好、要求次數、播放次數、搶聲道次數和沒播的次數\n
+        """
+        return {
+            "ready": self.is_ready,
+            "requests": self.requests,
+            "played": self.played,
+            "stolen": self.stolen,
+            "dropped": self.dropped,
+        }
+
+    def close(self):
+        """停止所有音效並關閉 mixer"""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.is_ready:
+            self.is_ready = False
+            pygame.mixer.quit()
+
+    def _load(self):
+        """初始化 mixer 並解碼所有音效（可能在背景執行緒執行）"""
+        try:
+            pygame.mixer.init(frequency=self.frequency, size=-16, channels=2, buffer=self.buffer)
+        except pygame.error as e:
+            print(f"無法開啟音效裝置，停用音效：{e}")
+            return
+        frequency, _, channels = pygame.mixer.get_init()
+        pygame.mixer.set_num_channels(self.channel_count)
+
+        sounds = {}
+        for name in SOUND_EFFECTS:
+            pack_name = f"sounds/{name}"
+            try:
+                if self.pack is not None and pack_name in self.pack:
+                    sound = self.pack.load_sound(pack_name)
+                else:
+                    samples = synthesize_tone(frequency, channels, *SYNTH_TONES[name])
+                    sound = pygame.sndarray.make_sound(samples)
+            except pygame.error as e:
+                print(f"無法載入音效 {name}：{e}")
+                continue
+            sound.set_volume(self.volume)
+            sounds[name] = sound
+
+        self._channels = [pygame.mixer.Channel(index) for index in range(self.channel_count)]
+        self._voices = [(0, 0)] * self.channel_count
+        self.sounds = sounds
+        # 最後才設定，主執行緒看到 is_ready 時聲道和音效都已經準備好
+        self.is_ready = True
+
+    def _play(self, name, now):
+        """挑一個聲道播放音效，沒有可以用的聲道就不播"""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        priority = SOUND_EFFECTS[name]
+        index = self._find_channel(priority)
+        if index is None:
+            self.dropped += 1
+            return
+        channel = self._channels[index]
+        if channel.get_busy():
+            self.stolen += 1
+        channel.play(sound)
+        self._voices[index] = (priority, now)
+        self.played += 1
+
+    def _find_channel(self, priority):
+        """
+        找一個可以用的聲道\n
+        return: 空的聲道；都在播時是優先順序不高於 priority 裡最早開始播的聲道；都不行時為 None\n
+        """
+        victim = None
+        for index, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return index
+            voice = self._voices[index]
+            if voice[0] <= priority and (victim is None or voice < self._voices[victim]):
+                victim = index
+        return victim
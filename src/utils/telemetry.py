@@ -0,0 +1,267 @@
+"""
+效能遙測輸出工具模組
+定期把 FPS、每格時間百分位數、掉格數、碰撞和爆炸次數、記憶體用量寫到本機檔案
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+from .frame_timer import RollingHistogram
+
+# 支援的輸出格式
+TELEMETRY_FORMATS = ("jsonl", "prometheus")
+
+
+def get_process_rss():
+    """
+    取得這個程式目前佔用的實體記憶體（RSS，位元組）\n
+    Linux 讀 /proc，Windows 呼叫 GetProcessMemoryInfo，\n
+    其他系統只能拿到最高用量（ru_maxrss），都拿不到時回傳 None\n
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", "r") as file:
+                resident_pages = int(file.read().split()[1])
+            return resident_pages * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(
+            process, ctypes.byref(counters), counters.cb
+        ):
+            return counters.WorkingSetSize
+        return None
+
+    try:
+        import resource
+
+        # macOS 的單位是位元組，其他系統是 KB
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+class TelemetryExporter:
+    """
+    效能遙測輸出器\n
+    \n
+    主迴圈每格呼叫 record_frame()、有事件時呼叫 count()，都只是更新記憶體裡的數字；\n
+    每隔 interval_ms 整理成一筆紀錄交給背景執行緒，由背景執行緒讀 RSS、轉成文字並寫檔，\n
+    所以主迴圈永遠不會等硬碟。背景執行緒忙不過來時新的紀錄會被丟掉並計數，而不是讓遊戲等待\n
+    \n
+    輸出格式：\n
+    - jsonl：每筆紀錄一行 JSON，一直往後加；檔案超過 max_bytes 就輪替成 .1、.2 ...\n
+    - prometheus：Prometheus 文字格式，每次整個換成最新的數值（給 node_exporter textfile collector 讀）\n
+    """
+
+    def __init__(
+        self,
+        path,
+        target_fps,
+        interval_ms=5000,
+        output_format="jsonl",
+        max_bytes=5 * 1024 * 1024,
+        backup_count=3,
+        queue_size=64,
+        missed_frame_tolerance=1.5,
+    ):
+        """
+        初始化遙測輸出器\n
+        path: 輸出檔案路徑\n
+        target_fps: 目標 FPS，用來判斷哪幾格掉格\n
+        interval_ms: 每隔幾毫秒輸出一筆紀錄\n
+        output_format: 'jsonl' 或 'prometheus'\n
+        max_bytes: jsonl 檔案超過這個大小就輪替\n
+        backup_count: 保留幾個舊檔\n
+        queue_size: 等待寫入的紀錄最多幾筆\n
+        missed_frame_tolerance: 一格超過目標時間的幾倍算掉格\n
+        """
+        if output_format not in TELEMETRY_FORMATS:
+            raise ValueError(f"不支援的遙測格式：{output_format}")
+
+        self.path = path
+        self.interval_ms = interval_ms
+        self.output_format = output_format
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.missed_frame_ms = 1000 / target_fps * missed_frame_tolerance
+
+        self.counters = {}
+        self.dropped_records = 0
+        self._frame_times = RollingHistogram(window=max(1, int(target_fps * interval_ms / 1000)))
+        self._frames = 0
+        self._missed_frames = 0
+        self._idle_frames = 0
+        self._interval_start = time.perf_counter()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer_thread = None
+
+    def start(self):
+        """開始背景寫檔執行緒"""
+        if self._writer_thread is not None:
+            return
+        self._interval_start = time.perf_counter()
+        self._writer_thread = threading.Thread(
+            target=self._write_loop, name="telemetry-writer", daemon=True
+        )
+        self._writer_thread.start()
+
+    def close(self, timeout=2.0):
+        """送出最後一筆紀錄並等背景執行緒寫完"""
+        if self._writer_thread is None:
+            return
+        self._flush()
+        try:
+            # 結束時可以等一下，確保結束通知一定送得進佇列
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._writer_thread.join(timeout)
+        self._writer_thread = None
+
+    def count(self, name, amount=1):
+        """
+        累加事件次數（例如碰撞、爆炸），輸出後歸零\n
+        name: 事件名稱\n
+        amount: 增加多少\n
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_frame(self, frame_ms, extra=None, is_idle=False):
+        """
+        每格呼叫一次，記錄這一格的時間\n
+        frame_ms: 這一格花的時間（毫秒），通常是 clock.get_time()\n
+        extra: 時間到要輸出時才會呼叫的函式，回傳要一起寫進紀錄的 dict\n
+        is_idle: 這一格是閒置時故意放慢的，不算進每格時間統計，也不算掉格\n
+        """
+        self._frames += 1
+        if is_idle:
+            self._idle_frames += 1
+        else:
+            self._frame_times.add(frame_ms * 1000)
+            if frame_ms > self.missed_frame_ms:
+                self._missed_frames += 1
+
+        if (time.perf_counter() - self._interval_start) * 1000 >= self.interval_ms:
+            self._flush(extra)
+
+    def _flush(self, extra=None):
+        """把這段期間的統計整理成一筆紀錄，交給背景執行緒"""
+        now = time.perf_counter()
+        elapsed = now - self._interval_start
+        if self._frames == 0 or elapsed <= 0:
+            return
+
+        record = {
+            "timestamp": time.time(),
+            "fps": self._frames / elapsed,
+            "frames": self._frames,
+            "frame_ms_p50": self._frame_times.percentile(0.5) / 1000,
+            "frame_ms_p90": self._frame_times.percentile(0.9) / 1000,
+            "frame_ms_p99": self._frame_times.percentile(0.99) / 1000,
+            "missed_frames": self._missed_frames,
+            "idle_frames": self._idle_frames,
+            "dropped_records": self.dropped_records,
+            "counters": dict(self.counters),
+        }
+        if extra is not None:
+            record.update(extra())
+        self._put(record)
+
+        # 開始下一段
+        self.counters.clear()
+        self._frames = 0
+        self._missed_frames = 0
+        self._idle_frames = 0
+        self._interval_start = now
+
+    def _put(self, record):
+        """放進佇列，滿了就丟掉（主迴圈不能等）"""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_records += 1
+
+    def _write_loop(self):
+        """背景執行緒：從佇列拿紀錄寫檔，拿到 None 就結束"""
+        while True:
+            record = self._queue.get()
+            if record is None:
+                return
+            record["rss_bytes"] = get_process_rss()
+            try:
+                if self.output_format == "jsonl":
+                    self._append_jsonl(record)
+                else:
+                    self._replace_prometheus(record)
+            except OSError as e:
+                # 寫不進去就印出訊息，不影響遊戲
+                print(f"寫入遙測資料失敗：{e}")
+
+    def _append_jsonl(self, record):
+        """在 jsonl 檔後面加一行，檔案太大時先輪替"""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        if os.path.exists(self.path) and os.path.getsize(self.path) + len(line) > self.max_bytes:
+            self._rotate()
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(line)
+
+    def _rotate(self):
+        """把 telemetry.jsonl 改名成 .1，原本的 .1 改成 .2，依此類推，最舊的刪掉"""
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def _replace_prometheus(self, record):
+        """寫成 Prometheus 文字格式，先寫暫存檔再整個換掉，讀的人不會讀到寫一半的檔案"""
+        lines = []
+        for key in ("fps", "frame_ms_p50", "frame_ms_p90", "frame_ms_p99", "rss_bytes"):
+            if record.get(key) is not None:
+                lines.append(f"# TYPE brick_breaker_{key} gauge")
+                lines.append(f"brick_breaker_{key} {record[key]}")
+        for key in ("frames", "missed_frames", "idle_frames", "dropped_records"):
+            lines.append(f"# TYPE brick_breaker_{key} gauge")
+            lines.append(f"brick_breaker_{key} {record[key]}")
+        lines.append("# TYPE brick_breaker_events gauge")
+        for name, value in sorted(record["counters"].items()):
+            lines.append(f'brick_breaker_events{{name="{name}"}} {value}')
+
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        os.replace(temp_path, self.path)
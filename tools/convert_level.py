@@ -0,0 +1,68 @@
+######################載入套件######################
+"""
+關卡檔轉換工具\n
+\n
+把 config/settings.py 目前的磚牆設定（欄數、列數、特殊磚塊數量、顏色）轉成關卡檔，\n
+也可以用參數指定更大的尺寸來產生超大關卡。\n
+\n
+執行方式：\n
+python tools/convert_level.py --output levels/level1.blvl\n
+python tools/convert_level.py --cols 2000 --rows 2000 --specials 40000 --output levels/huge.blvl\n
+產生之後把 settings.py 的 LEVEL_FILE 設成輸出路徑即可。\n
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import config.settings as config
+from src.utils.level_file import build_level_cells, open_level, write_level
+
+
+######################定義函式區######################
+def main():
+    """
+    關卡檔轉換主函式\n
+    沒指定的參數都照 settings.py 的設定\n
+    """
+    parser = argparse.ArgumentParser(description="把磚牆設定轉成關卡檔")
+    parser.add_argument("--cols", type=int, default=config.BRICK_COLS, help="欄數")
+    parser.add_argument("--rows", type=int, default=config.BRICK_ROWS, help="列數")
+    parser.add_argument(
+        "--specials", type=int, default=config.SPECIAL_BRICK_COUNT, help="特殊磚塊數量"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="挑選特殊磚塊用的亂數種子")
+    parser.add_argument("--output", default="levels/level1.blvl", help="輸出檔案路徑")
+    args = parser.parse_args()
+
+    if args.cols <= 0 or args.rows <= 0:
+        parser.error("欄數和列數都要大於 0")
+
+    start = time.perf_counter()
+    cells = build_level_cells(
+        args.cols,
+        args.rows,
+        args.specials,
+        len(config.BRICK_COLORS),
+        rng=random.Random(args.seed),
+    )
+    write_level(args.output, cells)
+    elapsed = time.perf_counter() - start
+
+    # 讀回來確認檔案正確
+    level = open_level(args.output)
+    size_mb = os.path.getsize(args.output) / (1024 * 1024)
+    print(
+        f"已寫入 {args.output}：{level.cols} x {level.rows}，"
+        f"{level.brick_count} 塊磚塊，{size_mb:.1f} MB，花了 {elapsed:.2f} 秒"
+    )
+
+
+######################主程式######################
+main()
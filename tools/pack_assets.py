@@ -0,0 +1,162 @@
+######################載入套件######################
+"""
+資源打包工具\n
+\n
+把 assets/images、assets/sounds、assets/fonts 底下的檔案打包成一個資源包：\n
+- 圖片先轉成視窗的像素格式，遊戲中不用解碼 PNG、也不用 convert\n
+- 字型只保留遊戲用得到的字（介面文字、『爆』字和 ASCII），需要安裝 fontTools，\n
+  沒有安裝或縮減失敗時停下來，不會偷偷把整個字型放進去；真的要整個打包請加 --no-subset\n
+- 音效照原樣放進去，遊戲中第一次播放前才解碼\n
+--system-font 會把找到的系統繁體中文字型也縮減後放進去（名稱 fonts/ui），\n
+遊戲啟動時就不用搜尋系統字型。\n
+\n
+執行方式：\n
+python tools/pack_assets.py --output assets/assets.pak\n
+python tools/pack_assets.py --system-font --output assets/assets.pak\n
+產生之後把 settings.py 的 ASSET_PACK_PATH 設成輸出路徑即可。\n
+"""
+import argparse
+import os
+import string
+import sys
+import time
+
+######################初始化設定######################
+# 將專案根目錄加入 Python 路徑，確保能正確 import 模組
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import config.settings as config
+from src.game.hud import (
+    HIGH_SCORE_BEST_LABEL,
+    HIGH_SCORE_DURATION_FORMAT,
+    HIGH_SCORE_EMPTY,
+    HIGH_SCORE_HINT,
+    HIGH_SCORE_LEVEL_FORMAT,
+    HIGH_SCORE_TITLE,
+    SCORE_GLYPHS,
+    SCORE_LABEL,
+    STATE_MESSAGES,
+)
+from src.game_objects.brick import SPECIAL_BRICK_GLYPH
+from src.utils.asset_pack import (
+    ASSET_EXTENSIONS,
+    ASSET_FOLDERS,
+    convert_image,
+    open_asset_pack,
+    subset_font,
+    write_asset_pack,
+)
+from src.utils.font_loader import find_chinese_font_path
+
+
+######################定義函式區######################
+def collect_ui_text():
+    """
+    收集遊戲畫面上會出現的字（排行榜的玩家名稱事先不知道，只放 settings.py 的 PLAYER_NAME）\n
+    return: 字串（每個字只出現一次）\n
+    """
+    texts = [SCORE_LABEL, SCORE_GLYPHS, SPECIAL_BRICK_GLYPH, string.printable]
+    texts += [HIGH_SCORE_TITLE, HIGH_SCORE_EMPTY, HIGH_SCORE_BEST_LABEL, HIGH_SCORE_HINT]
+    texts += [HIGH_SCORE_LEVEL_FORMAT, HIGH_SCORE_DURATION_FORMAT, config.PLAYER_NAME]
+    for messages in STATE_MESSAGES.values():
+        texts.extend(text for _, text, _, _ in messages)
+    return "".join(sorted(set("".join(texts))))
+
+
+def load_asset(kind, path, ui_text, is_subset_enabled):
+    """
+    讀進一個資源檔，轉成要放進資源包的資料\n
+    return: (資料, 索引資訊 dict)\n
+    """
+    if kind == "image":
+        return convert_image(path)
+
+    with open(path, "rb") as file:
+        data = file.read()
+    if kind != "font":
+        return data, {}
+
+    info = {"original_size": len(data), "subset": False}
+    if is_subset_enabled:
+        try:
+            data = subset_font(data, ui_text)
+        except ImportError:
+            print("沒有安裝 fontTools，無法縮減字型（pip install fonttools，或加上 --no-subset 整個打包）")
+            sys.exit(1)
+        except Exception as e:
+            print(f"縮減字型 {path} 失敗：{e}（加上 --no-subset 可以整個打包）")
+            sys.exit(1)
+        info["subset"] = True
+    return data, info
+
+
+def find_assets(source):
+    """
+    列出資源資料夾裡的檔案\n
+    return: [(名稱, 種類, 路徑), ...]，名稱是「資料夾/檔名（不含副檔名）」\n
+    """
+    found = []
+    for folder, kind in ASSET_FOLDERS.items():
+        folder_path = os.path.join(source, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for root, _, files in os.walk(folder_path):
+            for filename in sorted(files):
+                stem, extension = os.path.splitext(filename)
+                if extension.lower() not in ASSET_EXTENSIONS[kind]:
+                    continue
+                path = os.path.join(root, filename)
+                relative = os.path.relpath(os.path.join(root, stem), source)
+                found.append((relative.replace(os.sep, "/"), kind, path))
+    return found
+
+
+def main():
+    """
+    資源打包主函式\n
+    打包完讀回來確認，並印出每個資源的大小\n
+    """
+    parser = argparse.ArgumentParser(description="把遊戲資源打包成資源包")
+    parser.add_argument("--source", default="assets", help="資源資料夾")
+    parser.add_argument("--output", default="assets/assets.pak", help="輸出檔案路徑")
+    parser.add_argument(
+        "--system-font", action="store_true", help=f"把系統中文字型也打包成 {config.ASSET_PACK_FONT}"
+    )
+    parser.add_argument("--no-subset", action="store_true", help="字型不要縮減，整個打包")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ui_text = collect_ui_text()
+    entries = find_assets(args.source)
+    if args.system_font:
+        font_path = find_chinese_font_path()
+        if font_path is None:
+            print("找不到系統中文字型，略過 --system-font")
+        else:
+            entries.append((config.ASSET_PACK_FONT, "font", font_path))
+
+    assets = []
+    for name, kind, path in entries:
+        data, info = load_asset(kind, path, ui_text, not args.no_subset)
+        assets.append((name, kind, data, info))
+    total_size = write_asset_pack(args.output, assets)
+    elapsed = time.perf_counter() - start
+
+    # 讀回來確認檔案正確
+    pack = open_asset_pack(args.output)
+    for name in pack.names():
+        entry = pack.index[name]
+        note = ""
+        if entry.get("subset"):
+            note = f"（原本 {entry['original_size'] / 1024:.1f} KB，保留 {len(ui_text)} 個字）"
+        print(f"{name:<32}{entry['kind']:<8}{entry['size'] / 1024:>10.1f} KB{note}")
+    pack.close()
+    print(
+        f"已寫入 {args.output}：{len(assets)} 個資源，"
+        f"{total_size / 1024:.1f} KB，花了 {elapsed:.2f} 秒"
+    )
+
+
+######################主程式######################
+main()